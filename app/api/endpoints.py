@@ -2,27 +2,70 @@
 API endpoints для системы справедливого дележа
 """
 from fastapi import APIRouter, HTTPException
-from typing import Optional
 import sys
 import os
 
 # Добавляем корневую директорию в PYTHONPATH
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from app.core.config import settings
 from app.models.request_models import FairDivisionRequest
-from app.models.response_models import FairDivisionResponse, FairDivisionDebugResponse, DebugInfo, Division, Gains
+from app.models.response_models import (
+    FairDivisionResponse, FairDivisionDebugResponse, DebugInfo, Division, Gains,
+    CardinalityResult
+)
 from fair_division_engine.utils import validate_input
-from fair_division_engine.r_polygon import build_r_polygon, check_r_monotonicity
-from fair_division_engine.indivisible import build_s_set
-from fair_division_engine.pareto import pareto_filter
-from fair_division_engine.proportional import find_proportional_division
-from fair_division_engine.equitable import find_equitable_division
-from fair_division_engine.comprehensive import find_all_division_types
+from fair_division_engine.r_polygon import build_r_polygon
+from fair_division_engine.sp_builder import auto_sp_method, build_sp
+from fair_division_engine.points import PointSet, sigma_to_list
+from fair_division_engine.reduction import ItemReduction
+from fair_division_engine.proportional import (
+    SearchBudgetExceeded,
+    find_proportional_division,
+    find_proportional_division_bnb
+)
+from fair_division_engine.heuristic import find_proportional_division_heuristic
+from fair_division_engine.comprehensive import find_all_division_types, find_cardinality_division_types
 from fair_division_engine.visualization import plot_ad_region, plot_ad_region_with_sp
 
 router = APIRouter()
 
 
+def sp_options() -> dict:
+    """Параметры построения SP во внешней памяти из настроек приложения"""
+    return {
+        "scratch_dir": settings.sp_scratch_dir,
+        "memory_budget": settings.sp_memory_budget_mb * 1024 * 1024
+    }
+
+
+def constraints(request: FairDivisionRequest) -> dict:
+    """Ограничения на неделимые пункты из запроса (закрепления и пакеты)"""
+    return {
+        "locked_A": request.locked_A,
+        "locked_B": request.locked_B,
+        "bundles": request.bundles
+    }
+
+
+def build_request_sp(request: FairDivisionRequest, reduction: ItemReduction) -> PointSet:
+    """SP допустимых распределений: перебор только свободных пунктов"""
+    free_a, free_b = reduction.reduced(request.a_w, request.b_w)
+    return reduction.expand_sp(build_sp(free_a, free_b, request.sp_method, **sp_options()))
+
+
+def build_fallback_sp(request: FairDivisionRequest, reduction: ItemReduction) -> PointSet:
+    """
+    SP для перебора, когда поиск с отсечениями исчерпал бюджет узлов:
+    при sp_method="auto" вместо полного перебора 2^M - frontier
+    """
+    free_a, free_b = reduction.reduced(request.a_w, request.b_w)
+    method = request.sp_method
+    if method == "auto":
+        method = auto_sp_method(free_a, free_b, fallback="frontier")
+    return reduction.expand_sp(build_sp(free_a, free_b, method, **sp_options()))
+
+
 @router.post("/solve")
 async def solve_fair_division(request: FairDivisionRequest, debug: bool = False):
     """
@@ -51,7 +94,13 @@ async def solve_fair_division(request: FairDivisionRequest, debug: bool = False)
         result = find_all_division_types(
             request.a_d, request.b_d,
             request.a_w, request.b_w,
-            request.H
+            request.H,
+            sp_method=request.sp_method,
+            sp_options=sp_options(),
+            epsilon=request.epsilon,
+            solver=request.solver,
+            heuristic=request.heuristic,
+            **constraints(request)
         )
         
         # Формируем ответ
@@ -88,6 +137,8 @@ async def solve_fair_division(request: FairDivisionRequest, debug: bool = False)
             "fair_gains": format_gains(result['fair_gains']),
             
             "sp_points_count": result['sp_points_count'],
+            "solver_path": result['solver_path'],
+            "error_bound": result['error_bound'],
             
             # Statement 1 classification
             "efficient_exists": result.get('efficient_exists', result['has_efficient']),
@@ -103,21 +154,44 @@ async def solve_fair_division(request: FairDivisionRequest, debug: bool = False)
             "method": "comprehensive"
         }
         
+        # Дележи при ограничении числа пунктов у A
+        if request.max_items_A:
+            response["cardinality"] = [
+                CardinalityResult(
+                    k=entry['k'],
+                    sp_points_count=entry['sp_points_count'],
+                    has_proportional=entry['has_proportional'],
+                    has_equitable=entry['has_equitable'],
+                    proportional_division=format_division(entry['proportional_division']),
+                    proportional_gains=format_gains(entry['proportional_gains']),
+                    equitable_division=format_division(entry['equitable_division']),
+                    equitable_gains=format_gains(entry['equitable_gains'])
+                )
+                for entry in find_cardinality_division_types(
+                    request.a_d, request.b_d,
+                    request.a_w, request.b_w,
+                    request.H,
+                    request.max_items_A,
+                    **constraints(request)
+                )
+            ]
+        
         # Добавление отладочной информации
         if debug:
             R, sorted_indices = build_r_polygon(request.a_d, request.b_d)
-            S = build_s_set(request.a_w, request.b_w)
-            SP = pareto_filter(S)
+            reduction = ItemReduction(request.a_w, request.b_w, **constraints(request))
+            SP = build_request_sp(request, reduction)
             
             debug_info = DebugInfo(
                 R_polygon=[[round(x, 2), round(y, 2)] for x, y in R],
                 sorted_indices=sorted_indices,
-                S_size=len(S),
+                S_size=1 << len(reduction.free),
                 SP_size=len(SP),
                 SP_points=[
-                    {"x": round(x, 2), "y": round(y, 2), "sigma": sigma}
+                    {"x": round(x, 2), "y": round(y, 2), "sigma": sigma_to_list(sigma, request.M)}
                     for x, y, sigma in SP
-                ]
+                ],
+                reduction=result['reduction']
             )
             response["debug"] = debug_info
             return FairDivisionDebugResponse(**response).model_dump()
@@ -130,6 +204,74 @@ async def solve_fair_division(request: FairDivisionRequest, debug: bool = False)
         raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
 
 
+@router.post("/proportional")
+async def find_proportional(request: FairDivisionRequest):
+    """
+    Быстрая проверка существования пропорционального дележа
+    
+    Сначала пробует жадное распределение неделимых с локальным поиском
+    (find_proportional_division_heuristic), затем поиск с отсечениями по ломаной R
+    (метод ветвей и границ); возвращает первый найденный пропорциональный
+    делёж, не строя S и SP. При ограничениях или если поиск с отсечениями
+    исчерпал бюджет узлов (BNB_MAX_NODES), перебирается SP, построенное dp
+    или frontier. Поле solver_path - каким путём получен ответ:
+    heuristic, branch_and_bound или sp_scan.
+    """
+    try:
+        validate_input(
+            request.L, request.M,
+            request.a_d, request.b_d,
+            request.a_w, request.b_w,
+            request.H
+        )
+        
+        R, sorted_indices = build_r_polygon(request.a_d, request.b_d)
+        reduction = ItemReduction(request.a_w, request.b_w, **constraints(request))
+        
+        result = find_proportional_division_heuristic(
+            request.L, request.M,
+            request.a_d, request.b_d,
+            request.a_w, request.b_w,
+            R, sorted_indices, request.H, reduction=reduction
+        )
+        solver_path = "heuristic"
+        
+        if result is None and not reduction.constrained:
+            try:
+                result = find_proportional_division_bnb(
+                    request.L, request.M,
+                    request.a_d, request.b_d,
+                    request.a_w, request.b_w,
+                    R, sorted_indices, request.H
+                )
+                solver_path = "branch_and_bound"
+            except SearchBudgetExceeded:
+                # Отсечения не помогают - перебираем SP
+                solver_path = "sp_scan"
+        elif result is None:
+            # Поиск с отсечениями не знает об ограничениях
+            solver_path = "sp_scan"
+        
+        if solver_path == "sp_scan":
+            # SP допустимых распределений, построенное только по свободным пунктам
+            result = find_proportional_division(
+                request.L, request.M,
+                request.a_d, request.b_d,
+                request.a_w, request.b_w,
+                R, sorted_indices, build_fallback_sp(request, reduction), request.H
+            )
+        
+        if result is None:
+            return {"proportional_exists": False, "solver_path": solver_path}
+        result["solver_path"] = solver_path
+        return result
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
+
+
 @router.post("/plot/ad")
 async def plot_ad_graph(request: FairDivisionRequest):
     """
@@ -178,8 +320,7 @@ async def plot_ad_with_sp_graph(request: FairDivisionRequest):
         
         # Построение данных
         R, sorted_indices = build_r_polygon(request.a_d, request.b_d)
-        S = build_s_set(request.a_w, request.b_w)
-        SP = pareto_filter(S)
+        SP = build_request_sp(request, ItemReduction(request.a_w, request.b_w, **constraints(request)))
         
         # Находим решение для отображения на графике
         from fair_division_engine.comprehensive import find_all_division_types, calculate_gains
@@ -189,7 +330,11 @@ async def plot_ad_with_sp_graph(request: FairDivisionRequest):
             result = find_all_division_types(
                 request.a_d, request.b_d,
                 request.a_w, request.b_w,
-                request.H
+                request.H,
+                sp_method=request.sp_method,
+                sp_options=sp_options(),
+                solver=request.solver,
+                **constraints(request)
             )
             # Берём лучший найденный тип дележа
             if result.get("fair_division"):
@@ -252,6 +397,7 @@ async def get_info():
         ],
         "endpoints": {
             "POST /api/solve": "Решение задачи справедливого дележа",
+            "POST /api/proportional": "Быстрый поиск пропорционального дележа (ветви и границы)",
             "POST /api/plot/ad": "График области достижимости Ad",
             "POST /api/plot/ad-with-sp": "График Ad с SP-точками",
             "GET /api/info": "Информация о системе",
@@ -11,6 +11,10 @@ class Settings(BaseSettings):
     debug: bool = False
     api_prefix: str = "/api"
     
+    # Построение SP во внешней памяти (sp_method="external")
+    sp_scratch_dir: Optional[str] = None
+    sp_memory_budget_mb: int = 256
+    
     class Config:
         env_file = ".env"
 
@@ -4,6 +4,9 @@ Pydantic модели для запросов к API
 from pydantic import BaseModel, Field, validator
 from typing import List, Optional
 
+from fair_division_engine.comprehensive import SOLVERS
+from fair_division_engine.sp_builder import SP_METHODS
+
 
 class FairDivisionRequest(BaseModel):
     """
@@ -16,6 +19,38 @@ class FairDivisionRequest(BaseModel):
     a_w: List[float] = Field(..., description="Оценки участника A для неделимых пунктов")
     b_w: List[float] = Field(..., description="Оценки участника B для неделимых пунктов")
     H: Optional[float] = Field(100.0, description="Сумма всех оценок (обычно 100)")
+    sp_method: Optional[str] = Field(
+        "auto",
+        description=f"Способ построения Парето-множества SP: {', '.join(SP_METHODS)}"
+    )
+    solver: Optional[str] = Field(
+        "scan",
+        description=f"Способ поиска дележей по SP: {', '.join(SOLVERS)}"
+    )
+    epsilon: Optional[float] = Field(
+        None, gt=0,
+        description="Допустимая погрешность ε: SP строится ε-приближённо, в ответе - граница погрешности"
+    )
+    locked_A: List[int] = Field(
+        default_factory=list,
+        description="Индексы неделимых пунктов (с 0), которые получает A"
+    )
+    locked_B: List[int] = Field(
+        default_factory=list,
+        description="Индексы неделимых пунктов (с 0), которые получает B"
+    )
+    bundles: List[List[int]] = Field(
+        default_factory=list,
+        description="Пакеты неделимых пунктов (индексы с 0), которые получает один участник"
+    )
+    heuristic: bool = Field(
+        False,
+        description="Сначала искать делёж жадно с локальным поиском; при успехе SP не строится"
+    )
+    max_items_A: List[int] = Field(
+        default_factory=list,
+        description="Значения k: для каждого ищутся дележи, в которых A получает не более k неделимых пунктов"
+    )
     
     @validator('a_d')
     def validate_a_d_length(cls, v, values):
@@ -47,6 +82,36 @@ class FairDivisionRequest(BaseModel):
             raise ValueError("Все оценки должны быть неотрицательными")
         return v
     
+    @validator('locked_A', 'locked_B')
+    def validate_locked_indices(cls, v, values):
+        if 'M' in values and any(not 0 <= i < values['M'] for i in v):
+            raise ValueError(f"Индексы закреплённых пунктов должны быть в диапазоне 0..{values['M'] - 1}")
+        return v
+    
+    @validator('bundles')
+    def validate_bundles(cls, v, values):
+        if 'M' in values and any(not 0 <= i < values['M'] for bundle in v for i in bundle):
+            raise ValueError(f"Индексы пунктов пакетов должны быть в диапазоне 0..{values['M'] - 1}")
+        return v
+    
+    @validator('max_items_A')
+    def validate_max_items_A(cls, v):
+        if any(k < 0 for k in v):
+            raise ValueError("Ограничение числа пунктов A должно быть неотрицательным")
+        return v
+    
+    @validator('sp_method')
+    def validate_sp_method(cls, v):
+        if v not in SP_METHODS:
+            raise ValueError(f"sp_method должен быть одним из: {', '.join(SP_METHODS)}")
+        return v
+    
+    @validator('solver')
+    def validate_solver(cls, v):
+        if v not in SOLVERS:
+            raise ValueError(f"solver должен быть одним из: {', '.join(SOLVERS)}")
+        return v
+    
     class Config:
         json_schema_extra = {
             "example": {
@@ -30,23 +30,35 @@ class Gains(BaseModel):
     B: float = Field(..., description="Выигрыш участника B")
 
 
+class CardinalityResult(BaseModel):
+    """Дележи при ограничении числа неделимых пунктов у A"""
+    k: int = Field(..., description="A получает не более k неделимых пунктов")
+    sp_points_count: int = Field(..., description="Количество точек в Парето-множестве")
+    has_proportional: bool = Field(..., description="Существует пропорциональное решение")
+    has_equitable: bool = Field(..., description="Существует равноценное решение")
+    proportional_division: Optional[Division] = Field(None, description="Пропорциональное распределение")
+    proportional_gains: Optional[Gains] = Field(None, description="Выигрыши для пропорционального")
+    equitable_division: Optional[Division] = Field(None, description="Равноценное распределение")
+    equitable_gains: Optional[Gains] = Field(None, description="Выигрыши для равноценного")
+
+
 class FairDivisionResponse(BaseModel):
     """
     Модель ответа для решения задачи справедливого дележа
     Согласно Statement 1: F(S) ⊆ Q(S) ⊆ P(S) ⊆ E(S) = U(S)
     """
     # Основная информация о существовании решений
-    has_efficient: bool = Field(..., description="Существует ли эффективный делёж (E)")
-    has_proportional: bool = Field(..., description="Существует ли пропорциональный делёж (P)")
-    has_equitable: bool = Field(..., description="Существует ли равноценный делёж (Q)")
-    has_fair: bool = Field(..., description="Существует ли справедливый делёж (F = E ∩ P ∩ Q)")
+    has_efficient: Optional[bool] = Field(..., description="Существует ли эффективный делёж (E); None - не проверялось")
+    has_proportional: Optional[bool] = Field(..., description="Существует ли пропорциональный делёж (P); None - не проверялось")
+    has_equitable: Optional[bool] = Field(..., description="Существует ли равноценный делёж (Q); None - не проверялось")
+    has_fair: Optional[bool] = Field(..., description="Существует ли справедливый делёж (F = E ∩ P ∩ Q); None - не проверялось")
     
     # Statement 1 classification
     efficient_exists: Optional[bool] = Field(None, description="Существование эффективного решения (E(S))")
     proportional_exists: Optional[bool] = Field(None, description="Существование пропорционального решения (P(S))")
     equitable_exists: Optional[bool] = Field(None, description="Существование равноценного решения (Q(S))")
     fair_exists: Optional[bool] = Field(None, description="Существование справедливого решения (F(S))")
-    statement1_sets: Optional[List[str]] = Field(None, description="Множества Statement 1, к которым принадлежит решение: E(S), P(S), Q(S), F(S)")
+    statement1_sets: Optional[List[str]] = Field(None, description="Множества Statement 1, к которым принадлежит решение: E(S), P(S), Q(S), F(S); None - классификация не выполнялась")
     belongs_to_sets: Optional[str] = Field(None, description="Классификация решения по Statement 1")
     
     # Решения для каждого типа
@@ -64,6 +76,18 @@ class FairDivisionResponse(BaseModel):
     # Дополнительная информация
     method: Optional[str] = Field(None, description="Метод нахождения дележа")
     sp_points_count: Optional[int] = Field(None, description="Количество точек в Парето-множестве")
+    solver_path: Optional[str] = Field(
+        None,
+        description="Каким путём получен ответ: heuristic (без SP) или exact"
+    )
+    error_bound: Optional[Dict[str, float]] = Field(
+        None,
+        description="Граница погрешности выигрышей при ε-приближённом SP: epsilon, A, B"
+    )
+    cardinality: Optional[List[CardinalityResult]] = Field(
+        None,
+        description="Дележи для каждого k из max_items_A"
+    )
     
     # Для обратной совместимости (deprecated)
     division: Optional[Division] = Field(None, description="[Deprecated] Используйте fair_division или equitable_division")
@@ -99,6 +123,9 @@ class DebugInfo(BaseModel):
     S_size: int = Field(..., description="Размер множества S")
     SP_size: int = Field(..., description="Размер Парето-множества SP")
     SP_points: List[Dict[str, Any]] = Field(..., description="Точки SP-множества")
+    reduction: Optional[Dict[str, Any]] = Field(
+        None, description="Закреплённые до перебора пункты и сдвиги выигрышей"
+    )
 
 
 class FairDivisionDebugResponse(FairDivisionResponse):
@@ -0,0 +1,40 @@
+"""
+Масштабирование параллельного построения SP по числу процессов
+
+Запуск:
+    python benchmarks/parallel_scaling.py [M] [max_workers]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.sp_construction import random_instance
+from fair_division_engine.indivisible import build_sp_numpy
+from fair_division_engine.parallel import build_sp_parallel
+
+
+def main(M, max_workers):
+    a_w, b_w = random_instance(M)
+
+    start = time.perf_counter()
+    expected = build_sp_numpy(a_w, b_w)
+    baseline = time.perf_counter() - start
+    print(f"M = {M}, numpy (1 процесс): {baseline:.3f} s, |SP| = {len(expected)}")
+
+    print(f"{'workers':>8} {'time, s':>10} {'speedup':>8}")
+    workers = 1
+    while workers <= max_workers:
+        start = time.perf_counter()
+        SP = build_sp_parallel(a_w, b_w, workers=workers)
+        elapsed = time.perf_counter() - start
+        assert SP.to_tuples() == expected.to_tuples()
+        print(f"{workers:>8} {elapsed:>10.3f} {baseline / elapsed:>8.2f}")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    M = int(sys.argv[1]) if len(sys.argv) > 1 else 22
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    main(M, max_workers)
@@ -0,0 +1,49 @@
+"""
+Сравнение времени построения Парето-множества SP разными способами
+
+Запуск:
+    python benchmarks/sp_construction.py [M ...]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fair_division_engine.sp_builder import SP_METHODS, build_sp
+
+# Полный перебор дольше этого M не запускаем
+ENUMERATE_LIMIT = 20
+
+
+def random_instance(M, seed=0):
+    """Случайные оценки неделимых пунктов с суммой 100 у каждого участника"""
+    rng = random.Random(seed)
+    a_w = [rng.random() for _ in range(M)]
+    b_w = [rng.random() for _ in range(M)]
+    sa = sum(a_w)
+    sb = sum(b_w)
+    return [100 * v / sa for v in a_w], [100 * v / sb for v in b_w]
+
+
+def time_method(a_w, b_w, method):
+    """Время построения SP и его размер"""
+    start = time.perf_counter()
+    SP = build_sp(a_w, b_w, method)
+    return time.perf_counter() - start, len(SP)
+
+
+def main(sizes):
+    print(f"{'M':>4} {'method':>10} {'time, s':>10} {'|SP|':>8}")
+    for M in sizes:
+        a_w, b_w = random_instance(M)
+        for method in SP_METHODS:
+            if method in ("enumerate", "numpy") and M > ENUMERATE_LIMIT:
+                continue
+            elapsed, size = time_method(a_w, b_w, method)
+            print(f"{M:>4} {method:>10} {elapsed:>10.4f} {size:>8}")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [12, 16, 20, 24, 32, 40])
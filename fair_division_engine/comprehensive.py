@@ -8,10 +8,20 @@ Comprehensive Fair Division Solver
 - Equitable (Q): GA = GB
 - Fair (F): E ∩ P ∩ Q
 """
-from typing import List, Tuple, Optional, Dict
-from .pareto import pareto_filter
+from typing import List, Tuple, Optional, Dict, Sequence
 from .proportional import find_proportional_division
 from .equitable import find_equitable_division
+from .pareto import DOMINANCE_TOL, DominanceIndex
+from .points import SPPoints, sigma_to_list
+
+
+# Способы поиска дележей по SP:
+#   scan     - перебор ломаных R* для каждой точки SP
+#   envelope - бинарный поиск по верхней огибающей R ⊕ SP (envelope.py);
+#              находятся эффективные дележи, равноценный делёж вне огибающей
+#              ищется перебором
+#   fused    - один проход по SP для всех типов дележей (fused.py)
+SOLVERS = ("scan", "envelope", "fused")
 
 
 def _add_statement1_classification(result: Dict) -> None:
@@ -55,6 +65,23 @@ def _add_statement1_classification(result: Dict) -> None:
     result['belongs_to_sets'] = belongs_to
 
 
+def _extract_division(found: Dict) -> Tuple[List[float], List[int], float, float]:
+    """
+    Доли делимых пунктов, распределение неделимых и выигрыши из
+    результата поиска дележа (find_equitable_division и т.п.)
+    """
+    div_data = found['division']
+    # Ключи могут быть 'item_X' или 'D{X}'
+    first_key = list(div_data['divisible_A'].keys())[0] if div_data['divisible_A'] else None
+    
+    if first_key:
+        x = [div_data['divisible_A'][key] for key in sorted(div_data['divisible_A'].keys())]
+    else:
+        x = []
+    
+    return x, div_data['indivisible'], found['gains']['A'], found['gains']['B']
+
+
 def calculate_gains(a_d: List[float], b_d: List[float], 
                     a_w: List[float], b_w: List[float],
                     x: List[float], sigma: List[int]) -> Tuple[float, float]:
@@ -91,44 +118,30 @@ def calculate_gains(a_d: List[float], b_d: List[float],
 def is_efficient(a_d: List[float], b_d: List[float],
                 a_w: List[float], b_w: List[float],
                 x: List[float], sigma: List[int],
-                all_pareto_points: List[Tuple[float, float, List[int]]]) -> bool:
+                all_pareto_points: SPPoints,
+                index: Optional[DominanceIndex] = None) -> bool:
     """
     Проверка эффективности (Парето-оптимальности) дележа
     
-    Делёж эффективен если не существует другого дележа который строго доминирует его
+    Делёж эффективен если не существует другого дележа который строго доминирует его,
+    т.е. вершины R + (x*, y*) для некоторой точки SP со строго большими
+    выигрышами (с запасом DOMINANCE_TOL).
+    
+    Args:
+        index: лестница достижимых выигрышей (DominanceIndex или
+               OnlineSkyline); если не задана, строится по SP. При
+               нескольких проверках её стоит построить один раз.
     """
     # Вычисляем полные выигрыши для данного дележа
     GA, GB = calculate_gains(a_d, b_d, a_w, b_w, x, sigma)
     
-    # Проверяем все точки из SP - можно ли улучшить оба выигрыша
-    for sp_x, sp_y, sp_sigma in all_pareto_points:
-        # Для каждой точки SP пытаемся найти распределение делимых
-        # которое даст строго лучшие выигрыши
-        
-        # Строим смещенную R-ломаную от этой SP-точки
-        L = len(a_d)
-        if L == 0:
-            # Только неделимые - сравниваем напрямую
-            if sp_x > GA + 1e-6 and sp_y > GB + 1e-6:
-                # Есть строго доминирующее распределение
-                return False
-            continue
-        
-        # Проверяем все вершины R-ломаной для этого sigma
-        # Вершины R дают все возможные комбинации распределения делимых
+    if index is None:
         from .r_polygon import build_r_polygon
         R, _ = build_r_polygon(a_d, b_d)
-        
-        for r_a, r_b in R:
-            # Полные выигрыши если использовать эту вершину R и sp_sigma
-            total_A = r_a + sp_x
-            total_B = r_b + sp_y
-            
-            # Если оба выигрыша строго больше - текущий делёж не эффективен
-            if total_A > GA + 1e-6 and total_B > GB + 1e-6:
-                return False
+        index = DominanceIndex.build(R, all_pareto_points)
     
-    return True
+    # Бинарный поиск по лестнице вместо перебора SP и вершин R
+    return not index.dominates(GA + DOMINANCE_TOL, GB + DOMINANCE_TOL)
 
 
 def is_proportional(GA: float, GB: float, H: float) -> bool:
@@ -143,20 +156,66 @@ def is_equitable(GA: float, GB: float) -> bool:
 
 def find_all_division_types(a_d: List[float], b_d: List[float],
                             a_w: List[float], b_w: List[float],
-                            H: float) -> Dict:
+                            H: float,
+                            sp_method: str = "auto",
+                            sp_options: Optional[Dict] = None,
+                            epsilon: Optional[float] = None,
+                            solver: str = "scan",
+                            locked_A: Optional[List[int]] = None,
+                            locked_B: Optional[List[int]] = None,
+                            bundles: Optional[List[List[int]]] = None,
+                            heuristic: bool = False) -> Dict:
     """
     Полное решение задачи справедливого дележа
     Находит все типы решений: Efficient, Proportional, Equitable, Fair
     
+    Args:
+        a_d, b_d: оценки делимых пунктов
+        a_w, b_w: оценки неделимых пунктов
+        H: сумма оценок
+        sp_method: способ построения SP (см. sp_builder.SP_METHODS); по
+                   умолчанию dp для целых оценок, иначе полный перебор
+        sp_options: дополнительные параметры build_sp (scratch_dir, memory_budget)
+        epsilon: если задано, SP строится ε-приближённо (build_sp_approx)
+                 вместо sp_method; эффективность проверяется относительно
+                 приближённого SP
+        solver: способ поиска дележей (см. SOLVERS)
+        locked_A, locked_B: индексы неделимых пунктов (с 0), закреплённых
+                            за A и B
+        bundles: пакеты неделимых пунктов, передаваемых одному участнику;
+                 ограничения сокращают перебор до построения SP (ItemReduction)
+        heuristic: сначала искать делёж жадным распределением с локальным
+                   поиском (heuristic.py); если найден пропорциональный
+                   делёж, SP не строится: has_proportional - True, остальные
+                   has_*, sp_points_count и классификация Statement 1 - None
+                   (не проверялось)
+    
     Returns:
         Dict с ключами:
         - has_efficient, has_proportional, has_equitable, has_fair: bool
         - efficient_division, proportional_division, equitable_division, fair_division: Optional[Tuple]
         - efficient_gains, proportional_gains, equitable_gains, fair_gains: Optional[Tuple]
         - sp_points_count: int
+        - error_bound: Optional[Dict] - граница погрешности выигрышей
+          (approx_error_bound) при заданном epsilon, иначе None
+        - reduction: Dict - статистика закрепления пунктов (ItemReduction.stats)
+        - solver_path: 'heuristic' или 'exact' - каким путём получен ответ
     """
     from .r_polygon import build_r_polygon
-    from .indivisible import build_s_set
+    from .sp_builder import build_sp
+    from .frontier import approx_error_bound, build_sp_approx
+    from .fused import fused_scan
+    from .reduction import ItemReduction
+    from .heuristic import find_proportional_division_heuristic
+    from .dp import difference_dp_scale, find_equitable_division_dp
+    from .envelope import (
+        build_envelope,
+        find_equitable_division_envelope,
+        find_proportional_division_envelope
+    )
+    
+    if solver not in SOLVERS:
+        raise ValueError(f"Неизвестный способ поиска дележа: {solver}")
     
     L = len(a_d)
     M = len(a_w)
@@ -164,13 +223,10 @@ def find_all_division_types(a_d: List[float], b_d: List[float],
     # Построение R-polygon и S-множества
     R, sorted_indices = build_r_polygon(a_d, b_d)
     
-    # Генерируем все распределения неделимых и Парето-множество
-    if M > 0:
-        S = build_s_set(a_w, b_w)
-        SP = pareto_filter(S)
-    else:
-        S = [(0, 0, [])]
-        SP = [(0, 0, [])]
+    # Закреплённые пункты, пакеты и пункты, которые один из участников
+    # не ценит, учитываются заранее; SP строится только по свободным группам
+    reduction = ItemReduction(a_w, b_w, locked_A, locked_B, bundles)
+    free_a, free_b = reduction.reduced(a_w, b_w)
     
     result = {
         'has_efficient': False,
@@ -185,28 +241,93 @@ def find_all_division_types(a_d: List[float], b_d: List[float],
         'proportional_gains': None,
         'equitable_gains': None,
         'fair_gains': None,
-        'sp_points_count': len(SP)
+        'sp_points_count': 0,
+        'error_bound': approx_error_bound(free_a, epsilon) if epsilon is not None else None,
+        'reduction': reduction.stats(),
+        'solver_path': 'exact'
     }
     
-    # 1. Сначала ищем EQUITABLE (может быть fair если эффективен и пропорционален)
-    equit_result = find_equitable_division(
+    # Быстрый путь: сертификат пропорционального дележа без построения SP.
+    # Если пропорционален делёж с σ, то и с любой доминирующей σ точкой SP,
+    # поэтому ответ совпадает с точным
+    if heuristic and M > 0 and epsilon is None:
+        fast = find_proportional_division_heuristic(
+            L, M, a_d, b_d, a_w, b_w, R, sorted_indices, H, reduction=reduction
+        )
+        if fast:
+            # Без SP проверена только пропорциональность; остальные типы -
+            # None («не проверялось»), классификация Statement 1 не выполняется
+            x, sigma, ga, gb = _extract_division(fast)
+            result['has_efficient'] = None
+            result['has_proportional'] = True
+            result['has_equitable'] = None
+            result['has_fair'] = None
+            result['sp_points_count'] = None
+            result['proportional_division'] = (x, sigma)
+            result['proportional_gains'] = (ga, gb)
+            result['solver_path'] = 'heuristic'
+            result['efficient_exists'] = None
+            result['proportional_exists'] = True
+            result['equitable_exists'] = None
+            result['fair_exists'] = None
+            result['statement1_sets'] = None
+            result['belongs_to_sets'] = None
+            return result
+    
+    # Генерируем все распределения неделимых и Парето-множество
+    if M > 0 and epsilon is not None:
+        SP = reduction.expand_sp(build_sp_approx(free_a, free_b, epsilon))
+    elif M > 0:
+        SP = reduction.expand_sp(build_sp(free_a, free_b, sp_method, **(sp_options or {})))
+    else:
+        SP = [(0, 0, [])]
+    
+    result['sp_points_count'] = len(SP)
+    
+    envelope = build_envelope(R, SP) if solver == "envelope" else None
+    fused = fused_scan(
         L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP, H
-    )
+    ) if solver == "fused" else None
+    
+    dominance = fused['dominance'] if fused is not None else None
+    
+    def efficient(x, sigma, ga, gb, found) -> bool:
+        nonlocal dominance
+        # Точки огибающей эффективны по построению; остальные проверяются по
+        # точным (не округлённым) выигрышам с тем же запасом, что и is_efficient
+        if envelope is not None:
+            if found.get('search') == 'envelope':
+                return True
+            return not envelope.dominates(*calculate_gains(a_d, b_d, a_w, b_w, x, sigma))
+        # Лестница достижимых выигрышей строится один раз на задачу
+        if dominance is None:
+            dominance = DominanceIndex.build(R, SP)
+        return is_efficient(a_d, b_d, a_w, b_w, x, sigma, SP, index=dominance)
+    
+    # 1. Сначала ищем EQUITABLE (может быть fair если эффективен и пропорционален)
+    equit_result = None
+    if L == 0 and M > 0 and not reduction.constrained:
+        # Без делимых пунктов равноценный делёж ищется точно по всем
+        # распределениям, а не только по точкам SP
+        scale = difference_dp_scale(a_w, b_w)
+        if scale is not None:
+            exact = find_equitable_division_dp(a_w, b_w, H, scale)
+            if exact['equitable_exists']:
+                equit_result = exact
+    if equit_result is None and fused is not None:
+        equit_result = fused['equitable']
+    elif equit_result is None and envelope is not None:
+        equit_result = find_equitable_division_envelope(
+            L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP, H, envelope
+        )
+    if equit_result is None and fused is None:
+        equit_result = find_equitable_division(
+            L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP, H
+        )
     
     if equit_result:
         # Извлекаем данные из результата
-        div_data = equit_result['division']
-        # Ключи могут быть 'item_X' или 'D{X}'
-        first_key = list(div_data['divisible_A'].keys())[0] if div_data['divisible_A'] else None
-        
-        if first_key:
-            x = [div_data['divisible_A'][key] for key in sorted(div_data['divisible_A'].keys())]
-        else:
-            x = []
-        
-        sigma = div_data['indivisible']
-        ga = equit_result['gains']['A']
-        gb = equit_result['gains']['B']
+        x, sigma, ga, gb = _extract_division(equit_result)
         
         result['has_equitable'] = True
         result['equitable_division'] = (x, sigma)
@@ -219,7 +340,7 @@ def find_all_division_types(a_d: List[float], b_d: List[float],
             result['proportional_gains'] = (ga, gb)
         
         # Проверяем эффективность
-        if is_efficient(a_d, b_d, a_w, b_w, x, sigma, SP):
+        if efficient(x, sigma, ga, gb, equit_result):
             result['has_efficient'] = True
             result['efficient_division'] = (x, sigma)
             result['efficient_gains'] = (ga, gb)
@@ -235,29 +356,26 @@ def find_all_division_types(a_d: List[float], b_d: List[float],
     
     # 2. Если EQUITABLE не найден или не пропорционален, ищем PROPORTIONAL
     if not result['has_proportional']:
-        prop_result = find_proportional_division(
-            L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP, H
-        )
+        if fused is not None:
+            prop_result = fused['proportional']
+        elif envelope is not None:
+            prop_result = find_proportional_division_envelope(
+                L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP, H, envelope
+            )
+        else:
+            prop_result = find_proportional_division(
+                L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP, H
+            )
         
         if prop_result:
-            div_data = prop_result['division']
-            first_key = list(div_data['divisible_A'].keys())[0] if div_data['divisible_A'] else None
-            
-            if first_key:
-                x = [div_data['divisible_A'][key] for key in sorted(div_data['divisible_A'].keys())]
-            else:
-                x = []
-            
-            sigma = div_data['indivisible']
-            ga = prop_result['gains']['A']
-            gb = prop_result['gains']['B']
+            x, sigma, ga, gb = _extract_division(prop_result)
             
             result['has_proportional'] = True
             result['proportional_division'] = (x, sigma)
             result['proportional_gains'] = (ga, gb)
             
             # Проверяем эффективность
-            if is_efficient(a_d, b_d, a_w, b_w, x, sigma, SP):
+            if efficient(x, sigma, ga, gb, prop_result):
                 result['has_efficient'] = True
                 result['efficient_division'] = (x, sigma)
                 result['efficient_gains'] = (ga, gb)
@@ -265,8 +383,12 @@ def find_all_division_types(a_d: List[float], b_d: List[float],
     # 3. Ищем любое EFFICIENT (E) - берём лучшую точку из SP
     if not result['has_efficient'] and len(SP) > 0:
         # Берём точку с максимальной суммой выигрышей
-        best_sp = max(SP, key=lambda p: p[0] + p[1])
+        if fused is not None:
+            best_sp = fused['best_sp']
+        else:
+            best_sp = max(SP, key=lambda p: p[0] + p[1])
         x_star, y_star, sigma = best_sp
+        sigma = sigma_to_list(sigma, M)
         
         # Находим оптимальное распределение делимых для этой точки
         # Используем жадный алгоритм: отдаём пункты тому, кто ценит их больше
@@ -287,3 +409,84 @@ def find_all_division_types(a_d: List[float], b_d: List[float],
     _add_statement1_classification(result)
     
     return result
+
+
+def find_cardinality_division_types(a_d: List[float], b_d: List[float],
+                                    a_w: List[float], b_w: List[float],
+                                    H: float,
+                                    max_items_A: Sequence[int],
+                                    locked_A: Optional[List[int]] = None,
+                                    locked_B: Optional[List[int]] = None,
+                                    bundles: Optional[List[List[int]]] = None) -> List[Dict]:
+    """
+    Пропорциональный и равноценный дележи при ограничении
+    «A получает не более k неделимых пунктов» для нескольких k
+    
+    Парето-множества всех k строятся за один проход
+    (frontier.build_sp_by_count: число пунктов у A - дополнительное
+    измерение), после чего для каждого k выполняется обычный поиск.
+    Пункты, которые B не ценит, не закрепляются за A - это расходовало бы
+    лимит A; пункты, которые не ценит A, по-прежнему закрепляются за B.
+    Закрепления и пакеты пользователя учитываются (пакет считается за
+    столько пунктов, сколько в нём).
+    
+    Args:
+        a_d, b_d: оценки делимых пунктов
+        a_w, b_w: оценки неделимых пунктов
+        H: сумма оценок
+        max_items_A: значения k
+        locked_A, locked_B, bundles: ограничения (см. find_all_division_types)
+    
+    Returns:
+        Для каждого k словарь с ключами k, sp_points_count,
+        has_proportional, proportional_division, proportional_gains,
+        has_equitable, equitable_division, equitable_gains
+    """
+    from .r_polygon import build_r_polygon
+    from .frontier import build_sp_by_count
+    from .reduction import ItemReduction
+    
+    L = len(a_d)
+    M = len(a_w)
+    R, sorted_indices = build_r_polygon(a_d, b_d)
+    
+    reduction = ItemReduction(a_w, b_w, locked_A, locked_B, bundles, fix_unvalued_by_B=False)
+    free_a, free_b = reduction.reduced(a_w, b_w)
+    locked = len(reduction.fixed_A)
+    by_count = build_sp_by_count(
+        free_a, free_b, [k - locked for k in max_items_A],
+        weights=[len(group) for group in reduction.free]
+    )
+    
+    results = []
+    for k in max_items_A:
+        SP = reduction.expand_sp(by_count[k - locked])
+        entry = {
+            'k': k,
+            'sp_points_count': len(SP),
+            'has_proportional': False,
+            'proportional_division': None,
+            'proportional_gains': None,
+            'has_equitable': False,
+            'equitable_division': None,
+            'equitable_gains': None
+        }
+        
+        if len(SP) > 0:
+            found = find_equitable_division(L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP, H)
+            if found:
+                x, sigma, ga, gb = _extract_division(found)
+                entry['has_equitable'] = True
+                entry['equitable_division'] = (x, sigma)
+                entry['equitable_gains'] = (ga, gb)
+            
+            found = find_proportional_division(L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP, H)
+            if found:
+                x, sigma, ga, gb = _extract_division(found)
+                entry['has_proportional'] = True
+                entry['proportional_division'] = (x, sigma)
+                entry['proportional_gains'] = (ga, gb)
+        
+        results.append(entry)
+    
+    return results
@@ -0,0 +1,221 @@
+"""
+Построение Парето-множества SP динамическим программированием
+Для целых (или с фиксированной точкой) оценок неделимых пунктов
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .points import PointSet, decode_sigma
+from .utils import integral_scale
+
+
+# Наибольший размер таблицы обратных ссылок M·(Aw + 1) (ячеек по 1 байту)
+DP_MAX_CELLS = 64 * 1024 * 1024
+
+
+def _scaled(values: List[float], scale: int) -> np.ndarray:
+    """Оценки в целых единицах масштаба"""
+    return np.array([round(v * scale) for v in values], dtype=np.int64)
+
+
+def dp_table_cells(a_w: List[float], scale: int) -> int:
+    """Размер таблицы обратных ссылок build_sp_dp"""
+    return len(a_w) * (int(_scaled(a_w, scale).sum()) + 1)
+
+
+def build_sp_dp(a_w: List[float], b_w: List[float],
+                scale: Optional[int] = None) -> PointSet:
+    """
+    Построение SP динамическим программированием по сумме A
+
+    Оценки переводятся в целые единицы масштаба. После i пунктов для
+    каждой достижимой суммы t оценок A хранится наибольшая сумма
+    оценок B (best[t]) и бит «пункт i получает A» для этого t. Пункт
+    i + 1 добавляется одним векторным шагом:
+        best'[t] = max(best[t] + b_i,  best[t - a_i])
+    При равенстве пункт получает B, поэтому восстановленная по битам
+    маска - наименьшая среди распределений с той же точкой (x, y), как
+    в pareto_filter. Парето-множество - суммы t по убыванию с
+    возрастающим best[t].
+
+    Стоимость O(M·Aw) операций и M·(Aw + 1) байт, где Aw - сумма a_w в
+    единицах масштаба; для H = 100 и целых оценок сотни пунктов
+    обрабатываются за миллисекунды. Выигрыши x и y суммируются по маске
+    так же, как в build_s_set, поэтому для целых оценок результат
+    совпадает с pareto_filter(build_s_set(a_w, b_w)).
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        scale: масштаб (по умолчанию - integral_scale(a_w + b_w))
+
+    Returns:
+        Парето-множество SP по убыванию x
+
+    Raises:
+        ValueError: если оценки не целые при данном масштабе
+    """
+    M = len(a_w)
+    values = list(a_w) + list(b_w)
+    if scale is None:
+        scale = integral_scale(values)
+    if scale is None or any(abs(v * scale - round(v * scale)) >= 1e-6 for v in values):
+        raise ValueError("Динамическое программирование требует целых оценок")
+
+    a = _scaled(a_w, scale)
+    b = _scaled(b_w, scale)
+    total = int(a.sum())
+
+    # best[t] - наибольшая сумма B при сумме A, равной t (-1 - недостижимо)
+    best = np.full(total + 1, -1, dtype=np.int64)
+    best[0] = 0
+    take = np.zeros((M, total + 1), dtype=bool)
+
+    for i in range(M):
+        to_b = np.where(best >= 0, best + b[i], -1)
+        to_a = np.full(total + 1, -1, dtype=np.int64)
+        to_a[a[i]:] = np.where(best[:total + 1 - a[i]] >= 0, best[:total + 1 - a[i]], -1)
+        take[i] = to_a > to_b
+        best = np.where(take[i], to_a, to_b)
+
+    # Парето-точки: по убыванию суммы A с возрастающей суммой B
+    reachable = np.nonzero(best >= 0)[0][::-1]
+    values = best[reachable]
+    keep = np.empty(len(values), dtype=bool)
+    keep[0] = True
+    keep[1:] = values[1:] > np.maximum.accumulate(values)[:-1]
+
+    points = []
+    for t in reachable[keep].tolist():
+        # Восстановление маски по обратным ссылкам
+        mask = 0
+        for i in range(M - 1, -1, -1):
+            if take[i, t]:
+                mask |= 1 << i
+                t -= int(a[i])
+        x = 0.0
+        y = 0.0
+        for i in range(M):
+            if mask & (1 << i):
+                x += a_w[i]
+            else:
+                y += b_w[i]
+        points.append((x, y, mask))
+
+    return PointSet.from_frontier(points, M)
+
+
+def difference_dp_scale(a_w: List[float], b_w: List[float]) -> Optional[int]:
+    """
+    Масштаб для find_equitable_division_dp или None, если оценки не целые
+    либо таблица M·(Aw + Bw + 1) больше DP_MAX_CELLS
+    """
+    scale = integral_scale(list(a_w) + list(b_w))
+    if scale is None:
+        return None
+    size = int(_scaled(a_w, scale).sum()) + int(_scaled(b_w, scale).sum()) + 1
+    return scale if len(a_w) * size <= DP_MAX_CELLS else None
+
+
+def find_equitable_division_dp(a_w: List[float], b_w: List[float],
+                               H: float = 100.0,
+                               scale: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Равноценный делёж без делимых пунктов (L = 0) динамическим
+    программированием по разности выигрышей
+
+    Для каждой достижимой разности d = GA - GB (в целых единицах
+    масштаба, от -Bw до Aw) хранится наибольший GA и бит «пункт i
+    получает A». При фиксированной разности наибольший GA даёт и
+    наибольшую сумму GA + GB. Перебираются все 2^M распределений, а не
+    только точки SP, и равенство проверяется точно, а не с допуском 0.01.
+
+    Если d = 0 достижимо, возвращается равноценный делёж с наибольшим
+    выигрышем. Иначе - делёж с наименьшим |GA - GB|; при равных |d| -
+    с наибольшей суммой выигрышей, затем с d < 0. Из равноценных по
+    этим правилам распределений берётся наименьшая маска (при
+    равенстве пункт получает B).
+
+    Стоимость O(M·(Aw + Bw)) операций и памяти.
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        H: сумма оценок
+        scale: масштаб (по умолчанию - integral_scale(a_w + b_w))
+
+    Returns:
+        Словарь с результатом: division, gains, difference (|GA - GB|),
+        equitable_exists (разность равна нулю), proportional_exists, method
+
+    Raises:
+        ValueError: если оценки не целые при данном масштабе
+    """
+    M = len(a_w)
+    values = list(a_w) + list(b_w)
+    if scale is None:
+        scale = integral_scale(values)
+    if scale is None or any(abs(v * scale - round(v * scale)) >= 1e-6 for v in values):
+        raise ValueError("Динамическое программирование требует целых оценок")
+
+    a = _scaled(a_w, scale)
+    b = _scaled(b_w, scale)
+    offset = int(b.sum())
+    size = offset + int(a.sum()) + 1
+
+    # best[offset + d] - наибольший GA при разности d (-1 - недостижимо)
+    best = np.full(size, -1, dtype=np.int64)
+    best[offset] = 0
+    take = np.zeros((M, size), dtype=bool)
+
+    for i in range(M):
+        ai = int(a[i])
+        bi = int(b[i])
+        to_a = np.full(size, -1, dtype=np.int64)
+        to_b = np.full(size, -1, dtype=np.int64)
+        # Пункт к A: d растёт на a_i, GA - тоже
+        to_a[ai:] = np.where(best[:size - ai] >= 0, best[:size - ai] + ai, -1)
+        # Пункт к B: d уменьшается на b_i, GA не меняется
+        to_b[:size - bi] = best[bi:]
+        take[i] = to_a > to_b
+        best = np.where(take[i], to_a, to_b)
+
+    # Наименьшая |d|, затем наибольшая сумма 2·GA - d, затем d < 0
+    reachable = np.nonzero(best >= 0)[0]
+    d = reachable - offset
+    order = np.lexsort((d, -(2 * best[reachable] - d), np.abs(d)))
+    index = int(reachable[order[0]])
+
+    mask = 0
+    for i in range(M - 1, -1, -1):
+        if take[i, index]:
+            mask |= 1 << i
+            index -= int(a[i])
+        else:
+            index += int(b[i])
+
+    ga = 0.0
+    gb = 0.0
+    for i in range(M):
+        if mask & (1 << i):
+            ga += a_w[i]
+        else:
+            gb += b_w[i]
+
+    equitable = int(d[order[0]]) == 0
+    return {
+        "proportional_exists": ga >= H / 2 - 1e-9 and gb >= H / 2 - 1e-9,
+        "equitable_exists": equitable,
+        "division": {
+            "divisible_A": {},
+            "divisible_B": {},
+            "indivisible": decode_sigma(mask, M)
+        },
+        "gains": {
+            "A": round(ga, 2),
+            "B": round(gb, 2)
+        },
+        "difference": round(abs(ga - gb), 2),
+        "method": "difference_dp"
+    }
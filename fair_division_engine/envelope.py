@@ -0,0 +1,371 @@
+"""
+Верхняя огибающая достижимого множества R ⊕ SP
+Одна монотонная ломаная вместо |SP| смещённых ломаных R* = R + (x*, y*)
+"""
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from .pareto import DOMINANCE_TOL
+from .points import SPPoints
+
+
+# Кусок огибающей: (u0, u1, v0, v1, sp_index, segment_index)
+# На [u0, u1] огибающая линейна и совпадает с отрезком segment_index
+# ломаной R + SP[sp_index]
+Piece = Tuple[float, float, float, float, int, int]
+
+# Номер отрезка для горизонтального продолжения R* влево от вершины R*[0]:
+# точки этого куска слабо доминируются вершиной R*[0]
+FLAT_SEGMENT = -1
+
+
+def _piece_value(piece: Piece, u: float) -> float:
+    """Значение линейного куска в точке u"""
+    u0, u1, v0, v1 = piece[0], piece[1], piece[2], piece[3]
+    if u == u0 or u1 == u0:
+        return v0
+    if u == u1:
+        return v1
+    return v0 + (v1 - v0) * (u - u0) / (u1 - u0)
+
+
+def _restrict(piece: Piece, a: float, b: float) -> Piece:
+    """Часть куска на [a, b]"""
+    return (a, b, _piece_value(piece, a), _piece_value(piece, b), piece[4], piece[5])
+
+
+def _append(pieces: List[Piece], piece: Piece) -> None:
+    """Добавление куска со склейкой с предыдущим куском того же отрезка"""
+    if pieces:
+        last = pieces[-1]
+        if last[4] == piece[4] and last[5] == piece[5] and last[1] == piece[0]:
+            pieces[-1] = (last[0], piece[1], last[2], piece[3], piece[4], piece[5])
+            return
+    pieces.append(piece)
+
+
+def _sp_pieces(R: List[Tuple[float, float]], x_star: float, y_star: float,
+               index: int) -> List[Piece]:
+    """
+    Функция h(u) для одной точки SP
+
+    h(u) - наибольшее v среди точек R* с абсциссой не меньше u:
+    на [0, x*] это верх ломаной, дальше - сама ломаная R* (вертикальные
+    отрезки R пропускаются - их верхняя точка уже учтена).
+    """
+    top = R[0][1] + y_star
+    pieces = []
+    if x_star > 0:
+        pieces.append((0.0, x_star, top, top, index, FLAT_SEGMENT))
+
+    for k in range(len(R) - 1):
+        u0 = R[k][0] + x_star
+        u1 = R[k + 1][0] + x_star
+        if u1 > u0:
+            pieces.append((u0, u1, R[k][1] + y_star, R[k + 1][1] + y_star, index, k))
+
+    if not pieces:
+        # Ломаная вырождена в вертикальный отрезок на оси u = 0
+        pieces.append((0.0, 0.0, top, top, index, FLAT_SEGMENT))
+    return pieces
+
+
+def _merge_envelopes(first: List[Piece], second: List[Piece]) -> List[Piece]:
+    """
+    Верхняя огибающая двух огибающих за линейное время
+
+    Обе огибающие заданы на отрезках [0, e] кусками, идущими подряд; кусок
+    нулевой длины возможен только в точке u = 0. Общие точки излома
+    разбивают ось на интервалы, на каждом из которых берётся больший
+    кусок (при пересечении - обе части). При равенстве побеждает first.
+    """
+    start = None
+    if first and first[0][1] == 0.0:
+        start = first[0]
+        first = first[1:]
+    if second and second[0][1] == 0.0:
+        if start is None or second[0][2] > start[2]:
+            start = second[0]
+        second = second[1:]
+
+    merged = []
+    i = 0
+    j = 0
+    a = 0.0
+    n1 = len(first)
+    n2 = len(second)
+
+    while i < n1 or j < n2:
+        p = first[i] if i < n1 else None
+        q = second[j] if j < n2 else None
+        b = min(p[1] if p else float('inf'), q[1] if q else float('inf'))
+
+        if q is None:
+            _append(merged, _restrict(p, a, b))
+        elif p is None:
+            _append(merged, _restrict(q, a, b))
+        else:
+            da = _piece_value(p, a) - _piece_value(q, a)
+            db = _piece_value(p, b) - _piece_value(q, b)
+            if da >= 0 and db >= 0:
+                _append(merged, _restrict(p, a, b))
+            elif da <= 0 and db <= 0:
+                _append(merged, _restrict(q, a, b))
+            else:
+                # Куски пересекаются внутри интервала
+                t = a + (b - a) * da / (da - db)
+                upper_left, upper_right = (p, q) if da > 0 else (q, p)
+                if a < t < b:
+                    _append(merged, _restrict(upper_left, a, t))
+                    _append(merged, _restrict(upper_right, t, b))
+                else:
+                    _append(merged, _restrict(upper_left if t >= b else upper_right, a, b))
+
+        if p is not None and p[1] == b:
+            i += 1
+        if q is not None and q[1] == b:
+            j += 1
+        a = b
+
+    if start is not None and (not merged or start[2] > merged[0][2]):
+        merged.insert(0, start)
+    return merged
+
+
+class Envelope:
+    """
+    Верхняя огибающая H(u) объединения ломаных R + (x*, y*) по всем точкам SP
+
+    H(u) - наибольший выигрыш B среди достижимых дележей, в которых A
+    получает не меньше u. Функция невозрастающая; её график - одна
+    монотонная ломаная, каждый кусок которой помечен точкой SP и отрезком R.
+    Вопросы о пропорциональности, равноценности и эффективности сводятся
+    к бинарному поиску по кускам.
+
+    Attributes:
+        pieces: куски (u0, u1, v0, v1, sp_index, segment_index) по возрастанию u
+    """
+
+    __slots__ = ("pieces", "_ends")
+
+    def __init__(self, pieces: List[Piece]):
+        self.pieces = pieces
+        self._ends = [piece[1] for piece in pieces]
+
+    def __len__(self) -> int:
+        return len(self.pieces)
+
+    def locate(self, u: float) -> Optional[int]:
+        """Номер куска, содержащего u, или None, если u вне области определения"""
+        if u < 0:
+            u = 0.0
+        k = bisect_left(self._ends, u)
+        return k if k < len(self.pieces) else None
+
+    def value_at(self, u: float) -> float:
+        """H(u); -inf, если A не может получить u"""
+        k = self.locate(u)
+        if k is None:
+            return float('-inf')
+        return _piece_value(self.pieces[k], u)
+
+    def dominates(self, u: float, v: float, tol: float = DOMINANCE_TOL) -> bool:
+        """Есть ли достижимый делёж, строго лучший (u, v) для обоих участников"""
+        return self.value_at(u + tol) > v + tol
+
+    def proportional_point(self, threshold: float,
+                           tol: float = 1e-9) -> Optional[Tuple[int, float]]:
+        """
+        Пропорциональная точка огибающей: u = threshold, v = H(threshold) ≥ threshold
+
+        Допуск tol поглощает погрешность округления при вычислении H.
+
+        Returns:
+            (номер куска, v) или None, если пропорционального дележа нет
+        """
+        k = self.locate(threshold)
+        if k is None:
+            return None
+        v = _piece_value(self.pieces[k], threshold)
+        if v >= threshold - tol:
+            return k, v
+        return None
+
+    def equitable_point(self) -> Optional[Tuple[int, float]]:
+        """
+        Пересечение огибающей с диагональю u = v
+
+        H(u) - u строго убывает, поэтому кусок с пересечением - последний
+        кусок, начинающийся не ниже диагонали. Если после него огибающая
+        скачком уходит под диагональ или пересечение приходится на
+        горизонтальное продолжение, эффективного равноценного дележа
+        на огибающей нет.
+
+        Returns:
+            (номер куска, t) - точка (t, t) на огибающей, или None
+        """
+        lo = 0
+        hi = len(self.pieces)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.pieces[mid][2] >= self.pieces[mid][0]:
+                lo = mid + 1
+            else:
+                hi = mid
+        k = lo - 1
+        if k < 0:
+            return None
+
+        u0, u1, v0, v1, _, segment = self.pieces[k]
+        if v1 > u1 or segment == FLAT_SEGMENT:
+            return None
+
+        denominator = (v0 - u0) - (v1 - u1)
+        s = (v0 - u0) / denominator if denominator > 0 else 0.0
+        return k, u0 + s * (u1 - u0)
+
+
+def build_envelope(R: List[Tuple[float, float]], SP: SPPoints) -> Envelope:
+    """
+    Построение верхней огибающей R ⊕ SP
+
+    Огибающие функций h отдельных точек SP сливаются попарно (разделяй и
+    властвуй), каждое слияние линейно по числу кусков. При равенстве
+    значений остаётся точка SP с меньшим номером.
+
+    Args:
+        R: ломаная для делимых пунктов
+        SP: Парето-множество (список кортежей или PointSet)
+
+    Returns:
+        Огибающая
+    """
+    level = [_sp_pieces(R, x_star, y_star, index)
+             for index, (x_star, y_star, _) in enumerate(SP)]
+    if not level:
+        return Envelope([])
+
+    while len(level) > 1:
+        merged = [_merge_envelopes(level[k], level[k + 1])
+                  for k in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            merged.append(level[-1])
+        level = merged
+
+    return Envelope(level[0])
+
+
+def _piece_segment(R: List[Tuple[float, float]], x_star: float, y_star: float,
+                   segment: int) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+    """Концы отрезка segment ломаной R* = R + (x*, y*)"""
+    p1 = (R[segment][0] + x_star, R[segment][1] + y_star)
+    p2 = (R[segment + 1][0] + x_star, R[segment + 1][1] + y_star)
+    return p1, p2
+
+
+def find_proportional_division_envelope(L: int, M: int,
+                                        a_d: List[float], b_d: List[float],
+                                        a_w: List[float], b_w: List[float],
+                                        R: List[Tuple[float, float]],
+                                        sorted_indices: List[int],
+                                        SP: SPPoints,
+                                        H: float = 100.0,
+                                        envelope: Optional[Envelope] = None) -> Optional[Dict[str, Any]]:
+    """
+    Поиск пропорционального дележа по огибающей
+
+    Пропорциональный делёж существует тогда и только тогда, когда
+    H(H/2) ≥ H/2. Возвращается точка огибающей при u = H/2 - эффективный
+    пропорциональный делёж с наибольшим выигрышем B; он может отличаться
+    от первого найденного перебором SP (find_proportional_division).
+
+    Args:
+        L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP, H:
+            как в find_proportional_division
+        envelope: готовая огибающая (по умолчанию строится по R и SP)
+
+    Returns:
+        Словарь с результатами дележа или None
+    """
+    from .proportional import build_division_from_segment, build_division_from_vertex
+
+    if envelope is None:
+        envelope = build_envelope(R, SP)
+
+    threshold = H / 2.0
+    found = envelope.proportional_point(threshold)
+    if found is None:
+        return None
+
+    k, v = found
+    sp_index, segment = envelope.pieces[k][4], envelope.pieces[k][5]
+    x_star, y_star, sigma = SP[sp_index]
+
+    if segment == FLAT_SEGMENT:
+        # Вершина R*[0] правее порога: A получает только неделимые пункты
+        division = build_division_from_vertex(
+            0, sigma, L, M, a_d, b_d, a_w, b_w, sorted_indices, x_star, y_star
+        )
+        division['method'] = 'vertex'
+    else:
+        p1, p2 = _piece_segment(R, x_star, y_star, segment)
+        division = build_division_from_segment(
+            segment, sigma, L, M, a_d, b_d, a_w, b_w,
+            sorted_indices, x_star, y_star, p1, p2, (threshold, v)
+        )
+        division['method'] = 'segment intersection'
+
+    division['search'] = 'envelope'
+    return division
+
+
+def find_equitable_division_envelope(L: int, M: int,
+                                     a_d: List[float], b_d: List[float],
+                                     a_w: List[float], b_w: List[float],
+                                     R: List[Tuple[float, float]],
+                                     sorted_indices: List[int],
+                                     SP: SPPoints,
+                                     H: float = 100.0,
+                                     envelope: Optional[Envelope] = None) -> Optional[Dict[str, Any]]:
+    """
+    Поиск эффективного равноценного дележа по огибающей
+
+    Пересечение огибающей с диагональю даёт наибольший равный выигрыш
+    среди всех точек SP - тот же, что ищет find_equitable_division, - но
+    только если это пересечение лежит на отрезке какой-либо ломаной R*.
+    Если огибающая перескакивает диагональ, возвращается None: равноценный
+    делёж тогда может существовать только неэффективный, и его нужно
+    искать перебором.
+
+    Args:
+        L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP, H:
+            как в find_equitable_division
+        envelope: готовая огибающая (по умолчанию строится по R и SP)
+
+    Returns:
+        Словарь с результатом или None
+    """
+    from .equitable import build_equitable_division_from_segment
+
+    if envelope is None:
+        envelope = build_envelope(R, SP)
+
+    found = envelope.equitable_point()
+    if found is None or found[1] <= 0:
+        # Нулевой равный выигрыш, как и в find_equitable_division, не считается
+        return None
+
+    k, t = found
+    sp_index, segment = envelope.pieces[k][4], envelope.pieces[k][5]
+    x_star, y_star, sigma = SP[sp_index]
+    p1, p2 = _piece_segment(R, x_star, y_star, segment)
+
+    division = build_equitable_division_from_segment(
+        segment, sigma, L, M, a_d, b_d, a_w, b_w,
+        sorted_indices, x_star, y_star, p1, p2, (t, t)
+    )
+    division['method'] = 'segment_equitable'
+    division['equitable'] = True
+    division['proportional_exists'] = (t >= H / 2.0)
+    division['search'] = 'envelope'
+    return division
@@ -2,8 +2,9 @@
 Поиск равноценного дележа (equitable division)
 Алгоритм AW (Adjusted Winner) из статьи
 """
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Union
 from .utils import safe_divide
+from .points import SPPoints, sigma_to_list
 
 
 def _add_statement1_classification(result: Dict[str, Any]) -> None:
@@ -61,16 +62,17 @@ def find_equitable_division(L: int, M: int,
                             a_w: List[float], b_w: List[float],
                             R: List[Tuple[float, float]],
                             sorted_indices: List[int],
-                            SP: List[Tuple[float, float, List[int]]],
+                            SP: SPPoints,
                             H: float = 100.0) -> Optional[Dict[str, Any]]:
     """
     Поиск равноценного дележа (где выигрыши A и B равны)
     
     Алгоритм:
     1. Для каждой точки (x*, y*, σ) из Парето-множества SP
-    2. Строим смещённую ломаную R* = R + (x*, y*)
-    3. Ищем пересечение R* с диагональю u = v
-    4. Выбираем делёж с максимальным общим выигрышем
+    2. Рассматриваем смещённую ломаную R* = R + (x*, y*)
+    3. Ищем пересечение R* с диагональю u = v (best_equitable_candidate)
+    4. Выбираем делёж с максимальным общим выигрышем; словарь результата
+       строится один раз, для итоговой точки
     
     Args:
         L: количество делимых пунктов
@@ -81,62 +83,110 @@ def find_equitable_division(L: int, M: int,
         b_w: оценки B для неделимых
         R: ломаная для делимых
         sorted_indices: индексы отсортированных делимых
-        SP: Парето-множество
+        SP: Парето-множество (список кортежей или PointSet)
         H: сумма оценок
         
     Returns:
         Словарь с результатом или None
     """
-    from .pareto import shift_r_polygon
+    from .pareto import ShiftedPolyline
     
-    best_result = None
+    best = None
     max_gain = 0.0
+    base = ShiftedPolyline.from_polygon(R)
     
     # Перебираем все точки Парето-множества
     for x_star, y_star, sigma in SP:
-        # Строим смещённую ломаную R*
-        R_star = shift_r_polygon(R, x_star, y_star)
+        # Смещённая ломаная R* без копирования вершин
+        R_star = base.shifted(x_star, y_star)
         
-        # Проверяем вершины на равенство u = v
-        for i, (u, v) in enumerate(R_star):
-            diff = abs(u - v)
-            if diff < 0.01:  # Практически равны
-                gain = (u + v) / 2.0
-                # Equitable не требует пропорциональности, только GA = GB
-                if gain > max_gain:
-                    max_gain = gain
-                    best_result = build_equitable_division_from_vertex(
-                        i, sigma, L, M, a_d, b_d, a_w, b_w,
-                        sorted_indices, x_star, y_star, gain
-                    )
-                    best_result['method'] = 'vertex_equitable'
-                    # Проверяем пропорциональность отдельно
-                    best_result['proportional_exists'] = (gain >= H / 2.0)
+        # Equitable не требует пропорциональности, только GA = GB
+        candidate = best_equitable_candidate(R_star)
+        if candidate is not None and candidate[0] > max_gain:
+            max_gain = candidate[0]
+            best = (candidate, R_star, sigma)
+    
+    if best is None:
+        return None
+    
+    candidate, R_star, sigma = best
+    return build_equitable_result(
+        candidate, R_star, sigma, L, M, a_d, b_d, a_w, b_w, sorted_indices, H
+    )
+
+
+def best_equitable_candidate(R_star: "ShiftedPolyline") -> Optional[Tuple[float, int, Optional[Tuple[float, float]]]]:
+    """
+    Лучшая равноценная точка на одной смещённой ломаной R*
+    
+    Кандидаты - вершины с |u - v| < 0.01 и пересечения отрезков с
+    диагональю u = v; вершины и отрезки у диагонали находятся бинарным
+    поиском (u - v вдоль R* не убывает). Из кандидатов с равным выигрышем
+    остаётся первый: сначала вершины, затем отрезки, по возрастанию индекса.
+    
+    Args:
+        R_star: смещённая ломаная (ShiftedPolyline)
         
-        # Проверяем отрезки на пересечение с диагональю u = v
-        for k in range(len(R_star) - 1):
-            p1 = R_star[k]
-            p2 = R_star[k + 1]
-            
-            intersection = find_diagonal_intersection(p1, p2)
-            
-            if intersection is not None:
-                u_eq, v_eq = intersection
-                gain = (u_eq + v_eq) / 2.0
-                
-                # Equitable требует только GA = GB, пропорциональность проверяется отдельно
-                if gain > max_gain:
-                    max_gain = gain
-                    best_result = build_equitable_division_from_segment(
-                        k, sigma, L, M, a_d, b_d, a_w, b_w,
-                        sorted_indices, x_star, y_star, p1, p2, intersection
-                    )
-                    best_result['method'] = 'segment_equitable'
-                    best_result['equitable'] = True
-                    # Проверяем пропорциональность отдельно
-                    best_result['proportional_exists'] = (gain >= H / 2.0)
-    
-    return best_result
+    Returns:
+        (выигрыш, индекс вершины или отрезка, пересечение или None для вершины)
+        или None, если R* не подходит к диагонали
+    """
+    best = None
+    
+    # Проверяем вершины на равенство u = v
+    for i in R_star.diagonal_vertices(0.01):
+        u, v = R_star[i]
+        gain = (u + v) / 2.0
+        if best is None or gain > best[0]:
+            best = (gain, i, None)
+    
+    # Проверяем отрезки на пересечение с диагональю u = v
+    for k in R_star.diagonal_segments():
+        p1, p2 = R_star.segment(k)
+        intersection = find_diagonal_intersection(p1, p2)
+        if intersection is not None:
+            gain = (intersection[0] + intersection[1]) / 2.0
+            if best is None or gain > best[0]:
+                best = (gain, k, intersection)
+    
+    return best
+
+
+def build_equitable_result(candidate: Tuple[float, int, Optional[Tuple[float, float]]],
+                           R_star: "ShiftedPolyline", sigma: Union[int, List[int]],
+                           L: int, M: int,
+                           a_d: List[float], b_d: List[float],
+                           a_w: List[float], b_w: List[float],
+                           sorted_indices: List[int],
+                           H: float = 100.0) -> Dict[str, Any]:
+    """
+    Построение равноценного дележа по кандидату best_equitable_candidate
+    
+    Returns:
+        Словарь с результатом (как у find_equitable_division)
+    """
+    gain, index, intersection = candidate
+    x_star = R_star.x_star
+    y_star = R_star.y_star
+    
+    if intersection is None:
+        result = build_equitable_division_from_vertex(
+            index, sigma, L, M, a_d, b_d, a_w, b_w,
+            sorted_indices, x_star, y_star, gain
+        )
+        result['method'] = 'vertex_equitable'
+    else:
+        p1, p2 = R_star.segment(index)
+        result = build_equitable_division_from_segment(
+            index, sigma, L, M, a_d, b_d, a_w, b_w,
+            sorted_indices, x_star, y_star, p1, p2, intersection
+        )
+        result['method'] = 'segment_equitable'
+        result['equitable'] = True
+    
+    # Проверяем пропорциональность отдельно
+    result['proportional_exists'] = (gain >= H / 2.0)
+    return result
 
 
 def find_diagonal_intersection(p1: Tuple[float, float],
@@ -188,7 +238,7 @@ def find_diagonal_intersection(p1: Tuple[float, float],
     return None
 
 
-def build_equitable_division_from_vertex(vertex_idx: int, sigma: List[int],
+def build_equitable_division_from_vertex(vertex_idx: int, sigma: Union[int, List[int]],
                                         L: int, M: int,
                                         a_d: List[float], b_d: List[float],
                                         a_w: List[float], b_w: List[float],
@@ -216,7 +266,7 @@ def build_equitable_division_from_vertex(vertex_idx: int, sigma: List[int],
         "division": {
             "divisible_A": divisible_to_A,
             "divisible_B": divisible_to_B,
-            "indivisible": sigma
+            "indivisible": sigma_to_list(sigma, M)
         },
         "gains": {
             "A": round(gain, 2),
@@ -234,7 +284,7 @@ def build_equitable_division_from_vertex(vertex_idx: int, sigma: List[int],
     return result
 
 
-def build_equitable_division_from_segment(segment_idx: int, sigma: List[int],
+def build_equitable_division_from_segment(segment_idx: int, sigma: Union[int, List[int]],
                                          L: int, M: int,
                                          a_d: List[float], b_d: List[float],
                                          a_w: List[float], b_w: List[float],
@@ -291,7 +341,7 @@ def build_equitable_division_from_segment(segment_idx: int, sigma: List[int],
         "division": {
             "divisible_A": divisible_to_A,
             "divisible_B": divisible_to_B,
-            "indivisible": sigma
+            "indivisible": sigma_to_list(sigma, M)
         },
         "gains": {
             "A": round(gain_A, 2),
@@ -0,0 +1,159 @@
+"""
+Построение Парето-множества SP во внешней памяти
+Для M, при которых 2^M точек множества S не помещаются в оперативную память
+"""
+import os
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .indivisible import iter_s_blocks
+from .pareto import pareto_filter_arrays
+from .points import MAX_INT64_ITEMS, PointSet
+
+
+# Запись точки S в файле отсортированной серии
+POINT_DTYPE = np.dtype([("x", "<f8"), ("y", "<f8"), ("mask", "<i8")])
+
+# Бюджет оперативной памяти по умолчанию (байт)
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Сортировка серии требует памяти примерно втрое больше самой серии
+SORT_OVERHEAD = 3
+
+
+def _write_sorted_run(path: str, x: np.ndarray, y: np.ndarray, mask: np.ndarray) -> int:
+    """
+    Запись блока S в файл, отсортированного в порядке pareto_filter
+
+    Порядок: x по убыванию, y по убыванию, маска по возрастанию.
+
+    Returns:
+        число записанных точек
+    """
+    order = np.lexsort((mask, -y, -x))
+    run = np.memmap(path, dtype=POINT_DTYPE, mode="w+", shape=(len(order),))
+    run["x"] = x[order]
+    run["y"] = y[order]
+    run["mask"] = mask[order]
+    run.flush()
+    del run
+    return len(order)
+
+
+def _keys_not_after(chunk: np.ndarray, bound: Tuple[float, float, int]) -> np.ndarray:
+    """Точки chunk, идущие в порядке слияния не позже точки bound"""
+    bx, by, bmask = bound
+    x = chunk["x"]
+    y = chunk["y"]
+    return (x > bx) | ((x == bx) & ((y > by) | ((y == by) & (chunk["mask"] <= bmask))))
+
+
+def _merge_runs(runs: List[np.memmap], buffer_points: int) -> np.ndarray:
+    """
+    Слияние отсортированных серий с проходом по убыванию x (как в pareto_filter)
+
+    Из каждой серии в память читается буфер не более buffer_points точек.
+    На каждом шаге сливаются все буферизованные точки, не превосходящие
+    наименьшую из последних точек буферов недочитанных серий: все
+    оставшиеся точки заведомо идут после них. В памяти остаётся только
+    найденный фронт. Каждая порция фильтруется pareto_filter_arrays.
+
+    Returns:
+        Парето-фронт - массив записей POINT_DTYPE по убыванию x
+    """
+    positions = [0] * len(runs)
+    buffers = [run[:0] for run in runs]
+    max_y = float('-inf')
+    frontier = []
+
+    while True:
+        # Пополняем пустые буферы
+        for r, run in enumerate(runs):
+            if len(buffers[r]) == 0 and positions[r] < len(run):
+                end = min(positions[r] + buffer_points, len(run))
+                buffers[r] = np.array(run[positions[r]:end])
+                positions[r] = end
+
+        if all(len(buf) == 0 for buf in buffers):
+            break
+
+        # Граница безопасного слияния - по сериям, прочитанным не до конца
+        pending = [buffers[r][-1] for r in range(len(runs)) if positions[r] < len(runs[r])]
+        if pending:
+            bound = min(pending, key=lambda p: (-p["x"], -p["y"], p["mask"]))
+            bound = (bound["x"], bound["y"], bound["mask"])
+
+        taken = []
+        for r, buf in enumerate(buffers):
+            if len(buf) == 0:
+                continue
+            count = int(_keys_not_after(buf, bound).sum()) if pending else len(buf)
+            taken.append(buf[:count])
+            buffers[r] = buf[count:]
+
+        chunk = np.concatenate(taken)
+
+        # Фронт порции (тот же порядок и выбор наименьшей маски, что и в
+        # pareto_filter); из него остаются точки выше фронта прошлых порций
+        x, y, mask = pareto_filter_arrays(chunk["x"], chunk["y"], chunk["mask"])
+        keep = y > max_y
+        if keep.any():
+            part = np.empty(int(keep.sum()), dtype=POINT_DTYPE)
+            part["x"] = x[keep]
+            part["y"] = y[keep]
+            part["mask"] = mask[keep]
+            frontier.append(part)
+            max_y = float(y[-1])
+
+    return np.concatenate(frontier)
+
+
+def build_sp_external(a_w: List[float], b_w: List[float],
+                      scratch_dir: Optional[str] = None,
+                      memory_budget: int = DEFAULT_MEMORY_BUDGET) -> PointSet:
+    """
+    Построение SP во внешней памяти
+
+    1. Множество S генерируется блоками (iter_s_blocks), размер блока
+       выбирается по бюджету памяти; каждый блок сортируется и пишется
+       отдельной серией (x, y, mask) в отображаемый в память файл.
+    2. Серии сливаются с тем же проходом по убыванию x, что и в
+       pareto_filter; в памяти хранится только Парето-фронт.
+
+    Результат совпадает с pareto_filter(build_s_set(a_w, b_w)).
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        scratch_dir: каталог для временных файлов серий
+                     (по умолчанию - системный временный каталог)
+        memory_budget: бюджет оперативной памяти в байтах
+
+    Returns:
+        Парето-множество SP по убыванию x
+
+    Raises:
+        ValueError: если M слишком велико для масок int64
+    """
+    M = len(a_w)
+    if M > MAX_INT64_ITEMS:
+        raise ValueError(f"Внешняя сортировка поддерживает M ≤ {MAX_INT64_ITEMS}")
+
+    run_points = max(1, memory_budget // (SORT_OVERHEAD * POINT_DTYPE.itemsize))
+    block_bits = min(M, run_points.bit_length() - 1)
+
+    with tempfile.TemporaryDirectory(prefix="fair_division_sp_", dir=scratch_dir) as tmp:
+        paths = []
+        for r, (x, y, mask) in enumerate(iter_s_blocks(a_w, b_w, block_bits)):
+            path = os.path.join(tmp, f"run_{r}.bin")
+            _write_sorted_run(path, x, y, mask)
+            paths.append(path)
+
+        runs = [np.memmap(path, dtype=POINT_DTYPE, mode="r") for path in paths]
+        buffer_points = max(1, memory_budget // (2 * POINT_DTYPE.itemsize * len(runs)))
+        frontier = _merge_runs(runs, buffer_points)
+        del runs
+
+    return PointSet(frontier["x"], frontier["y"], frontier["mask"].astype(np.int64), M)
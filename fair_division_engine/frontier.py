@@ -0,0 +1,435 @@
+"""
+Построение Парето-множества SP без перебора всего множества S
+"""
+import heapq
+import math
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .points import PointSet
+
+
+# Точка фронта: (x, y, mask), бит i маски равен σ[i]
+FrontierPoint = Tuple[float, float, int]
+
+
+def merge_frontiers(first: List[FrontierPoint],
+                    second: List[FrontierPoint]) -> List[FrontierPoint]:
+    """
+    Слияние двух Парето-фронтов за линейное время
+
+    Оба фронта упорядочены по убыванию x (как результат pareto_filter).
+    Точки сливаются в порядке (x по убыванию, y по убыванию, маска по
+    возрастанию) и проходят тот же отбор, что и в pareto_filter: точка
+    остаётся, если её y строго больше всех предыдущих. Из совпадающих
+    точек остаётся точка с наименьшей маской.
+
+    Args:
+        first: первый фронт [(x, y, mask), ...]
+        second: второй фронт [(x, y, mask), ...]
+
+    Returns:
+        Парето-фронт объединения
+    """
+    merged = []
+    max_y = float('-inf')
+    i = 0
+    j = 0
+    n1 = len(first)
+    n2 = len(second)
+
+    while i < n1 or j < n2:
+        if j >= n2:
+            point = first[i]
+            i += 1
+        elif i >= n1:
+            point = second[j]
+            j += 1
+        else:
+            p = first[i]
+            q = second[j]
+            if (-p[0], -p[1], p[2]) <= (-q[0], -q[1], q[2]):
+                point = p
+                i += 1
+            else:
+                point = q
+                j += 1
+
+        if point[1] > max_y:
+            merged.append(point)
+            max_y = point[1]
+
+    return merged
+
+
+def build_frontier_points(a_w: List[float], b_w: List[float]) -> List[FrontierPoint]:
+    """
+    Пошаговое построение Парето-фронта неделимых пунктов
+
+    Пункты добавляются по одному. На шаге i текущий фронт копируется
+    дважды: "пункт i к A" (x + a_w[i]) и "пункт i к B" (y + b_w[i]);
+    обе копии уже упорядочены по x, поэтому их слияние с отбором
+    недоминируемых точек линейно по размеру фронта.
+
+    Стоимость O(M·|SP|) вместо O(M·2^M): множество S не строится.
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+
+    Returns:
+        Парето-фронт [(x, y, mask), ...] по убыванию x
+    """
+    frontier = [(0.0, 0.0, 0)]
+
+    for i in range(len(a_w)):
+        bit = 1 << i
+        ai = a_w[i]
+        bi = b_w[i]
+        to_a = [(x + ai, y, mask | bit) for x, y, mask in frontier]
+        to_b = [(x, y + bi, mask) for x, y, mask in frontier]
+        frontier = merge_frontiers(to_a, to_b)
+
+    return frontier
+
+
+def build_sp_frontier(a_w: List[float], b_w: List[float]) -> PointSet:
+    """
+    Построение Парето-множества SP пошаговым добавлением пунктов
+
+    Результат совпадает с pareto_filter(build_s_set(a_w, b_w)).
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+
+    Returns:
+        Парето-множество SP по убыванию x
+    """
+    return PointSet.from_frontier(build_frontier_points(a_w, b_w), len(a_w))
+
+
+def build_frontier_points_by_count(a_w: List[float], b_w: List[float],
+                                   weights: Optional[Sequence[int]] = None) -> List[List[FrontierPoint]]:
+    """
+    Парето-фронты распределений с заданным числом пунктов у A
+
+    Как build_frontier_points, но число пунктов c, полученных A, -
+    дополнительное измерение: для каждого c хранится свой фронт. Пункт i
+    переводит фронт c в c (к B) и в c + w_i (к A), фронты с одинаковым c
+    сливаются merge_frontiers. Стоимость O(M·W·|SP_c|), W - сумма весов.
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        weights: сколько пунктов считается за каждый (для пакетов;
+                 по умолчанию по 1)
+
+    Returns:
+        exact[c] - Парето-фронт [(x, y, mask), ...] по убыванию x среди
+        распределений, где A получает ровно c пунктов
+    """
+    M = len(a_w)
+    weights = list(weights) if weights is not None else [1] * M
+    total = sum(weights)
+    exact: List[List[FrontierPoint]] = [[(0.0, 0.0, 0)]] + [[] for _ in range(total)]
+
+    for i in range(M):
+        bit = 1 << i
+        ai = a_w[i]
+        bi = b_w[i]
+        w = weights[i]
+        updated = []
+        for c in range(total + 1):
+            to_b = [(x, y + bi, mask) for x, y, mask in exact[c]]
+            to_a = [(x + ai, y, mask | bit) for x, y, mask in exact[c - w]] if c >= w else []
+            updated.append(merge_frontiers(to_a, to_b))
+        exact = updated
+
+    return exact
+
+
+def build_sp_by_count(a_w: List[float], b_w: List[float], counts: Sequence[int],
+                      weights: Optional[Sequence[int]] = None) -> Dict[int, PointSet]:
+    """
+    Парето-множества SP при ограничении «A получает не более k пунктов»
+
+    Все k обрабатываются за один проход build_frontier_points_by_count:
+    SP для k - слияние фронтов с c = 0..k, накапливаемое по возрастанию
+    k. Множество S не строится и не фильтруется.
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        counts: значения k (k < 0 - пустое множество)
+        weights: сколько пунктов считается за каждый (по умолчанию по 1)
+
+    Returns:
+        {k: SP по убыванию x}
+    """
+    M = len(a_w)
+    exact = build_frontier_points_by_count(a_w, b_w, weights)
+
+    at_most = []
+    frontier: List[FrontierPoint] = []
+    for points in exact:
+        frontier = merge_frontiers(frontier, points)
+        at_most.append(frontier)
+
+    return {
+        k: PointSet.from_frontier(at_most[min(k, len(at_most) - 1)] if k >= 0 else [], M)
+        for k in counts
+    }
+
+
+def iter_combined_frontiers(low: List[FrontierPoint],
+                            high: List[FrontierPoint]) -> Iterator[FrontierPoint]:
+    """
+    Ленивая выдача Парето-фронта сумм точек двух независимых фронтов
+
+    Для каждой точки l из low последовательность l + h (h из high по
+    убыванию x) уже упорядочена по убыванию x, поэтому все |low| потоков
+    сливаются кучей в порядке убывания x с отбором, как в pareto_filter.
+    Поток отбрасывается, как только даже его последняя точка (максимальный
+    y) не превосходит текущего максимума y; внутри потока точки с
+    y ≤ max_y пропускаются бинарным поиском. Извлечений из кучи не больше
+    |low|·|high|.
+
+    Маски high должны занимать биты, не пересекающиеся с масками low.
+
+    Args:
+        low: первый фронт [(x, y, mask), ...] по убыванию x
+        high: второй фронт [(x, y, mask), ...] по убыванию x
+
+    Yields:
+        (x, y, mask) - точки Парето-фронта по убыванию x
+    """
+    if not low or not high:
+        return
+
+    high_y = [y for _, y, _ in high]
+    last = len(high) - 1
+
+    heap = []
+    for li, (lx, ly, lmask) in enumerate(low):
+        hx, hy, hmask = high[0]
+        heap.append((-(lx + hx), -(ly + hy), lmask | hmask, li, 0))
+    heapq.heapify(heap)
+
+    max_y = float('-inf')
+
+    while heap:
+        neg_x, neg_y, mask, li, j = heapq.heappop(heap)
+        y = -neg_y
+
+        if y > max_y:
+            yield (-neg_x, y, mask)
+            max_y = y
+            j += 1
+        else:
+            # Пропускаем точки потока, которые заведомо доминируются
+            j = bisect_right(high_y, max_y - low[li][1], j + 1)
+
+        if j <= last:
+            lx, ly, lmask = low[li]
+            hx, hy, hmask = high[j]
+            heapq.heappush(heap, (-(lx + hx), -(ly + hy), lmask | hmask, li, j))
+
+
+def combine_frontiers(low: List[FrontierPoint],
+                      high: List[FrontierPoint]) -> List[FrontierPoint]:
+    """
+    Парето-фронт сумм точек двух независимых фронтов (сумма Минковского)
+
+    Полный проход iter_combined_frontiers.
+
+    Args:
+        low: первый фронт [(x, y, mask), ...] по убыванию x
+        high: второй фронт [(x, y, mask), ...] по убыванию x
+
+    Returns:
+        Парето-фронт [(x, y, mask), ...] по убыванию x
+    """
+    return list(iter_combined_frontiers(low, high))
+
+
+def build_sp_meet_in_middle(a_w: List[float], b_w: List[float]) -> PointSet:
+    """
+    Построение SP методом встречи посередине
+
+    Пункты делятся на две половины, для каждой строится свой Парето-фронт
+    (с той же семантикой, что и pareto_filter), после чего фронты
+    объединяются слиянием отсортированных потоков (combine_frontiers).
+
+    Результат совпадает с pareto_filter(build_s_set(a_w, b_w)) с точностью
+    до округления при сложении x и y в другом порядке.
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+
+    Returns:
+        Парето-множество SP по убыванию x
+    """
+    M = len(a_w)
+    half = M // 2
+
+    low = build_frontier_points(a_w[:half], b_w[:half])
+    high = [(x, y, mask << half)
+            for x, y, mask in build_frontier_points(a_w[half:], b_w[half:])]
+
+    return PointSet.from_frontier(combine_frontiers(low, high), M)
+
+
+def trim_frontier(frontier: List[FrontierPoint], ratio: float) -> List[FrontierPoint]:
+    """
+    Прореживание Парето-фронта по геометрической сетке по x
+
+    Ось x делится на ячейки [ratio^k, ratio^(k+1)); из точек одной ячейки
+    остаётся точка с наибольшим y (во фронте по убыванию x - последняя).
+    Для каждой удалённой точки (x, y) остаётся точка (x', y') с
+    x' ≥ x / ratio и y' ≥ y.
+
+    Args:
+        frontier: Парето-фронт [(x, y, mask), ...] по убыванию x
+        ratio: шаг сетки, больше 1
+
+    Returns:
+        Прореженный фронт по убыванию x
+    """
+    log_ratio = math.log(ratio)
+    trimmed = []
+    last_cell = None
+
+    for point in frontier:
+        x = point[0]
+        cell = math.floor(math.log(x) / log_ratio) if x > 0 else float('-inf')
+        if cell == last_cell:
+            trimmed[-1] = point
+        else:
+            trimmed.append(point)
+            last_cell = cell
+
+    return trimmed
+
+
+def build_frontier_points_approx(a_w: List[float], b_w: List[float],
+                                 epsilon: float) -> List[FrontierPoint]:
+    """
+    ε-приближённый Парето-фронт неделимых пунктов (FPTAS)
+
+    Как build_frontier_points, но после добавления каждого пункта фронт
+    прореживается по геометрической сетке по x с шагом (1 + ε)^(1/M).
+    Погрешности шагов перемножаются, поэтому для каждой точки (x, y)
+    точного SP найдётся точка результата с x' ≥ x / (1 + ε) и y' ≥ y.
+    Размер фронта на каждом шаге - не больше числа ячеек сетки,
+    O(M / ε · log(Aw)), то есть полиномиален по M / ε.
+
+    Округляется только x: для равноценного дележа этого достаточно,
+    а y остаётся точным.
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        epsilon: допустимая относительная погрешность по x, ε > 0
+
+    Returns:
+        Подмножество S [(x, y, mask), ...] по убыванию x
+    """
+    M = len(a_w)
+    if M == 0:
+        return [(0.0, 0.0, 0)]
+
+    ratio = math.exp(math.log1p(epsilon) / M)
+    frontier = [(0.0, 0.0, 0)]
+
+    for i in range(M):
+        bit = 1 << i
+        ai = a_w[i]
+        bi = b_w[i]
+        to_a = [(x + ai, y, mask | bit) for x, y, mask in frontier]
+        to_b = [(x, y + bi, mask) for x, y, mask in frontier]
+        frontier = trim_frontier(merge_frontiers(to_a, to_b), ratio)
+
+    return frontier
+
+
+def build_sp_approx(a_w: List[float], b_w: List[float], epsilon: float) -> PointSet:
+    """
+    ε-приближённое Парето-множество SP
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        epsilon: допустимая относительная погрешность, ε > 0
+
+    Returns:
+        Приближённое SP по убыванию x (все точки - реальные распределения)
+    """
+    return PointSet.from_frontier(build_frontier_points_approx(a_w, b_w, epsilon), len(a_w))
+
+
+def approx_error_bound(a_w: List[float], epsilon: float) -> Dict[str, float]:
+    """
+    Гарантированная погрешность выигрышей при ε-приближённом SP
+
+    Каждая точка точного SP теряет по x не более x·ε/(1 + ε) ≤ Aw·ε/(1 + ε),
+    где Aw - сумма a_w. Сдвиг убывающей ломаной R* влево на d уменьшает
+    точку её пересечения с диагональю не более чем на d, поэтому
+    равноценный делёж теряет не более этой величины у каждого участника.
+    Пропорциональный делёж может быть не найден, если у точного решения
+    запас меньше этой величины.
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        epsilon: относительная погрешность построения SP
+
+    Returns:
+        {'epsilon': ε, 'A': ..., 'B': ...} - верхние границы недобора выигрышей
+    """
+    loss = sum(a_w) * epsilon / (1 + epsilon)
+    return {'epsilon': epsilon, 'A': loss, 'B': loss}
+
+
+def iter_sp_descending(a_w: List[float], b_w: List[float]) -> Iterator[FrontierPoint]:
+    """
+    Ленивая генерация Парето-множества SP по убыванию x
+
+    Пункты делятся на две половины, как в build_sp_meet_in_middle: фронт
+    каждой половины строится build_frontier_points за O(M·|SP|), а их
+    сумма выдаётся по одной точке iter_combined_frontiers. Распределения
+    вне фронтов половин не рассматриваются, поэтому работа полиномиальна
+    по размерам фронтов, а не 2^M.
+
+    Потребитель может остановиться на любой точке: слияние выполняется
+    только до неё. Результат совпадает с pareto_filter(build_s_set(a_w, b_w))
+    с точностью до округления при сложении x и y в другом порядке.
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+
+    Yields:
+        (x, y, mask) - точки SP по убыванию x
+    """
+    half = len(a_w) // 2
+
+    low = build_frontier_points(a_w[:half], b_w[:half])
+    high = [(x, y, mask << half)
+            for x, y, mask in build_frontier_points(a_w[half:], b_w[half:])]
+
+    yield from iter_combined_frontiers(low, high)
+
+
+def build_sp_lazy(a_w: List[float], b_w: List[float]) -> PointSet:
+    """
+    Построение Парето-множества SP полным проходом iter_sp_descending
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+
+    Returns:
+        Парето-множество SP по убыванию x
+    """
+    return PointSet.from_frontier(list(iter_sp_descending(a_w, b_w)), len(a_w))
@@ -0,0 +1,89 @@
+"""
+Однопроходный поиск всех типов дележей
+За один перебор SP находятся равноценный, пропорциональный и лучший по
+сумме выигрышей дележи, а также строится множество достижимых выигрышей
+для проверки эффективности
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from .equitable import best_equitable_candidate, build_equitable_result
+from .pareto import OnlineSkyline, ShiftedPolyline
+from .points import SPPoints
+from .proportional import check_sp_point, proportional_window
+
+
+def fused_scan(L: int, M: int,
+               a_d: List[float], b_d: List[float],
+               a_w: List[float], b_w: List[float],
+               R: List[Tuple[float, float]],
+               sorted_indices: List[int],
+               SP: SPPoints,
+               H: float = 100.0) -> Dict[str, Any]:
+    """
+    Один проход по SP вместо отдельных вызовов find_equitable_division,
+    find_proportional_division, is_efficient и max(SP)
+    
+    Для каждой точки (x*, y*, σ) строится одна смещённая ломаная R*, по ней:
+    1. кандидат в равноценный делёж (best_equitable_candidate); словарь
+       результата строится один раз, для итоговой точки;
+    2. пока пропорциональный делёж не найден - check_sp_point для точек
+       из окна proportional_window;
+    3. лучшая точка SP по x* + y*;
+    4. вершины R* добавляются в OnlineSkyline - Парето-фронт всех
+       выигрышей (u, v), по которому эффективность проверяется бинарным
+       поиском, без перебора SP и построения R для каждой точки.
+    
+    Результаты совпадают с раздельными функциями.
+    
+    Returns:
+        Словарь:
+        - equitable: результат как у find_equitable_division или None
+        - proportional: результат как у find_proportional_division или None
+        - best_sp: точка SP с максимальной суммой x* + y* или None
+        - dominance: OnlineSkyline вершин всех R*
+    """
+    threshold = H / 2.0
+    window = proportional_window(R, SP, threshold)
+    base = ShiftedPolyline.from_polygon(R)
+    dominance = OnlineSkyline()
+    
+    best_equitable = None
+    max_gain = 0.0
+    proportional = None
+    best_sp = None
+    best_sum = None
+    
+    for index, point in enumerate(SP):
+        x_star, y_star, sigma = point
+        R_star = base.shifted(x_star, y_star)
+        
+        candidate = best_equitable_candidate(R_star)
+        if candidate is not None and candidate[0] > max_gain:
+            max_gain = candidate[0]
+            best_equitable = (candidate, R_star, sigma)
+        
+        if proportional is None and index in window:
+            proportional = check_sp_point(
+                R_star, sigma, L, M, a_d, b_d, a_w, b_w, sorted_indices, threshold
+            )
+        
+        if best_sp is None or x_star + y_star > best_sum:
+            best_sp = point
+            best_sum = x_star + y_star
+        
+        for u, v in R_star:
+            dominance.add(u, v, 0)
+    
+    equitable: Optional[Dict[str, Any]] = None
+    if best_equitable is not None:
+        candidate, R_star, sigma = best_equitable
+        equitable = build_equitable_result(
+            candidate, R_star, sigma, L, M, a_d, b_d, a_w, b_w, sorted_indices, H
+        )
+    
+    return {
+        'equitable': equitable,
+        'proportional': proportional,
+        'best_sp': best_sp,
+        'dominance': dominance
+    }
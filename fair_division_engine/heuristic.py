@@ -0,0 +1,176 @@
+"""
+Быстрый эвристический поиск пропорционального дележа для больших M
+Жадное распределение неделимых пунктов и локальный поиск обменами одного
+и двух пунктов; найденный пропорциональный делёж позволяет не строить S и SP
+"""
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+from .pareto import ShiftedPolyline
+from .proportional import check_sp_point
+from .r_polygon import polyline_coordinates
+from .reduction import ItemReduction
+
+
+# Ограничение числа раундов локального поиска
+MAX_ROUNDS = 50
+
+
+def _maximin(us: List[float], vs: List[float], diffs: List[float],
+             x_star: float, y_star: float) -> float:
+    """
+    max min(u, v) по смещённой ломаной R* = R + (x*, y*)
+
+    Вдоль R разность u - v не убывает, поэтому максимум достигается в
+    пересечении R* с диагональью u = v (бинарный поиск по diffs), а если
+    пересечения нет - в крайней вершине. Делёж пропорционален тогда и
+    только тогда, когда значение не меньше H/2.
+    """
+    i = bisect_left(diffs, y_star - x_star)
+    if i == 0:
+        return vs[0] + y_star
+    if i == len(diffs):
+        return us[-1] + x_star
+
+    # Пересечение отрезка (i-1, i) с диагональю
+    d0 = diffs[i - 1] + x_star - y_star
+    d1 = diffs[i] + x_star - y_star
+    t = -d0 / (d1 - d0)
+    return us[i - 1] + x_star + t * (us[i] - us[i - 1])
+
+
+def greedy_local_search(R: List[Tuple[float, float]],
+                        a: List[float], b: List[float],
+                        x_offset: float = 0.0, y_offset: float = 0.0,
+                        max_rounds: int = MAX_ROUNDS) -> int:
+    """
+    Распределение неделимых пунктов, максимизирующее min(GA, GB) локально
+
+    1. Пункты сортируются по убыванию a/b, как делимые в build_r_polygon;
+       A получает префикс, из M+1 разрезов выбирается лучший.
+    2. Локальный поиск: за раунд выполняется лучший переход одного пункта
+       к другому участнику, а если такого улучшения нет - лучший обмен
+       пункта A на пункт B. Поиск останавливается в локальном оптимуме
+       или через max_rounds раундов.
+
+    Args:
+        R: ломаная для делимых пунктов
+        a, b: оценки неделимых пунктов (или свободных групп)
+        x_offset, y_offset: выигрыши от закреплённых пунктов
+        max_rounds: ограничение числа раундов локального поиска
+
+    Returns:
+        маска пунктов, получаемых A
+    """
+    us, vs = polyline_coordinates(R)
+    diffs = [u - v for u, v in zip(us, vs)]
+    n = len(a)
+
+    def score(x: float, y: float) -> float:
+        return _maximin(us, vs, diffs, x, y)
+
+    # Жадный разрез по убыванию a/b
+    order = sorted(range(n), key=lambda j: -a[j] / b[j] if b[j] > 0 else float('-inf'))
+    x = x_offset
+    y = y_offset + sum(b)
+    best_cut = 0
+    best = score(x, y)
+    for t, j in enumerate(order, start=1):
+        x += a[j]
+        y -= b[j]
+        value = score(x, y)
+        if value > best:
+            best = value
+            best_cut = t
+
+    sigma = [0] * n
+    for j in order[:best_cut]:
+        sigma[j] = 1
+    x = x_offset + sum(a[j] for j in range(n) if sigma[j])
+    y = y_offset + sum(b[j] for j in range(n) if not sigma[j])
+
+    for _ in range(max_rounds):
+        move = None
+        move_score = best
+
+        # Переход одного пункта
+        for j in range(n):
+            sign = -1 if sigma[j] else 1
+            value = score(x + sign * a[j], y - sign * b[j])
+            if value > move_score + 1e-9:
+                move_score = value
+                move = (j,)
+
+        # Обмен пункта A на пункт B
+        if move is None:
+            given = [j for j in range(n) if sigma[j]]
+            kept = [j for j in range(n) if not sigma[j]]
+            for i in given:
+                for j in kept:
+                    value = score(x - a[i] + a[j], y + b[i] - b[j])
+                    if value > move_score + 1e-9:
+                        move_score = value
+                        move = (i, j)
+
+        if move is None:
+            break
+        for j in move:
+            sign = -1 if sigma[j] else 1
+            x += sign * a[j]
+            y -= sign * b[j]
+            sigma[j] = 1 - sigma[j]
+        best = move_score
+
+    return sum(1 << j for j in range(n) if sigma[j])
+
+
+def find_proportional_division_heuristic(L: int, M: int,
+                                         a_d: List[float], b_d: List[float],
+                                         a_w: List[float], b_w: List[float],
+                                         R: List[Tuple[float, float]],
+                                         sorted_indices: List[int],
+                                         H: float = 100.0,
+                                         reduction: Optional[ItemReduction] = None,
+                                         max_rounds: int = MAX_ROUNDS) -> Optional[Dict[str, Any]]:
+    """
+    Эвристический поиск пропорционального дележа без SP
+
+    Распределение неделимых находится greedy_local_search по свободным
+    группам reduction; для его ломаной R* пропорциональность проверяется
+    check_sp_point (вершины и отрезки, как check_vertex_proportionality и
+    check_segment_proportionality). Найденный делёж - сертификат
+    существования; None не означает, что пропорционального дележа нет.
+
+    Args:
+        L, M: количество делимых и неделимых пунктов
+        a_d, b_d: оценки делимых пунктов
+        a_w, b_w: оценки неделимых пунктов
+        R: ломаная для делимых
+        sorted_indices: индексы отсортированных делимых
+        H: сумма оценок
+        reduction: закреплённые пункты и пакеты (по умолчанию -
+                   ItemReduction(a_w, b_w))
+        max_rounds: ограничение числа раундов локального поиска
+
+    Returns:
+        Словарь с результатом (как у find_proportional_division) или None
+    """
+    if reduction is None:
+        reduction = ItemReduction(a_w, b_w)
+    free_a, free_b = reduction.reduced(a_w, b_w)
+
+    mask = greedy_local_search(
+        R, free_a, free_b, reduction.x_offset, reduction.y_offset, max_rounds
+    )
+    x_star = reduction.x_offset + sum(free_a[j] for j in range(len(free_a)) if mask >> j & 1)
+    y_star = reduction.y_offset + sum(free_b[j] for j in range(len(free_b)) if not mask >> j & 1)
+    sigma = reduction.expand_mask(mask)
+
+    R_star = ShiftedPolyline.from_polygon(R).shifted(x_star, y_star)
+
+    division = check_sp_point(
+        R_star, sigma, L, M, a_d, b_d, a_w, b_w, sorted_indices, H / 2.0
+    )
+    if division is not None:
+        division['search'] = 'heuristic'
+    return division
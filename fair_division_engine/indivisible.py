@@ -1,10 +1,15 @@
 """
 Генерация множества S всех распределений неделимых пунктов
 """
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 
-def build_s_set(a_w: List[float], b_w: List[float]) -> List[Tuple[float, float, List[int]]]:
+from .pareto import pareto_filter_arrays
+from .points import Allocation, PointSet, decode_sigma
+
+
+def build_s_set(a_w: List[float], b_w: List[float]) -> List[Tuple[float, float, Allocation]]:
     """
     Построение множества S всех возможных распределений неделимых пунктов
     
@@ -20,12 +25,13 @@ def build_s_set(a_w: List[float], b_w: List[float]) -> List[Tuple[float, float,
         b_w: оценки участника B для неделимых пунктов
         
     Returns:
-        Список точек [(x, y, σ), ...] где σ - список из 0 и 1
+        Список точек [(x, y, σ), ...] где σ - Allocation, последовательность
+        из 0 и 1, раскрываемая в список только по запросу
     """
     M = len(a_w)
     
     if M == 0:
-        return [(0.0, 0.0, [])]
+        return [(0.0, 0.0, Allocation(0, 0))]
     
     S = []
     
@@ -33,18 +39,163 @@ def build_s_set(a_w: List[float], b_w: List[float]) -> List[Tuple[float, float,
     for mask in range(1 << M):  # 2^M
         x = 0.0  # выигрыш A
         y = 0.0  # выигрыш B
-        sigma = []
         
         for i in range(M):
             if mask & (1 << i):
                 # Пункт i получает A
-                sigma.append(1)
                 x += a_w[i]
             else:
                 # Пункт i получает B
-                sigma.append(0)
                 y += b_w[i]
         
-        S.append((x, y, sigma))
+        S.append((x, y, Allocation(mask, M)))
     
     return S
+
+
+def iter_s_set(a_w: List[float], b_w: List[float]) -> Iterator[Tuple[float, float, int]]:
+    """
+    Ленивая генерация множества S
+    
+    Точки выдаются по одной в порядке возрастания маски с теми же значениями
+    x и y, что и в build_s_set, но без списка σ и без хранения S в памяти.
+    
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        
+    Yields:
+        (x, y, mask) - бит i маски равен σ[i]
+    """
+    M = len(a_w)
+    
+    for mask in range(1 << M):
+        x = 0.0
+        y = 0.0
+        for i in range(M):
+            if mask & (1 << i):
+                x += a_w[i]
+            else:
+                y += b_w[i]
+        yield x, y, mask
+
+
+# Размер блока масок для векторизованной генерации S (2^16 точек на блок)
+S_BLOCK_BITS = 16
+
+
+def iter_s_blocks(a_w: List[float], b_w: List[float],
+                  block_bits: int = S_BLOCK_BITS,
+                  highs: Optional[Iterable[int]] = None) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Поблочная векторизованная генерация множества S
+    
+    Младшие block_bits пунктов перебираются удвоением подмножеств:
+    для каждого пункта i массив сумм копируется и к копии прибавляется a_w[i]
+    (или b_w[i]). Старшие биты маски задают номер блока и добавляются
+    к таблице младших сумм поэлементно. Порядок сложения совпадает
+    с build_s_set, поэтому значения x и y совпадают с ним побитово.
+    
+    Пиковая память ограничена размером одного блока (2^block_bits точек).
+    
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        block_bits: число младших пунктов, перебираемых внутри блока
+        highs: номера блоков (старшие биты маски); по умолчанию все блоки
+        
+    Yields:
+        (x, y, mask) - массивы numpy: выигрыши A, выигрыши B и маски σ
+        (бит i маски равен σ[i])
+    """
+    M = len(a_w)
+    low = min(M, block_bits)
+    
+    # Таблица сумм для младших пунктов (удвоение подмножеств)
+    x_low = np.zeros(1)
+    y_low = np.zeros(1)
+    for i in range(low):
+        # Бит i = 0: пункт к B, бит i = 1: пункт к A
+        x_low = np.concatenate((x_low, x_low + a_w[i]))
+        y_low = np.concatenate((y_low + b_w[i], y_low))
+    low_masks = np.arange(1 << low, dtype=np.int64)
+    
+    if highs is None:
+        highs = range(1 << (M - low))
+    
+    for high in highs:
+        x = x_low
+        y = y_low
+        for i in range(low, M):
+            if high & (1 << (i - low)):
+                x = x + a_w[i]
+            else:
+                y = y + b_w[i]
+        yield x, y, low_masks | (high << low)
+
+
+def build_s_arrays(a_w: List[float], b_w: List[float],
+                   block_bits: int = S_BLOCK_BITS) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Построение множества S в виде массивов numpy
+    
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        block_bits: размер блока генерации (см. iter_s_blocks)
+        
+    Returns:
+        (x, y, mask) - массивы длины 2^M, упорядоченные по маске
+    """
+    blocks = list(iter_s_blocks(a_w, b_w, block_bits))
+    return (np.concatenate([b[0] for b in blocks]),
+            np.concatenate([b[1] for b in blocks]),
+            np.concatenate([b[2] for b in blocks]))
+
+
+def build_s_points(a_w: List[float], b_w: List[float]) -> PointSet:
+    """
+    Построение множества S в компактном виде (массивы x, y и маски)
+    
+    В отличие от build_s_set не создаёт список σ для каждой из 2^M точек.
+    
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        
+    Returns:
+        PointSet из 2^M точек, упорядоченных по маске
+    """
+    x, y, mask = build_s_arrays(a_w, b_w)
+    return PointSet(x, y, mask, len(a_w))
+
+
+def build_sp_numpy(a_w: List[float], b_w: List[float],
+                   block_bits: int = S_BLOCK_BITS,
+                   highs: Optional[Iterable[int]] = None) -> PointSet:
+    """
+    Построение Парето-множества SP через векторизованную генерацию S
+    
+    Каждый блок S сразу сводится к своему Парето-множеству, после чего
+    фронты блоков объединяются. Полное множество S в памяти не хранится.
+    Результат совпадает с pareto_filter(build_s_set(a_w, b_w)).
+    
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        block_bits: размер блока генерации (см. iter_s_blocks)
+        highs: номера блоков; по умолчанию все (тогда результат - SP),
+               иначе - Парето-множество только этих блоков
+        
+    Returns:
+        Парето-множество SP по убыванию x
+    """
+    xs, ys, masks = [], [], []
+    for x, y, mask in iter_s_blocks(a_w, b_w, block_bits, highs):
+        x, y, mask = pareto_filter_arrays(x, y, mask)
+        xs.append(x)
+        ys.append(y)
+        masks.append(mask)
+    
+    x, y, mask = pareto_filter_arrays(np.concatenate(xs), np.concatenate(ys), np.concatenate(masks))
+    return PointSet(x, y, mask, len(a_w))
@@ -0,0 +1,75 @@
+"""
+Параллельное построение Парето-множества SP на нескольких процессах
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+
+from .indivisible import S_BLOCK_BITS, build_sp_numpy
+from .pareto import pareto_filter
+from .points import PointSet
+
+
+def _shard_frontier(a_w: List[float], b_w: List[float],
+                    block_bits: int, first_block: int, blocks: int) -> PointSet:
+    """Парето-множество одного шарда (блоки first_block ... first_block + blocks - 1)"""
+    return build_sp_numpy(a_w, b_w, block_bits, range(first_block, first_block + blocks))
+
+
+def build_sp_parallel(a_w: List[float], b_w: List[float],
+                      workers: Optional[int] = None,
+                      shard_bits: Optional[int] = None,
+                      block_bits: int = S_BLOCK_BITS) -> PointSet:
+    """
+    Построение SP перебором масок, разделённым между процессами
+
+    Пространство масок делится на 2^shard_bits шардов по старшим битам.
+    Каждый процесс строит Парето-множество своего шарда (build_sp_numpy по
+    его блокам), родительский процесс объединяет фронты шардов и отбирает
+    из них итоговое SP. Значения x, y и выбор маски среди совпадающих точек
+    те же, что и у pareto_filter(build_s_set(a_w, b_w)).
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        workers: число процессов (по умолчанию - число процессоров);
+                 при workers=1 шарды считаются в текущем процессе
+        shard_bits: число старших битов маски, задающих шард
+                    (по умолчанию около четырёх шардов на процесс)
+        block_bits: размер блока генерации внутри шарда
+
+    Returns:
+        Парето-множество SP по убыванию x
+    """
+    M = len(a_w)
+    workers = workers or os.cpu_count() or 1
+
+    if shard_bits is None:
+        shard_bits = (workers - 1).bit_length() + 2
+    shard_bits = min(shard_bits, M)
+    block_bits = min(block_bits, M - shard_bits)
+
+    shards = 1 << shard_bits
+    blocks_per_shard = 1 << (M - shard_bits - block_bits)
+    first_blocks = [s * blocks_per_shard for s in range(shards)]
+
+    if workers == 1:
+        frontiers = [_shard_frontier(a_w, b_w, block_bits, first, blocks_per_shard)
+                     for first in first_blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            frontiers = list(pool.map(
+                _shard_frontier,
+                [a_w] * shards, [b_w] * shards, [block_bits] * shards,
+                first_blocks, [blocks_per_shard] * shards
+            ))
+
+    merged = PointSet(
+        np.concatenate([f.x for f in frontiers]),
+        np.concatenate([f.y for f in frontiers]),
+        np.concatenate([f.mask for f in frontiers]),
+        M
+    )
+    return pareto_filter(merged)
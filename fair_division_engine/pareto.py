@@ -2,10 +2,31 @@
 Выделение Парето-множества SP из множества S
 Алгоритм из методички
 """
-from typing import List, Tuple
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 
-def pareto_filter(S: List[Tuple[float, float, List[int]]]) -> List[Tuple[float, float, List[int]]]:
+from .points import PointSet, SPPoints, mask_array
+from .r_polygon import (
+    diagonal_segments,
+    diagonal_vertices,
+    first_vertex_at_least,
+    polyline_coordinates,
+    threshold_segments
+)
+
+
+# Запас, с которым одна точка выигрышей строго доминирует другую; общий
+# для всех способов проверки эффективности
+DOMINANCE_TOL = 1e-6
+
+# Наибольшее число сумм (x* + u, y* + v), которое DominanceIndex держит в
+# памяти одновременно
+DOMINANCE_INDEX_BLOCK = 1 << 20
+
+
+def pareto_filter(S: SPPoints) -> SPPoints:
     """
     Выделение Парето-множества SP
     
@@ -19,10 +40,14 @@ def pareto_filter(S: List[Tuple[float, float, List[int]]]) -> List[Tuple[float,
     
     Args:
         S: множество всех распределений неделимых пунктов
+           (список кортежей или PointSet)
         
     Returns:
-        Парето-множество SP ⊆ S
+        Парето-множество SP ⊆ S в том же представлении, что и S
     """
+    if isinstance(S, PointSet):
+        return _pareto_filter_points(S)
+    
     if not S:
         return []
     
@@ -46,6 +71,167 @@ def pareto_filter(S: List[Tuple[float, float, List[int]]]) -> List[Tuple[float,
     return SP
 
 
+def pareto_filter_arrays(x: np.ndarray, y: np.ndarray,
+                         mask: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Выделение Парето-множества SP из множества S, заданного массивами
+    
+    Векторная версия pareto_filter без цикла Python:
+    1. Одна сортировка lexsort: x по убыванию, y по убыванию, маска по возрастанию
+    2. Накопленный максимум y (np.maximum.accumulate)
+    3. Точка остаётся, если её y строго больше максимума всех предыдущих
+    
+    Из совпадающих точек (x, y) остаётся точка с наименьшей маской, поэтому
+    результат детерминирован и совпадает с pareto_filter(build_s_set(...)).
+    
+    Args:
+        x: выигрыши A
+        y: выигрыши B
+        mask: маски распределений (по умолчанию - номера точек)
+        
+    Returns:
+        (x, y, mask) - массивы Парето-множества по убыванию x
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if mask is None:
+        mask = np.arange(len(x), dtype=np.int64)
+    
+    if len(x) == 0:
+        return x, y, mask
+    
+    if mask.dtype == object:
+        # Маски шире 64 бит: lexsort устойчив, поэтому сначала упорядочиваем по маске
+        by_mask = np.argsort(mask, kind="stable")
+        order = by_mask[np.lexsort((-y[by_mask], -x[by_mask]))]
+    else:
+        order = np.lexsort((mask, -y, -x))
+    
+    x, y, mask = x[order], y[order], mask[order]
+    keep = np.empty(len(y), dtype=bool)
+    keep[0] = True
+    keep[1:] = y[1:] > np.maximum.accumulate(y)[:-1]
+    return x[keep], y[keep], mask[keep]
+
+
+def _pareto_filter_points(S: PointSet) -> PointSet:
+    """Парето-фильтрация компактного множества S (через pareto_filter_arrays)"""
+    x, y, mask = pareto_filter_arrays(S.x, S.y, S.mask)
+    return PointSet(x, y, mask, S.M)
+
+
+def _staircase(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Недоминируемые точки по убыванию x, как в pareto_filter_arrays
+
+    Маски не нужны: из совпадающих точек остаётся любая.
+    """
+    if len(x) == 0:
+        return x, y
+    order = np.lexsort((-y, -x))
+    x, y = x[order], y[order]
+    keep = np.empty(len(y), dtype=bool)
+    keep[0] = True
+    keep[1:] = y[1:] > np.maximum.accumulate(y)[:-1]
+    return x[keep], y[keep]
+
+
+class OnlineSkyline:
+    """
+    Парето-множество, пополняемое по одной точке
+    
+    Хранит только недоминируемые точки в порядке возрастания x (y при этом
+    строго убывает). Вставка находит соседа бинарным поиском, поэтому
+    отбор точек S не требует сортировки всего множества и памяти O(|S|).
+    Семантика совпадает с pareto_filter: слабо доминируемые точки
+    отбрасываются, из совпадающих остаётся точка с меньшей маской.
+    """
+    
+    def __init__(self):
+        self._xs: List[float] = []
+        self._ys: List[float] = []
+        self._masks: List[int] = []
+    
+    def __len__(self) -> int:
+        return len(self._xs)
+    
+    def add(self, x: float, y: float, mask: int) -> bool:
+        """
+        Добавление точки
+        
+        Args:
+            x: выигрыш A
+            y: выигрыш B
+            mask: маска распределения
+            
+        Returns:
+            True если точка вошла в Парето-множество
+        """
+        xs, ys, masks = self._xs, self._ys, self._masks
+        i = bisect_left(xs, x)
+        
+        # Точка с x' ≥ x и максимальным y - первая справа
+        if i < len(xs) and ys[i] >= y:
+            if xs[i] == x and ys[i] == y and mask < masks[i]:
+                masks[i] = mask
+                return True
+            return False
+        
+        # Удаляем точку с тем же x и меньшим y
+        end = i
+        if i < len(xs) and xs[i] == x:
+            end = i + 1
+        
+        # Удаляем точки слева, у которых y ≤ нового y
+        start = i
+        while start > 0 and ys[start - 1] <= y:
+            start -= 1
+        
+        xs[start:end] = [x]
+        ys[start:end] = [y]
+        masks[start:end] = [mask]
+        return True
+    
+    def dominates(self, x: float, y: float) -> bool:
+        """
+        Есть ли точка со строго большими x и y
+        
+        Среди точек с x' > x наибольший y у первой, поэтому достаточно
+        одного бинарного поиска.
+        """
+        k = bisect_right(self._xs, x)
+        return k < len(self._xs) and self._ys[k] > y
+    
+    def to_point_set(self, M: int) -> PointSet:
+        """Парето-множество по убыванию x (как у pareto_filter)"""
+        return PointSet(
+            np.array(self._xs[::-1], dtype=np.float64),
+            np.array(self._ys[::-1], dtype=np.float64),
+            mask_array(self._masks[::-1], M),
+            M
+        )
+
+
+def pareto_filter_stream(points: Iterable[Tuple[float, float, int]], M: int) -> PointSet:
+    """
+    Выделение Парето-множества из потока точек
+    
+    Поток читается один раз, в памяти хранится только текущее
+    Парето-множество (O(|SP|) вместо O(|S|)).
+    
+    Args:
+        points: итерируемый набор (x, y, mask), например iter_s_set(a_w, b_w)
+        M: количество неделимых пунктов
+        
+    Returns:
+        Парето-множество SP по убыванию x
+    """
+    skyline = OnlineSkyline()
+    for x, y, mask in points:
+        skyline.add(x, y, mask)
+    return skyline.to_point_set(M)
+
+
 def shift_r_polygon(R: List[Tuple[float, float]], x_star: float, y_star: float) -> List[Tuple[float, float]]:
     """
     Построение смещённой ломаной R*
@@ -64,3 +250,134 @@ def shift_r_polygon(R: List[Tuple[float, float]], x_star: float, y_star: float)
         Смещённая ломаная R*
     """
     return [(x + x_star, y + y_star) for x, y in R]
+
+
+class DominanceIndex:
+    """
+    Лестница всех достижимых выигрышей (GA, GB)
+    
+    Достижимые выигрыши - вершины ломаных R* = R + (x*, y*) по всем точкам
+    SP (отрезки R* лежат не выше своих вершин). Индекс строится один раз:
+    |SP|·(L+1) сумм отбираются блоками не больше DOMINANCE_INDEX_BLOCK
+    сумм, каждый блок сливается с уже построенной лестницей, поэтому память
+    O(блок + лестница), а не O(|SP|·(L+1)). Остаются точки по возрастанию
+    x со строго убывающим y. Вопрос «доминируется ли (GA, GB) строго»
+    решается одним бинарным поиском за O(log n).
+    """
+    
+    __slots__ = ("xs", "ys")
+    
+    def __init__(self, xs: List[float], ys: List[float]):
+        self.xs = xs
+        self.ys = ys
+    
+    @classmethod
+    def build(cls, R: List[Tuple[float, float]], SP: SPPoints,
+              block: int = DOMINANCE_INDEX_BLOCK) -> "DominanceIndex":
+        """
+        Построение индекса по ломаной R и Парето-множеству SP
+        
+        Args:
+            R: ломаная для делимых пунктов
+            SP: Парето-множество (список кортежей или PointSet)
+            block: наибольшее число сумм x* + u, обрабатываемых за раз
+        """
+        us, vs = polyline_coordinates(R)
+        us = np.asarray(us, dtype=np.float64)
+        vs = np.asarray(vs, dtype=np.float64)
+        if isinstance(SP, PointSet):
+            sp_x, sp_y = SP.x, SP.y
+        else:
+            sp_x = np.array([p[0] for p in SP], dtype=np.float64)
+            sp_y = np.array([p[1] for p in SP], dtype=np.float64)
+        
+        rows = max(1, block // len(us))
+        x = np.empty(0, dtype=np.float64)
+        y = np.empty(0, dtype=np.float64)
+        for start in range(0, len(sp_x), rows):
+            block_x = (sp_x[start:start + rows, None] + us[None, :]).ravel()
+            block_y = (sp_y[start:start + rows, None] + vs[None, :]).ravel()
+            x, y = _staircase(np.concatenate((x, block_x)), np.concatenate((y, block_y)))
+        return cls(x[::-1].tolist(), y[::-1].tolist())
+    
+    def __len__(self) -> int:
+        return len(self.xs)
+    
+    def dominates(self, x: float, y: float) -> bool:
+        """
+        Есть ли достижимая точка со строго большими x и y
+        
+        Среди точек с x' > x наибольший y у первой.
+        """
+        k = bisect_right(self.xs, x)
+        return k < len(self.xs) and self.ys[k] > y
+
+
+class ShiftedPolyline:
+    """
+    Смещённая ломаная R* = R + (x*, y*) без копирования вершин
+
+    Хранит координаты вершин R (общие для всех точек SP) и смещение (x*, y*);
+    вершины, отрезки и пересечения с порогами и диагональю вычисляются
+    арифметически. Значения вершин совпадают с shift_r_polygon.
+
+    Attributes:
+        us, vs: координаты вершин исходной ломаной R
+        x_star, y_star: смещение
+    """
+
+    __slots__ = ("us", "vs", "x_star", "y_star")
+
+    def __init__(self, us: List[float], vs: List[float],
+                 x_star: float = 0.0, y_star: float = 0.0):
+        self.us = us
+        self.vs = vs
+        self.x_star = x_star
+        self.y_star = y_star
+
+    @classmethod
+    def from_polygon(cls, R: List[Tuple[float, float]]) -> "ShiftedPolyline":
+        """Несмещённое представление ломаной R"""
+        us, vs = polyline_coordinates(R)
+        return cls(us, vs)
+
+    def shifted(self, x_star: float, y_star: float) -> "ShiftedPolyline":
+        """R + (x*, y*) над теми же координатами вершин"""
+        return ShiftedPolyline(self.us, self.vs, x_star, y_star)
+
+    def __len__(self) -> int:
+        return len(self.us)
+
+    def __getitem__(self, i: int) -> Tuple[float, float]:
+        return self.us[i] + self.x_star, self.vs[i] + self.y_star
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        x_star = self.x_star
+        y_star = self.y_star
+        for u, v in zip(self.us, self.vs):
+            yield u + x_star, v + y_star
+
+    def segment(self, k: int) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """Концы отрезка k"""
+        return self[k], self[k + 1]
+
+    def first_vertex_at_least(self, threshold: float) -> int:
+        """Первая вершина с u ≥ threshold (len, если таких нет)"""
+        return first_vertex_at_least(self.us, self.x_star, threshold)
+
+    def threshold_segments(self, threshold: float) -> range:
+        """Отрезки, пересекающие вертикаль u = threshold"""
+        return threshold_segments(self.us, self.x_star, threshold)
+
+    def diagonal_vertices(self, tol: float) -> range:
+        """Вершины с |u - v| < tol"""
+        return diagonal_vertices(self.us, self.vs, self.x_star, self.y_star, tol)
+
+    def diagonal_segments(self) -> range:
+        """Отрезки, которые могут пересечь диагональ u = v"""
+        return diagonal_segments(self.us, self.vs, self.x_star, self.y_star)
+
+    def coordinates(self) -> Tuple[List[float], List[float]]:
+        """Списки абсцисс и ординат вершин (например, для графика)"""
+        return ([u + self.x_star for u in self.us],
+                [v + self.y_star for v in self.vs])
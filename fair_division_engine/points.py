@@ -0,0 +1,201 @@
+"""
+Компактное представление множеств S и SP
+Параллельные массивы x, y и одна битовая маска σ на точку
+"""
+from collections.abc import Sequence as SequenceABC
+from typing import Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+
+# Маски до 62 пунктов хранятся в int64, для большего M - целыми Python
+MAX_INT64_ITEMS = 62
+
+
+def decode_sigma(mask: int, M: int) -> List[int]:
+    """
+    Преобразование маски в список σ из 0 и 1
+
+    Args:
+        mask: битовая маска (бит i = 1 означает, что пункт i получает A)
+        M: количество неделимых пунктов
+
+    Returns:
+        σ - список длины M
+    """
+    return [(mask >> i) & 1 for i in range(M)]
+
+
+def encode_sigma(sigma: Sequence[int]) -> int:
+    """
+    Преобразование списка σ в битовую маску
+
+    Args:
+        sigma: распределение неделимых пунктов (1=A, 0=B)
+
+    Returns:
+        маска, у которой бит i равен σ[i]
+    """
+    mask = 0
+    for i, owner in enumerate(sigma):
+        if owner:
+            mask |= 1 << i
+    return mask
+
+
+class Allocation(SequenceABC):
+    """
+    Распределение неделимых пунктов σ с ленивым раскрытием
+
+    Хранит только маску и число пунктов. Ведёт себя как последовательность
+    из 0 и 1 (len, индексирование, итерация) и равно списку σ с теми же
+    значениями и Allocation с той же маской и M; с маской-числом не
+    сравнивается (int(σ) даёт маску). Список строится только при
+    формировании ответа (to_list / sigma_to_list).
+
+    Attributes:
+        mask: битовая маска (бит i = 1 означает, что пункт i получает A)
+        M: количество неделимых пунктов
+    """
+
+    __slots__ = ("mask", "M")
+
+    def __init__(self, mask: int, M: int):
+        self.mask = mask
+        self.M = M
+
+    def __len__(self) -> int:
+        return self.M
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.to_list()[index]
+        if index < 0:
+            index += self.M
+        if not 0 <= index < self.M:
+            raise IndexError("индекс пункта вне диапазона")
+        return (self.mask >> index) & 1
+
+    def __iter__(self) -> Iterator[int]:
+        mask = self.mask
+        for i in range(self.M):
+            yield (mask >> i) & 1
+
+    def __int__(self) -> int:
+        return self.mask
+
+    __index__ = __int__
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Allocation):
+            return self.mask == other.mask and self.M == other.M
+        if isinstance(other, SequenceABC) and not isinstance(other, str):
+            return len(other) == self.M and self.to_list() == list(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.mask, self.M))
+
+    def __repr__(self) -> str:
+        return f"Allocation({self.to_list()})"
+
+    def to_list(self) -> List[int]:
+        """σ в виде списка из 0 и 1"""
+        return decode_sigma(self.mask, self.M)
+
+
+def sigma_to_list(sigma: Union[int, Sequence[int]], M: int) -> List[int]:
+    """
+    Распределение неделимых пунктов в виде списка σ
+
+    Точки SP несут σ маской или ленивым Allocation; список строится
+    только для точек, попадающих в ответ.
+
+    Args:
+        sigma: маска или список σ
+        M: количество неделимых пунктов
+
+    Returns:
+        σ - список из 0 и 1
+    """
+    if isinstance(sigma, Allocation):
+        return sigma.to_list()
+    if isinstance(sigma, (int, np.integer)):
+        return decode_sigma(int(sigma), M)
+    return list(sigma)
+
+
+def mask_array(masks: Sequence[int], M: int) -> np.ndarray:
+    """Массив масок подходящего типа для M пунктов"""
+    if M <= MAX_INT64_ITEMS:
+        return np.asarray(masks, dtype=np.int64)
+    return np.array(list(masks), dtype=object)
+
+
+class PointSet:
+    """
+    Множество точек (x, y, σ) в виде структуры массивов
+
+    Вместо списка кортежей (x, y, List[int]) хранит два массива float64
+    и массив масок. Итерация и индексирование возвращают кортежи
+    (x, y, Allocation), поэтому PointSet можно передавать везде, где
+    ожидается список точек SP; σ раскрывается в список через sigma()
+    или sigma_to_list().
+
+    Attributes:
+        x: выигрыши A
+        y: выигрыши B
+        mask: маски распределений (бит i равен σ[i])
+        M: количество неделимых пунктов
+    """
+
+    __slots__ = ("x", "y", "mask", "M")
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, mask: np.ndarray, M: int):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.mask = mask
+        self.M = M
+
+    @classmethod
+    def from_frontier(cls, points: Sequence[Tuple[float, float, int]], M: int) -> "PointSet":
+        """Построение из списка [(x, y, mask), ...]"""
+        return cls(
+            np.fromiter((p[0] for p in points), dtype=np.float64, count=len(points)),
+            np.fromiter((p[1] for p in points), dtype=np.float64, count=len(points)),
+            mask_array([p[2] for p in points], M),
+            M
+        )
+
+    @classmethod
+    def from_tuples(cls, points: Sequence[Tuple[float, float, Sequence[int]]], M: int) -> "PointSet":
+        """Построение из списка [(x, y, σ), ...] в формате build_s_set"""
+        return cls.from_frontier([(x, y, encode_sigma(sigma)) for x, y, sigma in points], M)
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __iter__(self) -> Iterator[Tuple[float, float, Allocation]]:
+        M = self.M
+        for x, y, mask in zip(self.x.tolist(), self.y.tolist(), self.mask.tolist()):
+            yield x, y, Allocation(mask, M)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return PointSet(self.x[index], self.y[index], self.mask[index], self.M)
+        return float(self.x[index]), float(self.y[index]), Allocation(int(self.mask[index]), self.M)
+
+    def __repr__(self) -> str:
+        return f"PointSet(size={len(self)}, M={self.M})"
+
+    def sigma(self, index: int) -> List[int]:
+        """Распределение σ точки index в виде списка"""
+        return decode_sigma(int(self.mask[index]), self.M)
+
+    def to_tuples(self) -> List[Tuple[float, float, List[int]]]:
+        """Преобразование в список [(x, y, σ), ...] в формате pareto_filter"""
+        return [(x, y, sigma.to_list()) for x, y, sigma in self]
+
+
+# Множество точек SP в любом из двух представлений
+SPPoints = Union[PointSet, List[Tuple[float, float, Sequence[int]]]]
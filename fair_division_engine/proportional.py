@@ -2,8 +2,19 @@
 Проверка пропорциональности и поиск справедливого дележа
 Реализует алгоритмы из секции 4 методички
 """
-from typing import List, Tuple, Optional, Dict, Any
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple, Optional, Dict, Any, Union
 from .utils import safe_divide
+from .points import SPPoints, sigma_to_list
+
+
+# Бюджет узлов поиска с отсечениями: на задачах без пропорционального
+# дележа отсечения могут не срабатывать, и число узлов растёт как 2^M
+BNB_MAX_NODES = 1 << 18
+
+
+class SearchBudgetExceeded(RuntimeError):
+    """Поиск с отсечениями исчерпал бюджет узлов, ответ не получен"""
 
 
 def _add_statement1_classification(result: Dict[str, Any]) -> None:
@@ -123,13 +134,13 @@ def find_proportional_division(L: int, M: int,
                                a_w: List[float], b_w: List[float],
                                R: List[Tuple[float, float]],
                                sorted_indices: List[int],
-                               SP: List[Tuple[float, float, List[int]]],
+                               SP: SPPoints,
                                H: float = 100.0) -> Optional[Dict[str, Any]]:
     """
     Главный алгоритм поиска пропорционального дележа
     
     Псевдокод (раздел 8 ТЗ):
-        для каждой точки (x*, y*, σ) из SP:
+        для каждой точки (x*, y*, σ) из окна SP (proportional_window):
             построить R* = R + (x*, y*)
             проверить вершины: если u_i ≥ H/2 и v_i ≥ H/2 → найден делёж
             проверить отрезки: если отрезок пересекает x=H/2 при y≥H/2 → найден делёж
@@ -144,54 +155,296 @@ def find_proportional_division(L: int, M: int,
         b_w: оценки B для неделимых пунктов
         R: ломаная для делимых пунктов
         sorted_indices: индексы отсортированных делимых пунктов
-        SP: Парето-множество
+        SP: Парето-множество (список кортежей или PointSet)
         H: сумма оценок (обычно 100)
         
     Returns:
         Словарь с результатами дележа или None если пропорциональный делёж не существует
     """
-    from .pareto import shift_r_polygon
+    from .pareto import ShiftedPolyline
     
     threshold = H / 2.0
+    base = ShiftedPolyline.from_polygon(R)
+    
+    # Перебираем точки Парето-множества, из которых R* достигает квадранта
+    # u ≥ H/2, v ≥ H/2, в исходном порядке
+    for index in proportional_window(R, SP, threshold):
+        x_star, y_star, sigma = SP[index]
+        division = check_sp_point(
+            base.shifted(x_star, y_star), sigma, L, M, a_d, b_d, a_w, b_w,
+            sorted_indices, threshold
+        )
+        if division is not None:
+            return division
+    
+    # Пропорциональный делёж не найден
+    return None
+
+
+def find_proportional_division_lazy(L: int, M: int,
+                                    a_d: List[float], b_d: List[float],
+                                    a_w: List[float], b_w: List[float],
+                                    R: List[Tuple[float, float]],
+                                    sorted_indices: List[int],
+                                    H: float = 100.0) -> Optional[Dict[str, Any]]:
+    """
+    Поиск пропорционального дележа по лениво генерируемому SP
+    
+    Точки SP берутся из iter_sp_descending по убыванию x и проверяются так
+    же, как в find_proportional_division. Поиск останавливается на первом
+    дележе или как только x* + Ad < H/2 (у следующих точек x* ещё меньше),
+    поэтому SP и S целиком не строятся. Результат совпадает с
+    find_proportional_division для SP, построенного pareto_filter.
     
-    # Перебираем все точки Парето-множества
-    for x_star, y_star, sigma in SP:
-        # Строим смещённую ломаную R*
-        R_star = shift_r_polygon(R, x_star, y_star)
+    Args:
+        L, M: количество делимых и неделимых пунктов
+        a_d, b_d: оценки делимых пунктов
+        a_w, b_w: оценки неделимых пунктов
+        R: ломаная для делимых пунктов
+        sorted_indices: индексы отсортированных делимых пунктов
+        H: сумма оценок
         
-        # Проверка вершин (условия 8a, 8b)
-        vertex_idx = check_vertex_proportionality(R_star, threshold)
+    Returns:
+        Словарь с результатами дележа или None если пропорциональный делёж не существует
+    """
+    from .frontier import iter_sp_descending
+    from .pareto import ShiftedPolyline
+    from .points import Allocation
+    
+    threshold = H / 2.0
+    base = ShiftedPolyline.from_polygon(R)
+    a_total = R[-1][0]
+    b_total = R[0][1]
+    
+    for x_star, y_star, mask in iter_sp_descending(a_w, b_w):
+        if x_star + a_total < threshold:
+            break
+        if y_star + b_total < threshold:
+            continue
+        division = check_sp_point(
+            base.shifted(x_star, y_star), Allocation(mask, M), L, M,
+            a_d, b_d, a_w, b_w, sorted_indices, threshold
+        )
+        if division is not None:
+            return division
+    
+    return None
+
+
+def proportional_window(R: List[Tuple[float, float]], SP: SPPoints,
+                        threshold: float) -> range:
+    """
+    Окно точек SP, смещённая ломаная которых может дать пропорциональный делёж
+    
+    Вдоль R* выигрыш A не больше x* + Ad, выигрыш B не больше y* + Bd,
+    поэтому нужны x* + Ad ≥ H/2 и y* + Bd ≥ H/2. SP упорядочено по
+    убыванию x (y при этом возрастает): первое условие задаёт префикс SP,
+    второе - суффикс, обе границы находятся бинарным поиском. Точки вне
+    окна не проходят ни проверку вершин, ни проверку отрезков, поэтому
+    перебор окна в исходном порядке находит тот же делёж, что и перебор
+    всего SP.
+    
+    Args:
+        R: ломаная для делимых пунктов (Ad = u последней вершины,
+           Bd = v первой вершины)
+        SP: Парето-множество по убыванию x
+        threshold: порог H/2
         
-        if vertex_idx is not None:
-            # Найден пропорциональный делёж в вершине
-            division = build_division_from_vertex(
-                vertex_idx, sigma, L, M, a_d, b_d, a_w, b_w, 
-                sorted_indices, x_star, y_star
+    Returns:
+        диапазон индексов SP
+    """
+    a_total = R[-1][0]
+    b_total = R[0][1]
+    
+    # Префикс с x* + Ad ≥ H/2: ключ -(x* + Ad) не убывает
+    hi = bisect_right(SP, -threshold, key=lambda p: -(p[0] + a_total))
+    # Суффикс префикса с y* + Bd ≥ H/2
+    lo = bisect_left(SP, threshold, 0, hi, key=lambda p: p[1] + b_total)
+    return range(lo, hi)
+
+
+def check_sp_point(R_star: "ShiftedPolyline", sigma: Union[int, List[int]],
+                   L: int, M: int,
+                   a_d: List[float], b_d: List[float],
+                   a_w: List[float], b_w: List[float],
+                   sorted_indices: List[int],
+                   threshold: float) -> Optional[Dict[str, Any]]:
+    """
+    Проверка пропорциональности для одной точки (x*, y*, σ)
+    
+    Те же проверки, что check_vertex_proportionality (8a, 8b) и
+    check_segment_proportionality для R* = R + (x*, y*), но без построения
+    R*: вдоль R координата u не убывает, а v не возрастает, поэтому
+    подходящая вершина и отрезки с пересечением u = H/2 находятся
+    бинарным поиском по координатам вершин R за O(log L).
+    
+    Args:
+        R_star: смещённая ломаная (ShiftedPolyline)
+        
+    Returns:
+        Словарь с результатами дележа или None
+    """
+    x_star = R_star.x_star
+    y_star = R_star.y_star
+    
+    # Проверка вершин (условия 8a, 8b): среди вершин с u ≥ H/2
+    # наибольшее v у первой
+    vertex_idx = R_star.first_vertex_at_least(threshold)
+    
+    if vertex_idx < len(R_star) and R_star[vertex_idx][1] >= threshold:
+        # Найден пропорциональный делёж в вершине
+        division = build_division_from_vertex(
+            vertex_idx, sigma, L, M, a_d, b_d, a_w, b_w, 
+            sorted_indices, x_star, y_star
+        )
+        division['method'] = 'vertex'
+        return division
+    
+    # Проверка отрезков, пересекающих вертикаль u = H/2
+    for k in R_star.threshold_segments(threshold):
+        p1, p2 = R_star.segment(k)
+        
+        intersection = check_segment_proportionality(p1, p2, threshold)
+        
+        if intersection is not None:
+            # Найден пропорциональный делёж на отрезке
+            division = build_division_from_segment(
+                k, sigma, L, M, a_d, b_d, a_w, b_w,
+                sorted_indices, x_star, y_star, p1, p2, intersection
             )
-            division['method'] = 'vertex'
+            division['method'] = 'segment intersection'
             return division
+    
+    return None
+
+
+def _relaxed_polylines(order: List[int],
+                       a_d: List[float], b_d: List[float],
+                       a_w: List[float], b_w: List[float]) -> List[Tuple[List[float], List[float]]]:
+    """
+    Верхние границы для поиска с отсечениями
+    
+    Для каждой глубины d строится ломаная R по делимым пунктам и ещё не
+    распределённым неделимым пунктам order[d:], как если бы они тоже были
+    делимыми. Любое продолжение частичного распределения лежит под этой
+    ломаной, поэтому она ограничивает достижимые выигрыши сверху.
+    
+    Returns:
+        для каждой глубины d = 0..M пара (u, v) - координаты вершин ломаной
+    """
+    from .r_polygon import build_r_polygon
+    
+    polylines = []
+    for d in range(len(order) + 1):
+        rest = order[d:]
+        R_relaxed, _ = build_r_polygon(
+            list(a_d) + [a_w[i] for i in rest],
+            list(b_d) + [b_w[i] for i in rest]
+        )
+        polylines.append(([u for u, _ in R_relaxed], [v for _, v in R_relaxed]))
+    return polylines
+
+
+def _polyline_v_at(us: List[float], vs: List[float], u: float) -> float:
+    """Значение v ломаной в точке u (u в пределах [us[0], us[-1]])"""
+    k = bisect_left(us, u)
+    if k == 0:
+        return vs[0]
+    u1, u2 = us[k - 1], us[k]
+    t = safe_divide(u - u1, u2 - u1, 1.0)
+    return vs[k - 1] + t * (vs[k] - vs[k - 1])
+
+
+def find_proportional_division_bnb(L: int, M: int,
+                                   a_d: List[float], b_d: List[float],
+                                   a_w: List[float], b_w: List[float],
+                                   R: List[Tuple[float, float]],
+                                   sorted_indices: List[int],
+                                   H: float = 100.0,
+                                   max_nodes: Optional[int] = BNB_MAX_NODES) -> Optional[Dict[str, Any]]:
+    """
+    Поиск пропорционального дележа методом ветвей и границ
+    
+    Неделимые пункты распределяются по одному (по убыванию max(a_w, b_w)),
+    сначала тому участнику, который ценит пункт больше. Поддерево
+    отсекается, если даже при делимости всех оставшихся пунктов
+    (ломаная R по делимым и оставшимся неделимым) нельзя достичь
+    GA ≥ H/2 и GB ≥ H/2. В листе точка (x, y) проверяется так же, как
+    точки SP в find_proportional_division. Поиск останавливается на
+    первом найденном дележе; множества S и SP не строятся.
+    
+    Когда пропорционального дележа нет, отсечения могут не срабатывать
+    (например, одинаковые пункты в нечётном числе), и перебор растёт как
+    2^M. Поэтому число узлов ограничено max_nodes; при исчерпании бюджета
+    вызывающий код переходит к перебору SP (find_proportional_division),
+    построенного dp или frontier.
+    
+    Args:
+        L, M: количество делимых и неделимых пунктов
+        a_d, b_d: оценки делимых пунктов
+        a_w, b_w: оценки неделимых пунктов
+        R: ломаная для делимых пунктов
+        sorted_indices: индексы отсортированных делимых пунктов
+        H: сумма оценок
+        max_nodes: бюджет узлов поиска (None - без ограничения)
         
-        # Проверка отрезков (геометрическая проверка)
-        for k in range(len(R_star) - 1):
-            p1 = R_star[k]
-            p2 = R_star[k + 1]
-            
-            intersection = check_segment_proportionality(p1, p2, threshold)
-            
-            if intersection is not None:
-                # Найден пропорциональный делёж на отрезке
-                division = build_division_from_segment(
-                    k, sigma, L, M, a_d, b_d, a_w, b_w,
-                    sorted_indices, x_star, y_star, p1, p2, intersection
-                )
-                division['method'] = 'segment intersection'
+    Returns:
+        Словарь с результатами дележа (как у find_proportional_division)
+        или None если пропорциональный делёж не существует
+    
+    Raises:
+        SearchBudgetExceeded: если бюджет узлов исчерпан
+    """
+    from .pareto import ShiftedPolyline
+    
+    threshold = H / 2.0
+    base = ShiftedPolyline.from_polygon(R)
+    order = sorted(range(M), key=lambda i: max(a_w[i], b_w[i]), reverse=True)
+    bounds = _relaxed_polylines(order, a_d, b_d, a_w, b_w)
+    sigma = [0] * M
+    nodes = 0
+    
+    def can_reach(depth: int, x: float, y: float) -> bool:
+        us, vs = bounds[depth]
+        need = max(threshold - x, 0.0)
+        if need > us[-1]:
+            return False
+        return y + _polyline_v_at(us, vs, need) >= threshold
+    
+    def search(depth: int, x: float, y: float) -> Optional[Dict[str, Any]]:
+        nonlocal nodes
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            raise SearchBudgetExceeded(f"Поиск с отсечениями превысил {max_nodes} узлов")
+        if not can_reach(depth, x, y):
+            return None
+        
+        if depth == M:
+            return check_sp_point(
+                base.shifted(x, y), list(sigma), L, M, a_d, b_d, a_w, b_w,
+                sorted_indices, threshold
+            )
+        
+        i = order[depth]
+        branches = [(1, x + a_w[i], y), (0, x, y + b_w[i])]
+        if b_w[i] > a_w[i]:
+            branches.reverse()
+        
+        for owner, nx, ny in branches:
+            sigma[i] = owner
+            division = search(depth + 1, nx, ny)
+            if division is not None:
                 return division
+        sigma[i] = 0
+        return None
     
-    # Пропорциональный делёж не найден
-    return None
+    division = search(0, 0.0, 0.0)
+    if division is not None:
+        division['search'] = 'branch_and_bound'
+    return division
 
 
-def build_division_from_vertex(vertex_idx: int, sigma: List[int],
+def build_division_from_vertex(vertex_idx: int, sigma: Union[int, List[int]],
                                L: int, M: int,
                                a_d: List[float], b_d: List[float],
                                a_w: List[float], b_w: List[float],
@@ -206,7 +459,7 @@ def build_division_from_vertex(vertex_idx: int, sigma: List[int],
     
     Args:
         vertex_idx: индекс вершины в R*
-        sigma: распределение неделимых пунктов
+        sigma: распределение неделимых пунктов (список или маска)
         остальные параметры: данные задачи
         
     Returns:
@@ -244,7 +497,7 @@ def build_division_from_vertex(vertex_idx: int, sigma: List[int],
         "division": {
             "divisible_A": divisible_to_A,
             "divisible_B": divisible_to_B,
-            "indivisible": sigma
+            "indivisible": sigma_to_list(sigma, M)
         },
         "gains": {
             "A": round(gain_A, 2),
@@ -262,7 +515,7 @@ def build_division_from_vertex(vertex_idx: int, sigma: List[int],
     return result
 
 
-def build_division_from_segment(segment_idx: int, sigma: List[int],
+def build_division_from_segment(segment_idx: int, sigma: Union[int, List[int]],
                                 L: int, M: int,
                                 a_d: List[float], b_d: List[float],
                                 a_w: List[float], b_w: List[float],
@@ -277,7 +530,7 @@ def build_division_from_segment(segment_idx: int, sigma: List[int],
     
     Args:
         segment_idx: индекс начала отрезка
-        sigma: распределение неделимых пунктов
+        sigma: распределение неделимых пунктов (список или маска)
         p1, p2: концы отрезка в R*
         intersection: точка пересечения (threshold, y)
         остальные параметры: данные задачи
@@ -343,7 +596,7 @@ def build_division_from_segment(segment_idx: int, sigma: List[int],
         "division": {
             "divisible_A": divisible_to_A,
             "divisible_B": divisible_to_B,
-            "indivisible": sigma
+            "indivisible": sigma_to_list(sigma, M)
         },
         "gains": {
             "A": round(gain_A, 2),
@@ -2,7 +2,7 @@
 Построение ломаной R (Ad - attainable set for divisible items)
 Соответствует формулам (1)-(4) из методички
 """
-from typing import List, Tuple
+from typing import Callable, List, Tuple
 from .utils import safe_divide
 
 
@@ -87,3 +87,96 @@ def check_r_monotonicity(polygon: List[Tuple[float, float]]) -> bool:
             return False
     
     return True
+
+
+def polyline_coordinates(polygon: List[Tuple[float, float]]) -> Tuple[List[float], List[float]]:
+    """
+    Координаты вершин ломаной R отдельными списками
+    
+    u_i - префиксные суммы a_d по отсортированным пунктам (не убывают),
+    v_i = Bd - префиксные суммы b_d (не возрастают).
+    
+    Returns:
+        (us, vs)
+    """
+    return [u for u, _ in polygon], [v for _, v in polygon]
+
+
+def _first_index(lo: int, hi: int, predicate: Callable[[int], bool]) -> int:
+    """Наименьший i из [lo, hi), где монотонный predicate(i) истинен (hi, если таких нет)"""
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if predicate(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+def first_vertex_at_least(us: List[float], x_star: float, threshold: float) -> int:
+    """
+    Бинарный поиск первой вершины R* = R + (x*, y*) с u ≥ threshold
+    
+    Сравнивается то же значение us[i] + x*, что и в shift_r_polygon,
+    поэтому результат совпадает с линейным просмотром вершин.
+    
+    Returns:
+        индекс вершины или len(us), если таких нет
+    """
+    return _first_index(0, len(us), lambda i: us[i] + x_star >= threshold)
+
+
+def threshold_segments(us: List[float], x_star: float, threshold: float) -> range:
+    """
+    Отрезки R*, пересекающие вертикаль u = threshold
+    
+    Поскольку u не убывает вдоль R*, это отрезки k с u_k ≤ threshold ≤ u_{k+1},
+    они идут подряд и находятся двумя бинарными поисками.
+    
+    Returns:
+        диапазон индексов k начала отрезка
+    """
+    n = len(us) - 1
+    first = _first_index(0, n, lambda k: us[k + 1] + x_star >= threshold)
+    end = _first_index(first, n, lambda k: us[k] + x_star > threshold)
+    return range(first, end)
+
+
+def diagonal_vertices(us: List[float], vs: List[float],
+                      x_star: float, y_star: float, tol: float) -> range:
+    """
+    Вершины R*, лежащие у диагонали: |u - v| < tol
+    
+    Разность u - v вдоль R* не убывает, поэтому такие вершины идут подряд.
+    
+    Returns:
+        диапазон индексов вершин
+    """
+    def diff(i: int) -> float:
+        return (us[i] + x_star) - (vs[i] + y_star)
+    
+    first = _first_index(0, len(us), lambda i: diff(i) > -tol)
+    end = _first_index(first, len(us), lambda i: diff(i) >= tol)
+    return range(first, end)
+
+
+def diagonal_segments(us: List[float], vs: List[float],
+                      x_star: float, y_star: float,
+                      slack: float = 1e-7) -> range:
+    """
+    Отрезки R*, которые могут пересечь диагональ u = v
+    
+    Пересекают диагональ отрезки с u - v ≤ 0 в начале и u - v ≥ 0 в конце;
+    диапазон расширен на slack и на один отрезок с каждой стороны, чтобы
+    покрыть погрешность округления find_diagonal_intersection.
+    
+    Returns:
+        диапазон индексов k начала отрезка
+    """
+    def diff(i: int) -> float:
+        return (us[i] + x_star) - (vs[i] + y_star)
+    
+    n = len(us) - 1
+    first = _first_index(0, n, lambda k: diff(k + 1) >= -slack)
+    end = _first_index(first, n, lambda k: diff(k) > slack)
+    return range(max(first - 1, 0), min(end + 1, n))
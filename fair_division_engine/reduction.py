@@ -0,0 +1,171 @@
+"""
+Предварительное закрепление и объединение неделимых пунктов
+Пункт, который один из участников не ценит, во всех точках SP
+достаётся другому; закреплённые пользователем пункты и пакеты пунктов,
+передаваемых вместе, сокращают перебор до построения S и SP
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .points import PointSet, mask_array
+
+
+def _merge_bundles(M: int, bundles: Sequence[Sequence[int]]) -> List[List[int]]:
+    """
+    Объединение пересекающихся пакетов
+
+    Returns:
+        группы пунктов (каждый пункт - ровно в одной группе);
+        пункты вне пакетов - отдельные группы
+    """
+    parent = list(range(M))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for bundle in bundles:
+        for i in bundle[1:]:
+            parent[find(i)] = find(bundle[0])
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(M):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values())
+
+
+class ItemReduction:
+    """
+    Разбиение неделимых пунктов на закреплённые и свободные
+
+    1. Пакеты (bundles) объединяются: пункты пакета получает один участник,
+       при переборе пакет - один пункт с суммарными оценками.
+    2. Группа с пунктом из locked_A (locked_B) закрепляется за A (B).
+    3. Из остальных групп группа с нулевой суммой a_w закрепляется за B
+       (при ненулевой сумме b_w это строго увеличивает y, при нулевой -
+       наименьшая маска, как в pareto_filter), иначе, если
+       fix_unvalued_by_B, группа с нулевой суммой b_w - за A.
+
+    SP строится только по свободным группам; закреплённые дают постоянные
+    сдвиги x_offset и y_offset и постоянные биты маски. expand_sp
+    возвращает SP в полном пространстве индексов. Каждый закреплённый
+    пункт или пакет вдвое сокращает перебор.
+
+    Attributes:
+        M: общее количество неделимых пунктов
+        free: свободные группы (списки индексов пунктов)
+        fixed_A: индексы пунктов, закреплённых за A
+        fixed_B: индексы пунктов, закреплённых за B
+        x_offset: сумма a_w закреплённых за A пунктов
+        y_offset: сумма b_w закреплённых за B пунктов
+        constrained: заданы ли пользовательские ограничения
+    """
+
+    __slots__ = ("M", "free", "fixed_A", "fixed_B", "x_offset", "y_offset", "constrained")
+
+    def __init__(self, a_w: List[float], b_w: List[float],
+                 locked_A: Optional[Sequence[int]] = None,
+                 locked_B: Optional[Sequence[int]] = None,
+                 bundles: Optional[Sequence[Sequence[int]]] = None,
+                 fix_unvalued_by_B: bool = True):
+        """
+        Args:
+            a_w: оценки участника A для неделимых пунктов
+            b_w: оценки участника B для неделимых пунктов
+            locked_A: индексы пунктов (с 0), которые получает A
+            locked_B: индексы пунктов (с 0), которые получает B
+            bundles: пакеты - списки индексов пунктов, передаваемых вместе
+            fix_unvalued_by_B: закреплять за A группы, которые B не ценит
+                               (не годится при ограничении числа пунктов A:
+                               такие пункты расходуют лимит)
+
+        Raises:
+            ValueError: если индекс вне диапазона или пункт (пакет)
+                        закреплён за обоими участниками
+        """
+        self.M = len(a_w)
+        locked_A = set(locked_A or [])
+        locked_B = set(locked_B or [])
+        bundles = [list(bundle) for bundle in (bundles or []) if bundle]
+        self.constrained = bool(locked_A or locked_B or bundles)
+
+        for i in locked_A | locked_B | {i for bundle in bundles for i in bundle}:
+            if not 0 <= i < self.M:
+                raise ValueError(f"Индекс неделимого пункта {i} вне диапазона 0..{self.M - 1}")
+
+        self.free: List[List[int]] = []
+        self.fixed_A: List[int] = []
+        self.fixed_B: List[int] = []
+
+        for group in _merge_bundles(self.M, bundles):
+            to_a = any(i in locked_A for i in group)
+            to_b = any(i in locked_B for i in group)
+            if to_a and to_b:
+                raise ValueError(f"Пункты {group} закреплены и за A, и за B")
+            if not to_a and not to_b:
+                if sum(a_w[i] for i in group) == 0:
+                    to_b = True
+                elif fix_unvalued_by_B and sum(b_w[i] for i in group) == 0:
+                    to_a = True
+            if to_a:
+                self.fixed_A.extend(group)
+            elif to_b:
+                self.fixed_B.extend(group)
+            else:
+                self.free.append(group)
+
+        # Свободные группы - по наибольшему индексу: тогда наименьшая маска
+        # групп соответствует наименьшей маске пунктов
+        self.free.sort(key=max)
+        self.fixed_A.sort()
+        self.fixed_B.sort()
+        self.x_offset = 0.0
+        for i in self.fixed_A:
+            self.x_offset += a_w[i]
+        self.y_offset = 0.0
+        for i in self.fixed_B:
+            self.y_offset += b_w[i]
+
+    def reduced(self, a_w: List[float], b_w: List[float]) -> Tuple[List[float], List[float]]:
+        """Суммарные оценки свободных групп"""
+        return ([sum(a_w[i] for i in group) for group in self.free],
+                [sum(b_w[i] for i in group) for group in self.free])
+
+    def expand_mask(self, mask: int) -> int:
+        """Маска свободных групп -> маска всех M пунктов"""
+        full = sum(1 << i for i in self.fixed_A)
+        for j, group in enumerate(self.free):
+            if mask & (1 << j):
+                for i in group:
+                    full |= 1 << i
+        return full
+
+    def expand_sp(self, SP: PointSet) -> PointSet:
+        """
+        SP свободных групп -> SP всех пунктов
+
+        Сдвиг на (x_offset, y_offset) не меняет порядок и доминирование
+        точек, поэтому результат - Парето-множество допустимых распределений.
+        """
+        masks = mask_array(SP.mask.tolist(), self.M)
+        full = np.zeros(len(masks), dtype=masks.dtype) + sum(1 << i for i in self.fixed_A)
+        for j, group in enumerate(self.free):
+            bit = (masks >> j) & 1
+            for i in group:
+                full = full | (bit << i)
+        return PointSet(SP.x + self.x_offset, SP.y + self.y_offset, full, self.M)
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика закрепления для отладочной информации"""
+        return {
+            "items": self.M,
+            "free_items": len(self.free),
+            "fixed_A": list(self.fixed_A),
+            "fixed_B": list(self.fixed_B),
+            "bundled_items": sum(len(group) for group in self.free if len(group) > 1),
+            "x_offset": round(self.x_offset, 2),
+            "y_offset": round(self.y_offset, 2)
+        }
@@ -0,0 +1,101 @@
+"""
+Выбор способа построения Парето-множества SP
+"""
+from typing import List, Optional
+
+from .dp import DP_MAX_CELLS, build_sp_dp, dp_table_cells
+from .external import DEFAULT_MEMORY_BUDGET, build_sp_external
+from .indivisible import build_s_points, build_sp_numpy, iter_s_set
+from .frontier import build_sp_frontier, build_sp_lazy, build_sp_meet_in_middle
+from .pareto import pareto_filter, pareto_filter_stream
+from .parallel import build_sp_parallel
+from .points import PointSet
+from .symmetry import build_sp_symmetric, group_identical_items
+from .utils import integral_scale
+
+
+# Доступные способы построения SP:
+#   enumerate - полный перебор build_s_points + pareto_filter
+#   numpy     - векторизованная поблочная генерация S (build_sp_numpy)
+#   frontier  - пошаговое добавление пунктов без построения S (build_sp_frontier)
+#   mitm      - встреча посередине: фронты двух половин и их слияние
+#   streaming - ленивый перебор S с онлайн-отбором Парето-точек, память O(|SP|)
+#   parallel  - перебор масок, разделённый по старшим битам между процессами
+#   external  - серии S во временных файлах и их слияние, память ограничена бюджетом
+#   lazy      - фронты двух половин и ленивое слияние их сумм (iter_sp_descending)
+#   dp        - динамическое программирование по сумме A для целых оценок
+#   symmetric - перебор числа пунктов каждого класса одинаковых пунктов
+#   auto      - dp, если оценки целые (integral_scale) и таблица не больше
+#               DP_MAX_CELLS; symmetric, если есть одинаковые пункты;
+#               иначе enumerate
+SP_METHODS = ("enumerate", "numpy", "frontier", "mitm", "streaming", "parallel", "external", "lazy",
+              "dp", "symmetric", "auto")
+
+
+def auto_sp_method(a_w: List[float], b_w: List[float],
+                   fallback: str = "enumerate") -> str:
+    """
+    Способ построения SP для method="auto"
+
+    Args:
+        a_w, b_w: оценки неделимых пунктов
+        fallback: способ, если не подходят dp и symmetric
+
+    Returns:
+        dp, если оценки целые и таблица не больше DP_MAX_CELLS; symmetric,
+        если есть одинаковые пункты; иначе fallback
+    """
+    scale = integral_scale(list(a_w) + list(b_w))
+    if scale is not None and dp_table_cells(a_w, scale) <= DP_MAX_CELLS:
+        return "dp"
+    if len(group_identical_items(a_w, b_w)) < len(a_w):
+        return "symmetric"
+    return fallback
+
+
+def build_sp(a_w: List[float], b_w: List[float],
+             method: str = "enumerate",
+             scratch_dir: Optional[str] = None,
+             memory_budget: int = DEFAULT_MEMORY_BUDGET) -> PointSet:
+    """
+    Построение Парето-множества SP выбранным способом
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+        method: способ построения (см. SP_METHODS)
+        scratch_dir: каталог временных файлов (только для external)
+        memory_budget: бюджет оперативной памяти в байтах (только для external)
+
+    Returns:
+        Парето-множество SP в компактном виде, по убыванию x
+
+    Raises:
+        ValueError: если способ неизвестен или для dp оценки не целые
+    """
+    if method not in SP_METHODS:
+        raise ValueError(f"Неизвестный способ построения SP: {method}")
+
+    if method == "auto":
+        method = auto_sp_method(a_w, b_w)
+
+    if method == "numpy":
+        return build_sp_numpy(a_w, b_w)
+    if method == "frontier":
+        return build_sp_frontier(a_w, b_w)
+    if method == "mitm":
+        return build_sp_meet_in_middle(a_w, b_w)
+    if method == "streaming":
+        return pareto_filter_stream(iter_s_set(a_w, b_w), len(a_w))
+    if method == "parallel":
+        return build_sp_parallel(a_w, b_w)
+    if method == "external":
+        return build_sp_external(a_w, b_w, scratch_dir, memory_budget)
+    if method == "lazy":
+        return build_sp_lazy(a_w, b_w)
+    if method == "dp":
+        return build_sp_dp(a_w, b_w)
+    if method == "symmetric":
+        return build_sp_symmetric(a_w, b_w)
+
+    return pareto_filter(build_s_points(a_w, b_w))
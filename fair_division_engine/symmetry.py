@@ -0,0 +1,76 @@
+"""
+Симметрия одинаковых неделимых пунктов
+Пункты с одинаковыми оценками (a_w, b_w) взаимозаменяемы: вместо 2^M
+масок перебирается, сколько пунктов каждого класса получает A
+"""
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .pareto import pareto_filter_arrays
+from .points import PointSet, mask_array
+
+
+# Класс одинаковых пунктов: ((a, b), индексы пунктов по возрастанию)
+ItemClass = Tuple[Tuple[float, float], List[int]]
+
+
+def group_identical_items(a_w: List[float], b_w: List[float]) -> List[ItemClass]:
+    """
+    Разбиение неделимых пунктов на классы с одинаковыми оценками
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+
+    Returns:
+        классы в порядке первого пункта
+    """
+    classes: Dict[Tuple[float, float], List[int]] = {}
+    for i, key in enumerate(zip(a_w, b_w)):
+        classes.setdefault(key, []).append(i)
+    return list(classes.items())
+
+
+def build_sp_symmetric(a_w: List[float], b_w: List[float]) -> PointSet:
+    """
+    Построение SP перебором числа пунктов каждого класса, получаемых A
+
+    Классы добавляются по одному, как пункты в build_frontier_points:
+    к каждой точке фронта прибавляются k·a и (n - k)·b для k = 0..n
+    (n - размер класса), после чего отбираются недоминируемые точки.
+    Без отсечения это (n1 + 1)·(n2 + 1)·… точек вместо 2^M; 30 пунктов
+    в 5 классах - не больше 7^5 точек.
+
+    Внутри класса A получает пункты с наименьшими индексами - это
+    наименьшая маска для данного k, а из совпадающих точек остаётся
+    наименьшая маска, поэтому σ совпадает с pareto_filter(build_s_set).
+    Маска собирается из готовых префиксов классов, а σ раскрывается
+    только по запросу (Allocation). Для нецелых оценок выигрыши
+    k·a могут отличаться от сумм build_s_set на ошибку округления.
+
+    Args:
+        a_w: оценки участника A для неделимых пунктов
+        b_w: оценки участника B для неделимых пунктов
+
+    Returns:
+        Парето-множество SP по убыванию x
+    """
+    M = len(a_w)
+    xs = np.zeros(1)
+    ys = np.zeros(1)
+    masks = mask_array([0], M)
+
+    for (a, b), indices in group_identical_items(a_w, b_w):
+        n = len(indices)
+        k = np.arange(n + 1)
+        prefixes = [0]
+        for i in indices:
+            prefixes.append(prefixes[-1] | (1 << i))
+
+        x = (xs[:, None] + (k * a)[None, :]).ravel()
+        y = (ys[:, None] + ((n - k) * b)[None, :]).ravel()
+        mask = (masks[:, None] + mask_array(prefixes, M)[None, :]).ravel()
+        xs, ys, masks = pareto_filter_arrays(x, y, mask)
+
+    return PointSet(xs, ys, masks, M)
@@ -1,7 +1,7 @@
 """
 Вспомогательные функции для fair_division_engine
 """
-from typing import List, Tuple
+from typing import List, Optional
 
 
 def validate_input(L: int, M: int, a_d: List[float], b_d: List[float], 
@@ -52,6 +52,28 @@ def validate_input(L: int, M: int, a_d: List[float], b_d: List[float],
         raise ValueError(f"Сумма оценок B должна быть равна H={H}, получено {sum_b}")
 
 
+def integral_scale(values: List[float], max_decimals: int = 4) -> Optional[int]:
+    """
+    Масштаб, при котором все оценки становятся целыми
+    
+    Перебираются масштабы 1, 10, ..., 10^max_decimals; оценки с конечной
+    десятичной записью (например 12.5) считаются целыми в сотых и т.п.
+    
+    Args:
+        values: оценки
+        max_decimals: наибольшее число знаков после запятой
+        
+    Returns:
+        наименьший подходящий масштаб или None, если оценки не целые
+        ни при каком масштабе
+    """
+    for decimals in range(max_decimals + 1):
+        scale = 10 ** decimals
+        if all(abs(v * scale - round(v * scale)) < 1e-6 for v in values):
+            return scale
+    return None
+
+
 def safe_divide(numerator: float, denominator: float, default: float = 0.0) -> float:
     """
     Безопасное деление с защитой от деления на 0
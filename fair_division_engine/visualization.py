@@ -9,6 +9,8 @@ import io
 import base64
 from typing import List, Tuple
 
+from .points import SPPoints
+
 
 def plot_ad_region(a_d: List[float], b_d: List[float], 
                    sorted_indices: List[int] = None) -> str:
@@ -179,7 +181,7 @@ def plot_ad_region(a_d: List[float], b_d: List[float],
 
 def plot_ad_region_with_sp(a_d: List[float], b_d: List[float],
                            a_w: List[float], b_w: List[float],
-                           SP: List[Tuple[float, float, List[int]]],
+                           SP: SPPoints,
                            threshold: float = 50.0,
                            solution_point: Tuple[float, float] = None) -> str:
     """
@@ -188,7 +190,7 @@ def plot_ad_region_with_sp(a_d: List[float], b_d: List[float],
     Args:
         a_d, b_d: оценки для делимых пунктов
         a_w, b_w: оценки для неделимых пунктов
-        SP: Парето-множество точек
+        SP: Парето-множество точек (список кортежей или PointSet)
         threshold: порог пропорциональности (обычно H/2)
         solution_point: итоговое решение (GA, GB) для отображения на графике
         
@@ -196,10 +198,11 @@ def plot_ad_region_with_sp(a_d: List[float], b_d: List[float],
         base64-encoded строка с PNG изображением
     """
     from .r_polygon import build_r_polygon
-    from .pareto import shift_r_polygon
+    from .pareto import ShiftedPolyline
     
     # Построение базовой ломаной R
     R, sorted_indices = build_r_polygon(a_d, b_d)
+    base = ShiftedPolyline.from_polygon(R)
     
     fig, ax = plt.subplots(figsize=(8, 8))
     
@@ -222,7 +225,7 @@ def plot_ad_region_with_sp(a_d: List[float], b_d: List[float],
             sol_x, sol_y = solution_point
             # Ищем SP точку, на смещённой ломаной которой находится решение
             for i, (sp_x_val, sp_y_val, sigma) in enumerate(SP):
-                R_star = shift_r_polygon(R, sp_x_val, sp_y_val)
+                R_star = base.shifted(sp_x_val, sp_y_val)
                 
                 # Проверяем, лежит ли решение на этой R*
                 for j in range(len(R_star) - 1):
@@ -261,9 +264,7 @@ def plot_ad_region_with_sp(a_d: List[float], b_d: List[float],
         if solution_sp_index is not None:
             # Показываем только ту R*, на которой находится решение
             x_star, y_star, sigma = SP[solution_sp_index]
-            R_star = shift_r_polygon(R, x_star, y_star)
-            rs_x = [p[0] for p in R_star]
-            rs_y = [p[1] for p in R_star]
+            rs_x, rs_y = base.shifted(x_star, y_star).coordinates()
             ax.plot(rs_x, rs_y, '--', color='blue', 
                    linewidth=2.5, alpha=0.8, 
                    label=f'R* (решение на SP[{solution_sp_index}])', zorder=2)
@@ -271,9 +272,7 @@ def plot_ad_region_with_sp(a_d: List[float], b_d: List[float],
             # Если решение не найдено, показываем первые 3 как раньше
             colors = ['blue', 'green', 'purple']
             for i, (x_star, y_star, sigma) in enumerate(SP[:3]):
-                R_star = shift_r_polygon(R, x_star, y_star)
-                rs_x = [p[0] for p in R_star]
-                rs_y = [p[1] for p in R_star]
+                rs_x, rs_y = base.shifted(x_star, y_star).coordinates()
                 ax.plot(rs_x, rs_y, '--', color=colors[i % len(colors)], 
                        linewidth=1.5, alpha=0.6, 
                        label=f'R* (SP_{i+1})', zorder=2)
@@ -75,6 +75,26 @@ class TestAPI:
         assert "R_polygon" in result["debug"]
         assert "SP_size" in result["debug"]
     
+    def test_solve_debug_reduction(self):
+        """Отладочная информация содержит статистику закрепления пунктов"""
+        request_data = {
+            "L": 1,
+            "M": 3,
+            "a_d": [50],
+            "b_d": [40],
+            "a_w": [30, 0, 20],
+            "b_w": [30, 30, 0],
+            "H": 100
+        }
+        
+        response = client.post("/api/solve?debug=true", json=request_data)
+        assert response.status_code == 200
+        
+        reduction = response.json()["debug"]["reduction"]
+        assert reduction["free_items"] == 1
+        assert reduction["fixed_A"] == [2]
+        assert reduction["fixed_B"] == [1]
+    
     def test_solve_invalid_lengths(self):
         """Тест с некорректными длинами массивов"""
         request_data = {
@@ -141,6 +161,208 @@ class TestAPI:
         result = response.json()
         assert result["proportional_exists"] == True
     
+    def test_solve_sp_method_numpy(self):
+        """Векторизованное построение SP даёт тот же ответ"""
+        request_data = {
+            "L": 1,
+            "M": 4,
+            "a_d": [30],
+            "b_d": [10],
+            "a_w": [25, 15, 20, 10],
+            "b_w": [10, 20, 35, 25],
+            "H": 100
+        }
+        
+        expected = client.post("/api/solve", json=request_data).json()
+        response = client.post("/api/solve", json={**request_data, "sp_method": "numpy"})
+        assert response.status_code == 200
+        assert response.json() == expected
+    
+    def test_solve_unknown_sp_method(self):
+        """Неизвестный способ построения SP отклоняется"""
+        request_data = {
+            "L": 0,
+            "M": 2,
+            "a_d": [],
+            "b_d": [],
+            "a_w": [50, 50],
+            "b_w": [50, 50],
+            "H": 100,
+            "sp_method": "magic"
+        }
+        
+        response = client.post("/api/solve", json=request_data)
+        assert response.status_code == 422
+    
+    def test_solve_epsilon(self):
+        """ε-приближённый режим возвращает границу погрешности"""
+        request_data = {
+            "L": 1,
+            "M": 4,
+            "a_d": [30],
+            "b_d": [10],
+            "a_w": [25, 15, 20, 10],
+            "b_w": [10, 20, 35, 25],
+            "H": 100
+        }
+        
+        exact = client.post("/api/solve", json=request_data).json()
+        response = client.post("/api/solve", json={**request_data, "epsilon": 0.1})
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert exact["error_bound"] is None
+        assert data["error_bound"]["epsilon"] == 0.1
+        assert data["has_equitable"]
+        assert data["equitable_gains"]["A"] >= exact["equitable_gains"]["A"] - data["error_bound"]["A"]
+    
+    def test_solve_solver_envelope(self):
+        """Поиск по огибающей находит те же типы дележей"""
+        request_data = {
+            "L": 1,
+            "M": 4,
+            "a_d": [30],
+            "b_d": [10],
+            "a_w": [25, 15, 20, 10],
+            "b_w": [10, 20, 35, 25],
+            "H": 100
+        }
+        
+        expected = client.post("/api/solve", json=request_data).json()
+        response = client.post("/api/solve", json={**request_data, "solver": "envelope"})
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["has_fair"] == expected["has_fair"]
+        assert data["equitable_gains"] == expected["equitable_gains"]
+    
+    def test_solve_locked_items(self):
+        """Закреплённые пункты и пакеты соблюдаются в ответе"""
+        request_data = {
+            "L": 1,
+            "M": 4,
+            "a_d": [30],
+            "b_d": [10],
+            "a_w": [25, 15, 20, 10],
+            "b_w": [10, 20, 35, 25],
+            "H": 100,
+            "locked_B": [2],
+            "bundles": [[0, 3]]
+        }
+        
+        response = client.post("/api/solve", json=request_data)
+        assert response.status_code == 200
+        
+        division = response.json()["efficient_division"]
+        assert division["indivisible"][2] == 0
+        assert division["indivisible"][0] == division["indivisible"][3]
+        
+        proportional = client.post("/api/proportional", json=request_data).json()
+        if proportional["proportional_exists"]:
+            assert proportional["division"]["indivisible"][2] == 0
+    
+    def test_solve_max_items_A(self):
+        """Дележи для нескольких ограничений числа пунктов A"""
+        request_data = {
+            "L": 1,
+            "M": 4,
+            "a_d": [30],
+            "b_d": [10],
+            "a_w": [25, 15, 20, 10],
+            "b_w": [10, 20, 35, 25],
+            "H": 100,
+            "max_items_A": [1, 2]
+        }
+        
+        response = client.post("/api/solve", json=request_data)
+        assert response.status_code == 200
+        
+        cardinality = response.json()["cardinality"]
+        assert [entry["k"] for entry in cardinality] == [1, 2]
+        for entry in cardinality:
+            if entry["has_proportional"]:
+                assert sum(entry["proportional_division"]["indivisible"]) <= entry["k"]
+        
+        response = client.post("/api/solve", json={**request_data, "max_items_A": [-1]})
+        assert response.status_code == 422
+    
+    def test_solve_locked_out_of_range(self):
+        """Индекс закреплённого пункта вне диапазона отклоняется"""
+        request_data = {
+            "L": 0,
+            "M": 2,
+            "a_d": [],
+            "b_d": [],
+            "a_w": [50, 50],
+            "b_w": [50, 50],
+            "H": 100,
+            "locked_A": [2]
+        }
+        
+        response = client.post("/api/solve", json=request_data)
+        assert response.status_code == 422
+    
+    def test_proportional_endpoint(self):
+        """Быстрый поиск пропорционального дележа"""
+        request_data = {
+            "L": 1,
+            "M": 4,
+            "a_d": [30],
+            "b_d": [10],
+            "a_w": [25, 15, 20, 10],
+            "b_w": [10, 20, 35, 25],
+            "H": 100
+        }
+        
+        response = client.post("/api/proportional", json=request_data)
+        assert response.status_code == 200
+        
+        result = response.json()
+        assert result["proportional_exists"] is True
+        assert result["gains"]["A"] >= 50.0
+        assert result["gains"]["B"] >= 50.0
+        assert result["solver_path"] == "heuristic"
+    
+    def test_solve_heuristic(self):
+        """Быстрый путь отмечен в ответе"""
+        request_data = {
+            "L": 1,
+            "M": 4,
+            "a_d": [30],
+            "b_d": [10],
+            "a_w": [25, 15, 20, 10],
+            "b_w": [10, 20, 35, 25],
+            "H": 100
+        }
+        
+        assert client.post("/api/solve", json=request_data).json()["solver_path"] == "exact"
+        
+        response = client.post("/api/solve", json={**request_data, "heuristic": True})
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["solver_path"] == "heuristic"
+        assert data["has_proportional"] is True
+        assert data["has_efficient"] is None and data["efficient_exists"] is None
+        assert data["sp_points_count"] is None
+    
+    def test_proportional_endpoint_infeasible(self):
+        """Без пропорционального дележа поиск с отсечениями уступает перебору SP"""
+        M = 23
+        request_data = {
+            "L": 0,
+            "M": M,
+            "a_d": [],
+            "b_d": [],
+            "a_w": [2] * M,
+            "b_w": [2] * M,
+            "H": 2 * M
+        }
+        
+        response = client.post("/api/proportional", json=request_data)
+        assert response.status_code == 200
+        assert response.json() == {"proportional_exists": False, "solver_path": "sp_scan"}
+    
     def test_root_page(self):
         """Тест главной страницы"""
         response = client.get("/")
@@ -1,21 +1,83 @@
 """
 Тесты для модуля fair_division_engine
 """
+import heapq
 import sys
 import os
 
 # Добавляем корневую директорию в PYTHONPATH
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import numpy as np
 import pytest
-from fair_division_engine.utils import validate_input, safe_divide
-from fair_division_engine.r_polygon import build_r_polygon, check_r_monotonicity
-from fair_division_engine.indivisible import build_s_set
-from fair_division_engine.pareto import pareto_filter, shift_r_polygon
+import fair_division_engine.frontier as frontier_module
+from fair_division_engine.utils import integral_scale, validate_input, safe_divide
+from fair_division_engine.r_polygon import (
+    build_r_polygon,
+    check_r_monotonicity,
+    diagonal_segments,
+    diagonal_vertices,
+    first_vertex_at_least,
+    polyline_coordinates,
+    threshold_segments
+)
+from fair_division_engine.indivisible import (
+    build_s_set,
+    build_s_arrays,
+    build_s_points,
+    build_sp_numpy,
+    decode_sigma,
+    iter_s_set
+)
+from fair_division_engine.points import Allocation, PointSet, encode_sigma, sigma_to_list
+from fair_division_engine.parallel import build_sp_parallel
+from fair_division_engine.external import build_sp_external
+from fair_division_engine.dp import build_sp_dp, find_equitable_division_dp
+from fair_division_engine.sp_builder import build_sp
+from fair_division_engine.reduction import ItemReduction
+from fair_division_engine.symmetry import build_sp_symmetric, group_identical_items
+from fair_division_engine.pareto import (
+    DominanceIndex,
+    OnlineSkyline,
+    pareto_filter,
+    pareto_filter_arrays,
+    pareto_filter_stream,
+    shift_r_polygon,
+    ShiftedPolyline
+)
+from fair_division_engine.frontier import (
+    approx_error_bound,
+    build_sp_approx,
+    build_sp_by_count,
+    build_sp_frontier,
+    build_sp_lazy,
+    build_sp_meet_in_middle,
+    combine_frontiers,
+    iter_sp_descending,
+    merge_frontiers
+)
+from fair_division_engine.envelope import (
+    build_envelope,
+    find_equitable_division_envelope,
+    find_proportional_division_envelope
+)
 from fair_division_engine.proportional import (
     find_proportional_division,
+    find_proportional_division_bnb,
+    SearchBudgetExceeded,
+    find_proportional_division_lazy,
     check_vertex_proportionality,
-    check_segment_proportionality
+    check_segment_proportionality,
+    check_sp_point,
+    proportional_window
+)
+from fair_division_engine.equitable import find_equitable_division
+from fair_division_engine.fused import fused_scan
+from fair_division_engine.heuristic import find_proportional_division_heuristic, greedy_local_search
+from fair_division_engine.comprehensive import (
+    find_all_division_types,
+    find_cardinality_division_types,
+    is_efficient
 )
 
 
@@ -74,6 +136,12 @@ class TestUtils:
         assert safe_divide(10, 2) == 5.0
         assert safe_divide(10, 0) == 0.0
         assert safe_divide(10, 0, default=100) == 100.0
+    
+    def test_integral_scale(self):
+        """Масштаб, при котором оценки целые"""
+        assert integral_scale([35, 30, 15, 20]) == 1
+        assert integral_scale([12.5, 0.25]) == 100
+        assert integral_scale([1 / 3]) is None
 
 
 class TestRPolygon:
@@ -115,6 +183,26 @@ class TestRPolygon:
         
         assert R == [(0.0, 0.0)]
         assert sorted_indices == []
+    
+    def test_crossing_search(self):
+        """Бинарный поиск пересечений совпадает с просмотром R*"""
+        R, _ = build_r_polygon([10, 20, 30, 0], [15, 15, 20, 5])
+        us, vs = polyline_coordinates(R)
+        R_star = shift_r_polygon(R, 25, 20)
+        
+        i = first_vertex_at_least(us, 25, 50)
+        assert i == min(k for k, (u, _) in enumerate(R_star) if u >= 50)
+        assert first_vertex_at_least(us, 25, 1000) == len(R)
+        
+        assert list(threshold_segments(us, 25, 50)) == [
+            k for k in range(len(R) - 1) if R_star[k][0] <= 50 <= R_star[k + 1][0]
+        ]
+        assert list(diagonal_vertices(us, vs, 25, 20, 5.0)) == [
+            k for k, (u, v) in enumerate(R_star) if abs(u - v) < 5.0
+        ]
+        crossing = [k for k in range(len(R) - 1)
+                    if (R_star[k][0] - R_star[k][1]) * (R_star[k + 1][0] - R_star[k + 1][1]) <= 0]
+        assert set(crossing) <= set(diagonal_segments(us, vs, 25, 20))
 
 
 class TestIndivisible:
@@ -147,11 +235,108 @@ class TestIndivisible:
         
         assert len(S) == 1
         assert S[0] == (0.0, 0.0, [])
+    
+    def test_build_s_arrays_matches_list(self):
+        """Массивы numpy совпадают с build_s_set поточечно"""
+        a_w = [35.5, 30, 15.25, 19.25]
+        b_w = [18, 20.1, 12, 49.9]
+        
+        S = build_s_set(a_w, b_w)
+        x, y, mask = build_s_arrays(a_w, b_w, block_bits=2)
+        
+        assert len(x) == len(S)
+        for k, (sx, sy, sigma) in enumerate(S):
+            assert x[k] == sx
+            assert y[k] == sy
+            assert decode_sigma(int(mask[k]), 4) == sigma
+    
+    def test_build_sp_numpy_matches_pareto_filter(self):
+        """Векторизованное SP совпадает с pareto_filter(build_s_set)"""
+        a_w = [10, 20, 5.5, 7, 0, 12.5]
+        b_w = [15, 25, 5.5, 3, 4, 0]
+        
+        expected = pareto_filter(build_s_set(a_w, b_w))
+        
+        assert build_sp_numpy(a_w, b_w).to_tuples() == expected
+        assert build_sp_numpy(a_w, b_w, block_bits=2).to_tuples() == expected
+    
+    def test_build_sp_numpy_empty(self):
+        """Векторизованное SP без неделимых пунктов"""
+        assert build_sp_numpy([], []).to_tuples() == [(0.0, 0.0, [])]
+
+
+class TestPoints:
+    """Тесты для points.py"""
+    
+    def test_encode_decode_sigma(self):
+        """Маска и список σ взаимно обратны"""
+        assert encode_sigma([1, 0, 1, 1]) == 0b1101
+        assert decode_sigma(0b1101, 4) == [1, 0, 1, 1]
+        assert sigma_to_list(0b10, 3) == [0, 1, 0]
+        assert sigma_to_list([0, 1, 0], 3) == [0, 1, 0]
+    
+    def test_allocation_lazy_sigma(self):
+        """Allocation ведёт себя как список σ и раскрывается по запросу"""
+        sigma = Allocation(0b1101, 4)
+        
+        assert len(sigma) == 4
+        assert sigma[1] == 0 and sigma[-1] == 1
+        assert list(sigma) == [1, 0, 1, 1]
+        assert sigma == [1, 0, 1, 1] and [1, 0, 1, 1] == sigma
+        assert sigma != [1, 0, 1]
+        assert sigma == Allocation(0b1101, 4) and sigma != Allocation(0b1101, 5)
+        assert sigma != 0b1101 and int(sigma) == 0b1101
+        assert sigma_to_list(sigma, 4) == [1, 0, 1, 1]
+        assert type(sigma_to_list(sigma, 4)) is list
+    
+    def test_point_set_roundtrip(self):
+        """PointSet хранит те же точки, что и список кортежей"""
+        S = build_s_set([10, 20, 5], [15, 25, 5])
+        points = PointSet.from_tuples(S, 3)
+        
+        assert len(points) == 8
+        assert points.to_tuples() == S
+        assert points[3] == (S[3][0], S[3][1], Allocation(3, 3))
+        assert int(points[3][2]) == 3
+        assert points.sigma(3) == S[3][2]
+        assert len(points[:2]) == 2
+    
+    def test_point_set_wide_masks(self):
+        """Маски шире 64 бит хранятся без переполнения"""
+        points = PointSet.from_frontier([(1.0, 2.0, 1 << 70)], 71)
+        
+        assert int(points[0][2]) == 1 << 70
+        assert points.sigma(0)[70] == 1
+    
+    def test_pareto_filter_point_set(self):
+        """Фильтрация PointSet совпадает с фильтрацией списка"""
+        a_w = [35, 30, 15, 20, 0, 8]
+        b_w = [18, 20, 12, 25, 3, 8]
+        
+        SP = pareto_filter(build_s_points(a_w, b_w))
+        
+        assert isinstance(SP, PointSet)
+        assert SP.to_tuples() == pareto_filter(build_s_set(a_w, b_w))
 
 
 class TestPareto:
     """Тесты для pareto.py"""
     
+    def test_pareto_filter_arrays(self):
+        """Векторный фильтр совпадает с pareto_filter, из дубликатов - наименьшая маска"""
+        x = np.array([10.0, 20.0, 20.0, 5.0, 20.0, 0.0])
+        y = np.array([10.0, 5.0, 5.0, 15.0, 1.0, 15.0])
+        mask = np.array([0, 7, 3, 1, 2, 4])
+        
+        fx, fy, fmask = pareto_filter_arrays(x, y, mask)
+        
+        assert fx.tolist() == [20.0, 10.0, 5.0]
+        assert fy.tolist() == [5.0, 10.0, 15.0]
+        assert fmask.tolist() == [3, 0, 1]
+        
+        wide = np.array([1 << 70, 1 << 65], dtype=object)
+        assert pareto_filter_arrays(np.array([20.0, 20.0]), np.array([5.0, 5.0]), wide)[2].tolist() == [1 << 65]
+    
     def test_pareto_filter_simple(self):
         """Простой тест фильтрации Парето-множества"""
         S = [
@@ -184,6 +369,51 @@ class TestPareto:
         # Все точки должны остаться
         assert len(SP) == 3
     
+    def test_online_skyline(self):
+        """Онлайн-отбор удаляет ставшие доминируемыми точки"""
+        skyline = OnlineSkyline()
+        
+        assert skyline.add(10, 10, 0)
+        assert skyline.add(20, 5, 1)
+        assert not skyline.add(5, 5, 2)      # доминируется (10, 10)
+        assert skyline.add(20, 12, 3)        # вытесняет (10, 10) и (20, 5)
+        assert not skyline.add(20, 12, 4)    # дубликат с большей маской
+        
+        assert len(skyline) == 1
+        assert skyline.to_point_set(3).to_tuples() == [(20.0, 12.0, [1, 1, 0])]
+    
+    def test_dominance_index(self):
+        """Лестница достижимых выигрышей и проверка эффективности"""
+        a_d, b_d = [10, 20, 30], [15, 15, 20]
+        a_w, b_w = [35, 30, 15, 20], [18, 20, 12, 25]
+        R, _ = build_r_polygon(a_d, b_d)
+        SP = pareto_filter(build_s_set(a_w, b_w))
+        
+        index = DominanceIndex.build(R, SP)
+        
+        # Построение блоками по одной точке SP даёт ту же лестницу
+        blocked = DominanceIndex.build(R, SP, block=1)
+        assert (blocked.xs, blocked.ys) == (index.xs, index.ys)
+        
+        assert all(x1 < x2 and y1 > y2 for x1, y1, x2, y2 in zip(index.xs, index.ys, index.xs[1:], index.ys[1:]))
+        assert not any(index.dominates(x, y) for x, y in zip(index.xs, index.ys))
+        for x_star, y_star, _ in SP:
+            for u, v in shift_r_polygon(R, x_star, y_star):
+                assert index.dominates(u - 1, v - 1)
+        
+        # Всё у A - эффективно; обмен пункта 4 на пункт 1 улучшает обоих
+        assert is_efficient(a_d, b_d, a_w, b_w, [1, 1, 1], [1, 1, 1, 1], SP, index=index)
+        assert not is_efficient(a_d, b_d, a_w, b_w, [0, 0, 0], [0, 0, 0, 1], SP)
+    
+    def test_pareto_filter_stream_matches_list_api(self):
+        """Потоковая фильтрация совпадает с pareto_filter(build_s_set)"""
+        a_w = [35, 30, 15, 20, 0, 8]
+        b_w = [18, 20, 12, 25, 3, 8]
+        
+        SP = pareto_filter_stream(iter_s_set(a_w, b_w), len(a_w))
+        
+        assert SP.to_tuples() == pareto_filter(build_s_set(a_w, b_w))
+    
     def test_shift_r_polygon(self):
         """Проверка смещения ломаной R"""
         R = [(0, 10), (5, 5), (10, 0)]
@@ -193,6 +423,354 @@ class TestPareto:
         
         expected = [(20, 40), (25, 35), (30, 30)]
         assert R_star == expected
+    
+    def test_shifted_polyline_view(self):
+        """Представление R* без копирования совпадает с shift_r_polygon"""
+        R, _ = build_r_polygon([10, 20, 30], [15, 15, 20])
+        R_star = ShiftedPolyline.from_polygon(R).shifted(25, 20)
+        expected = shift_r_polygon(R, 25, 20)
+        
+        assert len(R_star) == len(expected)
+        assert list(R_star) == expected
+        assert R_star[2] == expected[2]
+        assert R_star.segment(1) == (expected[1], expected[2])
+        assert R_star.coordinates() == ([u for u, _ in expected], [v for _, v in expected])
+        assert R_star.first_vertex_at_least(50) == min(k for k, (u, _) in enumerate(expected) if u >= 50)
+
+
+class TestFrontier:
+    """Тесты для frontier.py"""
+    
+    def test_merge_frontiers(self):
+        """Слияние фронтов отбрасывает доминируемые точки и дубликаты"""
+        first = [(30, 0, 3), (20, 15, 2), (0, 40, 0)]
+        second = [(30, 0, 7), (25, 10, 5), (10, 20, 4)]
+        
+        merged = merge_frontiers(first, second)
+        
+        assert merged == [(30, 0, 3), (25, 10, 5), (20, 15, 2), (10, 20, 4), (0, 40, 0)]
+    
+    def test_build_sp_frontier_matches_pareto_filter(self):
+        """Пошаговый фронт совпадает с pareto_filter(build_s_set)"""
+        a_w = [35, 30, 15, 20, 0, 7.5]
+        b_w = [18, 20, 12, 25, 3, 7.5]
+        
+        assert build_sp_frontier(a_w, b_w).to_tuples() == pareto_filter(build_s_set(a_w, b_w))
+    
+    def test_combine_frontiers(self):
+        """Сумма двух фронтов из одной точки каждый"""
+        low = [(10, 0, 1), (0, 5, 0)]
+        high = [(20, 0, 2), (0, 30, 0)]
+        
+        combined = combine_frontiers(low, high)
+        
+        assert combined == [(30, 0, 3), (20, 5, 2), (10, 30, 1), (0, 35, 0)]
+    
+    def test_build_sp_meet_in_middle_matches_pareto_filter(self):
+        """Встреча посередине совпадает с pareto_filter(build_s_set)"""
+        a_w = [35, 30, 15, 20, 0, 8, 3]
+        b_w = [18, 20, 12, 25, 3, 8, 14]
+        
+        assert build_sp_meet_in_middle(a_w, b_w).to_tuples() == pareto_filter(build_s_set(a_w, b_w))
+        assert build_sp_meet_in_middle([], []).to_tuples() == [(0.0, 0.0, [])]
+    
+    def test_iter_sp_descending(self):
+        """Ленивая генерация выдаёт SP по убыванию x и останавливается по требованию"""
+        a_w = [35, 30, 15, 20, 0, 8, 3]
+        b_w = [18, 20, 12, 25, 3, 8, 14]
+        
+        expected = pareto_filter(build_s_set(a_w, b_w))
+        assert build_sp_lazy(a_w, b_w).to_tuples() == expected
+        
+        points = iter_sp_descending(a_w, b_w)
+        assert next(points)[:2] == expected[0][:2]
+        assert next(points)[:2] == expected[1][:2]
+    
+    def test_iter_sp_descending_node_count(self, monkeypatch):
+        """Для M=22 ленивый поиск извлекает из кучи полиномиальное число узлов, а не 2^M"""
+        M = 22
+        a_w = [1 + i % 7 for i in range(M)]
+        b_w = [1 + 3 * i % 7 for i in range(M)]
+        H = sum(a_w)
+        R, sorted_indices = build_r_polygon([], [])
+        
+        pops = []
+        
+        class CountingHeap:
+            heapify = staticmethod(heapq.heapify)
+            heappush = staticmethod(heapq.heappush)
+            
+            @staticmethod
+            def heappop(heap):
+                pops.append(1)
+                return heapq.heappop(heap)
+        
+        monkeypatch.setattr(frontier_module, "heapq", CountingHeap)
+        
+        result = find_proportional_division_lazy(0, M, [], [], a_w, b_w, R, sorted_indices, H)
+        assert result is not None
+        assert result['gains']['A'] >= H / 2
+        assert result['gains']['B'] >= H / 2
+        
+        pops.clear()
+        assert build_sp_lazy(a_w, b_w).to_tuples() == build_sp_frontier(a_w, b_w).to_tuples()
+        assert len(pops) <= M ** 3
+    
+    def test_build_sp_by_count(self):
+        """SP для каждого ограничения числа пунктов A совпадает с отбором из S"""
+        a_w = [35, 30, 15, 20, 0, 8, 3]
+        b_w = [18, 20, 12, 25, 3, 8, 14]
+        S = build_s_set(a_w, b_w)
+        
+        by_count = build_sp_by_count(a_w, b_w, [-1, 0, 2, 5, 7])
+        
+        assert len(by_count[-1]) == 0
+        for k in (0, 2, 5, 7):
+            assert by_count[k].to_tuples() == pareto_filter([p for p in S if sum(p[2]) <= k])
+    
+    def test_build_sp_frontier_large_m(self):
+        """Фронт строится для M=40 без перебора 2^40 распределений"""
+        a_w = [float(i % 7 + 1) for i in range(40)]
+        b_w = [float((i * 3) % 5 + 1) for i in range(40)]
+        
+        SP = build_sp_frontier(a_w, b_w)
+        
+        assert SP[0][0] == sum(a_w)
+        assert SP[-1][1] == sum(b_w)
+        for i in range(len(SP) - 1):
+            assert SP[i][0] > SP[i+1][0]
+            assert SP[i][1] < SP[i+1][1]
+    
+    def test_build_sp_approx_covers_exact(self):
+        """Каждая точка точного SP покрыта с погрешностью не больше ε по x"""
+        a_w = [35.5, 30, 15.25, 19.25, 0, 8.1, 3, 1]
+        b_w = [18, 20.1, 12, 25, 3, 8.1, 14, 4]
+        epsilon = 0.2
+        
+        S = build_s_set(a_w, b_w)
+        approx = build_sp_approx(a_w, b_w, epsilon).to_tuples()
+        exact = pareto_filter(S)
+        
+        assert len(approx) < len(exact)
+        for x, y, _ in exact:
+            assert any(qx >= x / (1 + epsilon) and qy >= y for qx, qy, _ in approx)
+        for point in approx:
+            assert point in S
+    
+    def test_approx_error_bound(self):
+        """Граница погрешности выигрышей"""
+        bound = approx_error_bound([60, 40], 0.25)
+        
+        assert bound == {'epsilon': 0.25, 'A': 20.0, 'B': 20.0}
+
+
+class TestParallel:
+    """Тесты для parallel.py"""
+    
+    def test_build_sp_parallel_single_process(self):
+        """Шарды в одном процессе дают точно pareto_filter(build_s_set)"""
+        a_w = [35.5, 30, 15.25, 19.25, 0, 8.1]
+        b_w = [18, 20.1, 12, 25, 3, 8.1]
+        
+        SP = build_sp_parallel(a_w, b_w, workers=1, block_bits=2)
+        
+        assert SP.to_tuples() == pareto_filter(build_s_set(a_w, b_w))
+    
+    def test_build_sp_parallel_process_pool(self):
+        """Шарды в пуле процессов дают тот же результат"""
+        a_w = [35, 30, 15, 20, 0, 8, 3, 1]
+        b_w = [18, 20, 12, 25, 3, 8, 14, 4]
+        
+        SP = build_sp_parallel(a_w, b_w, workers=2, block_bits=3)
+        
+        assert SP.to_tuples() == pareto_filter(build_s_set(a_w, b_w))
+
+
+class TestDP:
+    """Тесты для dp.py"""
+    
+    def test_build_sp_dp_matches_pareto_filter(self):
+        """Динамическое программирование совпадает с pareto_filter(build_s_set)"""
+        a_w = [35, 30, 15, 20, 0, 8, 3]
+        b_w = [18, 20, 12, 25, 3, 8, 14]
+        
+        assert build_sp_dp(a_w, b_w).to_tuples() == pareto_filter(build_s_set(a_w, b_w))
+        assert build_sp_dp([2.5, 7.5], [5, 5]).to_tuples() == pareto_filter(build_s_set([2.5, 7.5], [5, 5]))
+        assert build_sp_dp([], []).to_tuples() == [(0.0, 0.0, [])]
+    
+    def test_build_sp_dp_many_items(self):
+        """Сотни целых пунктов без перебора 2^M"""
+        a_w = [1, 0] * 150
+        b_w = [0, 1] * 150
+        
+        SP = build_sp_dp(a_w, b_w)
+        
+        assert len(SP) == 1
+        assert (SP.x[0], SP.y[0]) == (150.0, 150.0)
+        assert SP.sigma(0) == [1, 0] * 150
+    
+    def test_build_sp_auto(self):
+        """auto выбирает dp для целых оценок и отклоняет dp для нецелых"""
+        a_w = [35, 30, 15, 20]
+        b_w = [18, 20, 12, 25]
+        
+        assert build_sp(a_w, b_w, "auto").to_tuples() == pareto_filter(build_s_set(a_w, b_w))
+        assert build_sp([1 / 3, 2 / 3], [0.5, 0.5], "auto").to_tuples() == pareto_filter(build_s_set([1 / 3, 2 / 3], [0.5, 0.5]))
+        with pytest.raises(ValueError):
+            build_sp_dp([1 / 3, 2 / 3], [0.5, 0.5])
+
+
+    def test_equitable_division_dp(self):
+        """Разностная ДП находит равноценный делёж вне точек SP"""
+        # Равноценный делёж (50, 50) слабо доминируется точкой SP (70, 50)
+        a_w, b_w = [10, 20, 30, 40], [25, 25, 25, 25]
+        SP = pareto_filter(build_s_set(a_w, b_w))
+        R, sorted_indices = build_r_polygon([], [])
+        assert find_equitable_division(0, 4, [], [], a_w, b_w, R, sorted_indices, SP, H=100) is None
+        
+        result = find_equitable_division_dp(a_w, b_w)
+        assert result['equitable_exists']
+        assert result['gains'] == {'A': 50.0, 'B': 50.0}
+        assert result['division']['indivisible'] == [0, 1, 1, 0]
+        
+        # Равенство недостижимо - наименьшая разность, затем большая сумма
+        closest = find_equitable_division_dp([7, 3], [5, 5])
+        assert not closest['equitable_exists']
+        assert closest['difference'] == 2.0
+        assert closest['gains'] == {'A': 7.0, 'B': 5.0}
+    
+    def test_all_division_types_pure_indivisible(self):
+        """При L = 0 комплексное решение использует разностную ДП"""
+        result = find_all_division_types([], [], [10, 20, 30, 40], [25, 25, 25, 25], 100)
+        
+        assert result['has_equitable']
+        assert result['equitable_division'] == ([], [0, 1, 1, 0])
+        assert result['equitable_gains'] == (50.0, 50.0)
+
+
+class TestSymmetry:
+    """Тесты для symmetry.py"""
+    
+    def test_group_identical_items(self):
+        """Классы одинаковых пунктов в порядке первого пункта"""
+        classes = group_identical_items([5, 3, 5, 3, 1], [2, 4, 2, 4, 1])
+        
+        assert classes == [((5, 2), [0, 2]), ((3, 4), [1, 3]), ((1, 1), [4])]
+    
+    def test_build_sp_symmetric_matches_pareto_filter(self):
+        """Перебор по классам совпадает с pareto_filter(build_s_set)"""
+        a_w = [5, 3, 5, 3, 1, 5, 0]
+        b_w = [2, 4, 2, 4, 1, 2, 3]
+        
+        assert build_sp_symmetric(a_w, b_w).to_tuples() == pareto_filter(build_s_set(a_w, b_w))
+    
+    def test_build_sp_symmetric_many_items(self):
+        """30 пунктов в 5 классах без перебора 2^30"""
+        base = [(1 / 3, 0.7), (0.5, 0.2), (0.9, 1.1), (0.25, 0.4), (1.3, 0.6)]
+        a_w = [a for a, _ in base] * 6
+        b_w = [b for _, b in base] * 6
+        
+        SP = build_sp_symmetric(a_w, b_w)
+        
+        assert build_sp(a_w, b_w, "auto").to_tuples() == SP.to_tuples()
+        assert SP.x[0] == pytest.approx(sum(a_w)) and SP.y[-1] == pytest.approx(sum(b_w))
+        assert np.all(np.diff(SP.x) < 0) and np.all(np.diff(SP.y) > 0)
+
+
+class TestReduction:
+    """Тесты для reduction.py"""
+    
+    def test_item_reduction(self):
+        """Пункты с нулевой оценкой закрепляются, SP разворачивается обратно"""
+        a_w = [35, 0, 15, 20, 10, 0]
+        b_w = [18, 20, 0, 25, 0, 0]
+        
+        reduction = ItemReduction(a_w, b_w)
+        free_a, free_b = reduction.reduced(a_w, b_w)
+        SP = reduction.expand_sp(build_sp(free_a, free_b))
+        
+        assert reduction.free == [[0], [3]]
+        assert reduction.fixed_A == [2, 4] and reduction.fixed_B == [1, 5]
+        assert (reduction.x_offset, reduction.y_offset) == (25.0, 20.0)
+        assert reduction.expand_mask(0b01) == 0b010101
+        assert SP.to_tuples() == pareto_filter(build_s_set(a_w, b_w))
+        assert reduction.stats()['free_items'] == 2
+        
+        # При ограничении числа пунктов A за A ничего не закрепляется
+        limited = ItemReduction(a_w, b_w, fix_unvalued_by_B=False)
+        assert limited.free == [[0], [2], [3], [4]]
+        assert limited.fixed_A == [] and limited.fixed_B == [1, 5]
+    
+    def test_locked_items_and_bundles(self):
+        """Ограничения сокращают перебор и совпадают с отбором из всего S"""
+        a_w = [35, 30, 15, 20, 10]
+        b_w = [18, 20, 12, 25, 25]
+        locked_A, locked_B, bundles = [0], [4], [[1, 3]]
+        
+        reduction = ItemReduction(a_w, b_w, locked_A, locked_B, bundles)
+        SP = reduction.expand_sp(build_sp(*reduction.reduced(a_w, b_w)))
+        
+        allowed = [p for p in build_s_set(a_w, b_w)
+                   if p[2][0] == 1 and p[2][4] == 0 and p[2][1] == p[2][3]]
+        assert reduction.free == [[2], [1, 3]]
+        assert SP.to_tuples() == pareto_filter(allowed)
+        
+        with pytest.raises(ValueError):
+            ItemReduction(a_w, b_w, [1], [3], [[1, 3]])
+        with pytest.raises(ValueError):
+            ItemReduction(a_w, b_w, [5])
+    
+    def test_all_division_types_with_constraints(self):
+        """Комплексное решение соблюдает закрепления и пакеты"""
+        result = find_all_division_types(
+            [30], [10], [25, 15, 20, 10], [10, 20, 35, 25], 100,
+            locked_A=[2], bundles=[[0, 1]]
+        )
+        
+        for key in ('efficient_division', 'proportional_division', 'equitable_division'):
+            if result[key] is not None:
+                _, sigma = result[key]
+                assert sigma[2] == 1 and sigma[0] == sigma[1]
+        assert result['reduction']['fixed_A'] == [2]
+    
+    def test_cardinality_division_types(self):
+        """Ограничение числа пунктов A соблюдается, без ограничения - как обычно"""
+        a_d, b_d = [30], [10]
+        a_w, b_w = [25, 15, 20, 10], [10, 20, 35, 25]
+        
+        results = find_cardinality_division_types(a_d, b_d, a_w, b_w, 100, [0, 1, 4], locked_A=[1])
+        
+        assert [entry['k'] for entry in results] == [0, 1, 4]
+        assert results[0]['sp_points_count'] == 0
+        for entry in results[1:]:
+            for key in ('proportional_division', 'equitable_division'):
+                if entry[key] is not None:
+                    _, sigma = entry[key]
+                    assert sigma[1] == 1 and sum(sigma) <= entry['k']
+        
+        unlimited = find_cardinality_division_types(a_d, b_d, a_w, b_w, 100, [4])[0]
+        result = find_all_division_types(a_d, b_d, a_w, b_w, 100, sp_method="enumerate")
+        assert unlimited['has_proportional'] == result['has_proportional']
+
+
+class TestExternal:
+    """Тесты для external.py"""
+    
+    def test_build_sp_external_many_runs(self):
+        """Малый бюджет памяти: много серий и буферов, результат как у pareto_filter"""
+        a_w = [35.5, 30, 15.25, 19.25, 0, 8.1, 3, 1]
+        b_w = [18, 20.1, 12, 25, 3, 8.1, 14, 4]
+        
+        SP = build_sp_external(a_w, b_w, memory_budget=1024)
+        
+        assert SP.to_tuples() == pareto_filter(build_s_set(a_w, b_w))
+    
+    def test_build_sp_external_scratch_dir_cleaned(self, tmp_path):
+        """Временные файлы серий удаляются после слияния"""
+        SP = build_sp_external([10, 20, 5], [25, 15, 5], scratch_dir=str(tmp_path))
+        
+        assert SP.to_tuples() == pareto_filter(build_s_set([10, 20, 5], [25, 15, 5]))
+        assert list(tmp_path.iterdir()) == []
 
 
 class TestProportional:
@@ -235,6 +813,228 @@ class TestProportional:
         assert intersection is None
 
 
+    def test_proportional_window(self):
+        """Окно SP содержит все точки с пропорциональным дележом"""
+        a_d, b_d = [30], [10]
+        a_w, b_w = [25, 15, 20, 10], [10, 20, 35, 25]
+        R, sorted_indices = build_r_polygon(a_d, b_d)
+        SP = pareto_filter(build_s_set(a_w, b_w))
+        
+        window = proportional_window(R, SP, 50.0)
+        
+        assert 0 < len(window) < len(SP)
+        for index, (x_star, y_star, sigma) in enumerate(SP):
+            if index not in window:
+                R_star = ShiftedPolyline.from_polygon(R).shifted(x_star, y_star)
+                assert check_sp_point(R_star, sigma, 1, 4, a_d, b_d, a_w, b_w, sorted_indices, 50.0) is None
+
+
+class TestBranchAndBound:
+    """Тесты поиска пропорционального дележа методом ветвей и границ"""
+    
+    def test_bnb_finds_proportional(self):
+        """Находит пропорциональный делёж там же, где полный перебор"""
+        L, M = 1, 4
+        a_d = [30]
+        b_d = [10]
+        a_w = [25, 15, 20, 10]
+        b_w = [10, 20, 35, 25]
+        
+        R, sorted_indices = build_r_polygon(a_d, b_d)
+        result = find_proportional_division_bnb(L, M, a_d, b_d, a_w, b_w, R, sorted_indices)
+        
+        assert result is not None
+        assert result['search'] == 'branch_and_bound'
+        assert result['gains']['A'] >= 50.0
+        assert result['gains']['B'] >= 50.0
+        assert len(result['division']['indivisible']) == M
+    
+    def test_lazy_matches_full_scan(self):
+        """Поиск по ленивому SP находит тот же делёж, что и полный перебор"""
+        a_d, b_d = [30], [10]
+        a_w, b_w = [25, 15, 20, 10], [10, 20, 35, 25]
+        R, sorted_indices = build_r_polygon(a_d, b_d)
+        SP = pareto_filter(build_s_set(a_w, b_w))
+        
+        expected = find_proportional_division(1, 4, a_d, b_d, a_w, b_w, R, sorted_indices, SP)
+        assert find_proportional_division_lazy(1, 4, a_d, b_d, a_w, b_w, R, sorted_indices) == expected
+        assert find_proportional_division_lazy(1, 4, a_d, b_d, a_w, b_w, R, sorted_indices, H=300) is None
+    
+    def test_bnb_no_solution(self):
+        """Возвращает None, если пропорционального дележа нет"""
+        # Оба ценят только первый неделимый пункт
+        a_w = [90, 5, 5]
+        b_w = [90, 5, 5]
+        
+        R, sorted_indices = build_r_polygon([], [])
+        
+        assert find_proportional_division_bnb(0, 3, [], [], a_w, b_w, R, sorted_indices) is None
+    
+    def test_bnb_node_budget(self):
+        """Без пропорционального дележа отсечения не работают - бюджет узлов ограничивает перебор"""
+        # Нечётное число одинаковых пунктов: делимая релаксация всегда достижима
+        M = 21
+        a_w = [2.0] * M
+        
+        R, sorted_indices = build_r_polygon([], [])
+        
+        with pytest.raises(SearchBudgetExceeded):
+            find_proportional_division_bnb(0, M, [], [], a_w, a_w, R, sorted_indices, 2.0 * M)
+        assert find_proportional_division_bnb(
+            0, 5, [], [], a_w[:5], a_w[:5], R, sorted_indices, 10.0, max_nodes=None
+        ) is None
+    
+    def test_bnb_large_m(self):
+        """Для M=40 ответ находится без перебора 2^40 распределений"""
+        M = 40
+        a_w = [2.5] * M
+        b_w = [1.0 + (i % 3) for i in range(M)]
+        total_b = sum(b_w)
+        b_w = [100.0 * v / total_b for v in b_w]
+        
+        R, sorted_indices = build_r_polygon([], [])
+        result = find_proportional_division_bnb(0, M, [], [], a_w, b_w, R, sorted_indices)
+        
+        assert result is not None
+        assert result['gains']['A'] >= 50.0
+        assert result['gains']['B'] >= 50.0
+
+
+class TestEnvelope:
+    """Тесты для envelope.py"""
+    
+    def test_envelope_monotone_and_tagged(self):
+        """Огибающая - одна монотонная ломаная из помеченных кусков"""
+        R, _ = build_r_polygon([10, 20, 30], [15, 15, 20])
+        SP = pareto_filter(build_s_set([35, 30, 15, 20], [18, 20, 12, 25]))
+        
+        envelope = build_envelope(R, SP)
+        
+        for (u0, u1, v0, v1, sp_index, segment), nxt in zip(envelope.pieces, envelope.pieces[1:]):
+            assert u0 < u1 and v0 >= v1
+            assert u1 == nxt[0]
+            assert 0 <= sp_index < len(SP) and -1 <= segment < len(R) - 1
+        # H(u) не меньше любой ломаной R* в её вершинах
+        for x_star, y_star, _ in SP:
+            for u, v in shift_r_polygon(R, x_star, y_star):
+                assert envelope.value_at(u) >= v - 1e-9
+    
+    def test_envelope_matches_scan(self):
+        """Пропорциональный и равноценный дележи по огибающей и перебором"""
+        a_d, b_d = [30], [10]
+        a_w, b_w = [25, 15, 20, 10], [10, 20, 35, 25]
+        R, sorted_indices = build_r_polygon(a_d, b_d)
+        SP = pareto_filter(build_s_set(a_w, b_w))
+        
+        proportional = find_proportional_division_envelope(1, 4, a_d, b_d, a_w, b_w, R, sorted_indices, SP)
+        equitable = find_equitable_division_envelope(1, 4, a_d, b_d, a_w, b_w, R, sorted_indices, SP)
+        scan = find_equitable_division(1, 4, a_d, b_d, a_w, b_w, R, sorted_indices, SP)
+        
+        assert proportional['search'] == 'envelope'
+        assert proportional['gains']['A'] >= 50.0
+        assert proportional['gains']['B'] >= 50.0
+        assert equitable['gains'] == scan['gains']
+    
+    def test_solver_envelope(self):
+        """Комплексное решение с огибающей находит те же типы дележей"""
+        args = ([30], [10], [25, 15, 20, 10], [10, 20, 35, 25], 100)
+        
+        scan = find_all_division_types(*args)
+        envelope = find_all_division_types(*args, solver="envelope")
+        
+        for key in ('has_efficient', 'has_proportional', 'has_equitable', 'has_fair'):
+            assert envelope[key] == scan[key]
+        assert envelope['equitable_gains'] == scan['equitable_gains']
+        
+        with pytest.raises(ValueError):
+            find_all_division_types(*args, solver="magic")
+    
+    def test_solver_envelope_near_tie(self):
+        """Эффективность при почти равных выигрышах проверяется с тем же запасом, что и в scan"""
+        args = ([4.114], [4.13], [4.126, 5.312, 4.427, 5.77, 5.364],
+                [4.423, 5.312, 5.77, 4.114, 5.364], 29.113)
+        
+        scan = find_all_division_types(*args)
+        envelope = find_all_division_types(*args, solver="envelope")
+        
+        assert envelope['has_efficient'] == scan['has_efficient']
+        assert envelope['has_fair'] == scan['has_fair']
+
+
+class TestHeuristic:
+    """Тесты для heuristic.py"""
+    
+    def test_greedy_local_search(self):
+        """Жадный разрез с обменами находит распределение, где min(GA, GB) = H/2"""
+        a_w = [10, 20, 30, 40]
+        b_w = [25, 25, 25, 25]
+        
+        mask = greedy_local_search([(0.0, 0.0)], a_w, b_w)
+        sigma = sigma_to_list(mask, 4)
+        
+        ga = sum(a for a, s in zip(a_w, sigma) if s)
+        gb = sum(b for b, s in zip(b_w, sigma) if not s)
+        assert min(ga, gb) == 50
+    
+    def test_heuristic_certificate(self):
+        """Найденный эвристикой делёж пропорционален и соблюдает закрепления"""
+        a_d, b_d = [30], [10]
+        a_w, b_w = [25, 15, 20, 10], [10, 20, 35, 25]
+        R, sorted_indices = build_r_polygon(a_d, b_d)
+        
+        reduction = ItemReduction(a_w, b_w, locked_B=[2])
+        proportional = find_proportional_division_heuristic(
+            1, 4, a_d, b_d, a_w, b_w, R, sorted_indices, 100, reduction=reduction
+        )
+        
+        assert proportional['search'] == 'heuristic'
+        assert proportional['gains']['A'] >= 50.0
+        assert proportional['gains']['B'] >= 50.0
+        assert proportional['division']['indivisible'][2] == 0
+    
+    def test_all_division_types_heuristic(self):
+        """Быстрый путь не строит SP и не расходится с точным решением"""
+        args = ([30], [10], [25, 15, 20, 10], [10, 20, 35, 25], 100)
+        
+        exact = find_all_division_types(*args)
+        fast = find_all_division_types(*args, heuristic=True)
+        
+        assert exact['solver_path'] == 'exact'
+        assert fast['solver_path'] == 'heuristic'
+        assert fast['sp_points_count'] is None
+        assert fast['has_proportional'] is True
+        for key in ('has_efficient', 'has_proportional', 'has_equitable', 'has_fair'):
+            assert fast[key] is None or fast[key] == exact[key]
+        assert fast['efficient_exists'] is None and fast['statement1_sets'] is None
+        
+        ga, gb = fast['proportional_gains']
+        assert ga >= 50.0 and gb >= 50.0
+
+
+class TestFused:
+    """Тесты для fused.py"""
+    
+    def test_fused_scan_matches_separate_searches(self):
+        """Один проход даёт те же дележи, что и отдельные функции"""
+        a_d, b_d = [10, 20, 30], [15, 15, 20]
+        a_w, b_w = [35, 30, 15, 20], [18, 20, 12, 25]
+        R, sorted_indices = build_r_polygon(a_d, b_d)
+        SP = pareto_filter(build_s_set(a_w, b_w))
+        
+        fused = fused_scan(3, 4, a_d, b_d, a_w, b_w, R, sorted_indices, SP)
+        
+        assert fused['equitable'] == find_equitable_division(3, 4, a_d, b_d, a_w, b_w, R, sorted_indices, SP)
+        assert fused['proportional'] == find_proportional_division(3, 4, a_d, b_d, a_w, b_w, R, sorted_indices, SP)
+        assert fused['best_sp'] == max(SP, key=lambda p: p[0] + p[1])
+    
+    def test_solver_fused(self):
+        """Комплексное решение за один проход совпадает с перебором"""
+        for args in (([30], [10], [25, 15, 20, 10], [10, 20, 35, 25], 100),
+                     ([10, 20, 30], [15, 15, 20], [35, 30, 15, 20], [18, 20, 12, 25], 100),
+                     ([], [], [60, 40], [40, 60], 100)):
+            assert find_all_division_types(*args, solver="fused") == find_all_division_types(*args)
+
+
 class TestIntegration:
     """Интеграционные тесты всего алгоритма"""
     
@@ -322,6 +1122,24 @@ class TestIntegration:
         assert result is not None
         assert result['proportional_exists'] == True
     
+    def test_compact_sp_same_result(self):
+        """Поиск по компактному SP даёт тот же делёж, что и по списку"""
+        L, M = 1, 4
+        a_d = [30]
+        b_d = [10]
+        a_w = [25, 15, 20, 10]
+        b_w = [10, 20, 35, 25]
+        
+        R, sorted_indices = build_r_polygon(a_d, b_d)
+        SP_list = pareto_filter(build_s_set(a_w, b_w))
+        SP_compact = build_sp_frontier(a_w, b_w)
+        
+        expected = find_proportional_division(L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP_list)
+        result = find_proportional_division(L, M, a_d, b_d, a_w, b_w, R, sorted_indices, SP_compact)
+        
+        assert result == expected
+        assert isinstance(result['division']['indivisible'], list)
+    
     def test_only_indivisible(self):
         """Тест только с неделимыми пунктами (L=0)"""
         L = 0